@@ -1,6 +1,12 @@
 #!/usr/bin/env bash
 set -e
 
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+  # Samples of previous runs would be merged into /metrics
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 echo "Running Alembic migrations..."
 cd src
 alembic upgrade head
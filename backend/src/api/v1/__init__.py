@@ -10,6 +10,7 @@ def get_v1_router() -> APIRouter:
     from .exchanges import get_exchanges_router
     from .misc import get_misc_router
     from .roles import get_roles_router
+    from .sync import get_sync_router
 
     router = APIRouter(prefix='/v1')
 
@@ -21,5 +22,6 @@ def get_v1_router() -> APIRouter:
     router.include_router(get_geo_router())
     router.include_router(get_exchanges_router())
     router.include_router(get_misc_router())
+    router.include_router(get_sync_router())
     
     return router
@@ -6,6 +6,9 @@ def get_admins_router() -> APIRouter:
     from .users import get_users_router
     from .stats import get_stats_router
     from .exchanges import get_exchanges_router
+    from .media import get_media_router
+    from .exports import get_exports_router
+    from .profiler import get_profiler_router
     
     router = APIRouter(prefix='/admins', tags=['Admins'])
 
@@ -13,5 +16,8 @@ def get_admins_router() -> APIRouter:
     router.include_router(get_users_router())
     router.include_router(get_stats_router())
     router.include_router(get_exchanges_router())
+    router.include_router(get_media_router())
+    router.include_router(get_exports_router())
+    router.include_router(get_profiler_router())
     
     return router
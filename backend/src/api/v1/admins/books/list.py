@@ -5,6 +5,8 @@ from database.relational_db import User
 from domain.books import BookModel, ApprovalStatus
 from core.config import Settings
 from core.security import require
+from core.replicas import read_replica
+from core.http import orm_json_response
 from service.books import BookService, get_books_service
 
 router = APIRouter()
@@ -15,6 +17,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/books',
     response_model=list[BookModel],
     summary='List all books with filters',
+    dependencies=[Depends(read_replica)],
 )
 async def get_books(
     _: Annotated[User, Depends(require('admin'))],
@@ -24,4 +27,4 @@ async def get_books(
     limit: int = Query(50, description='Number of books to return'),
 ):
     books = await svc.list_books_for_approval(status, limit)
-    return books
+    return orm_json_response(list[BookModel], books)
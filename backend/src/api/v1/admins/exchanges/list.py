@@ -6,6 +6,8 @@ from domain.exchanges import ExchangeModel, ExchangeProgress
 from domain.common import CursorPage
 from core.config import Settings
 from core.security import require
+from core.replicas import read_replica
+from core.http import orm_json_response
 from service.exchanges import ExchangeService, get_exchanges_service
 
 router = APIRouter()
@@ -16,6 +18,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/exchanges',
     response_model=CursorPage[ExchangeModel],
     summary='List all exchanges (cursor pagination)',
+    dependencies=[Depends(read_replica)],
 )
 async def list_exchanges(
     _: Annotated[User, Depends(require('admin'))],
@@ -29,4 +32,6 @@ async def list_exchanges(
         limit=limit,
         cursor=cursor,
     )
-    return CursorPage(items=exchanges, next_cursor=next_cursor)
+    return orm_json_response(
+        CursorPage[ExchangeModel], {'items': exchanges, 'next_cursor': next_cursor}
+    )
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+
+def get_exports_router() -> APIRouter:
+    from .stream import router as stream_router
+
+    router = APIRouter(prefix='/exports')
+    router.include_router(stream_router)
+
+    return router
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from core.security import require
+from database.relational_db import User
+from domain.admin import ExportDataset, ExportFormat
+from service.exports import ExportService, MEDIA_TYPES, get_export_service
+
+router = APIRouter()
+
+
+@router.get(
+    path='/{dataset}',
+    response_class=StreamingResponse,
+    summary='Stream a whole table for analytics',
+    description=(
+        'Rows come in primary key order with constant server memory. To resume an '
+        'interrupted download pass the last received `id` as `after`. The body is gzipped '
+        'when the client accepts it.'
+    ),
+)
+async def export_dataset(
+    request: Request,
+    dataset: ExportDataset,
+    _: Annotated[User, Depends(require('admin'))],
+    svc: Annotated[ExportService, Depends(get_export_service)],
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    since: datetime | None = Query(None, description='Created at or after, ISO-8601'),
+    until: datetime | None = Query(None, description='Created before, ISO-8601'),
+    after: str | None = Query(None, max_length=64, description='Resume after this id'),
+):
+    # Parquet pages are compressed already
+    gzip = format is not ExportFormat.PARQUET and 'gzip' in request.headers.get('accept-encoding', '')
+    body = svc.export(dataset, format, since=since, until=until, after=after, gzip=gzip)
+
+    headers = {'Content-Disposition': f'attachment; filename="{dataset.value}.{format.value}"'}
+    if gzip:
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    return StreamingResponse(body, media_type=MEDIA_TYPES[format], headers=headers)
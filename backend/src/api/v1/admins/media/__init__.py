@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+
+def get_media_router() -> APIRouter:
+    from .orphans import router as orphans_router
+
+    router = APIRouter(prefix='/media')
+    router.include_router(orphans_router)
+
+    return router
@@ -0,0 +1,22 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+
+from core.security import require
+from database.relational_db import User
+from domain.admin import OrphanReport
+from service.media import MediaService, get_media_service
+
+router = APIRouter()
+
+
+@router.post(
+    path='/orphans/sweep',
+    response_model=OrphanReport,
+    summary='Find stored media nothing points at and delete it (report only by default)',
+)
+async def sweep_orphans(
+    _: Annotated[User, Depends(require('admin'))],
+    svc: Annotated[MediaService, Depends(get_media_service)],
+    dry_run: bool = Query(True, description='Only count orphans, keep them in storage'),
+):
+    return await svc.sweep_orphans(dry_run=dry_run)
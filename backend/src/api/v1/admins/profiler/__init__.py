@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+
+def get_profiler_router() -> APIRouter:
+    from .worker import router as worker_router
+    from .requests import router as requests_router
+
+    router = APIRouter(prefix='/profiler')
+    router.include_router(worker_router)
+    router.include_router(requests_router)
+
+    return router
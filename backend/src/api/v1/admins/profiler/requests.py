@@ -0,0 +1,47 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from core.security import require
+from database.relational_db import User
+from domain.admin import ProfileMode, ProfileTicket
+from service.profiler import ProfilerService, get_profiler_service
+
+router = APIRouter()
+
+
+@router.post(
+    path='/requests',
+    response_model=ProfileTicket,
+    summary='Ticket to profile one request',
+    description=(
+        'Send the request to profile with the ticket in the `X-Profile` header, whichever '
+        'worker serves it profiles it. Then fetch the result from `/admins/profiler/requests/{token}`.'
+    ),
+)
+async def issue_ticket(
+    _: Annotated[User, Depends(require('admin'))],
+    svc: Annotated[ProfilerService, Depends(get_profiler_service)],
+    mode: ProfileMode = Query(ProfileMode.WALL),
+):
+    return await svc.issue_ticket(mode)
+
+
+@router.get(
+    path='/requests/{token}',
+    response_class=PlainTextResponse,
+    summary='Collapsed stacks of a profiled request',
+    description=(
+        'Weighted in microseconds. In wall mode time the request spent suspended ends in '
+        '`[awaiting]` under the coroutine that waited.'
+    ),
+)
+async def request_profile(
+    token: str,
+    _: Annotated[User, Depends(require('admin'))],
+    svc: Annotated[ProfilerService, Depends(get_profiler_service)],
+):
+    collapsed = await svc.request_profile(token)
+    return PlainTextResponse(
+        collapsed, headers={'Content-Disposition': f'attachment; filename="request-{token}.folded"'}
+    )
@@ -0,0 +1,50 @@
+import os
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from core.config import Settings
+from core.security import require
+from database.relational_db import User
+from domain.admin import ProfileMode
+from service.profiler import ProfilerService, get_profiler_service
+
+settings = Settings()  # type: ignore
+router = APIRouter()
+
+
+@router.post(
+    path='/worker',
+    response_class=PlainTextResponse,
+    summary='Sample the worker serving this request for a while',
+    description=(
+        'Returns collapsed stacks of the event loop thread (flamegraph.pl, speedscope), '
+        'weighted in microseconds of wall clock or CPU time. Other workers are not '
+        'profiled, the `X-Worker-Pid` header tells which one was.'
+    ),
+)
+async def profile_worker(
+    _: Annotated[User, Depends(require('admin'))],
+    svc: Annotated[ProfilerService, Depends(get_profiler_service)],
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    mode: ProfileMode = Query(ProfileMode.WALL),
+):
+    collapsed = await svc.profile_worker(seconds, mode)
+    filename = f'worker-{os.getpid()}-{mode.value}.folded'
+    return PlainTextResponse(
+        collapsed,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"', 'X-Worker-Pid': str(os.getpid())},
+    )
+
+
+@router.get(
+    path='/tasks',
+    response_class=PlainTextResponse,
+    summary='Where every asyncio task of this worker is suspended',
+    description='Followed by the dumps taken when the event loop stalled.',
+)
+async def task_dump(
+    _: Annotated[User, Depends(require('admin'))],
+    svc: Annotated[ProfilerService, Depends(get_profiler_service)],
+):
+    return PlainTextResponse(svc.task_dump(), headers={'X-Worker-Pid': str(os.getpid())})
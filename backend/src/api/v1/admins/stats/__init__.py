@@ -4,10 +4,12 @@ from fastapi import APIRouter
 def get_stats_router() -> APIRouter:
     from .users import router as users_router
     from .books import get_books_router
+    from .database import router as database_router
     
     router = APIRouter(prefix='/stats')
 
     router.include_router(users_router)
     router.include_router(get_books_router())
+    router.include_router(database_router)
     
     return router
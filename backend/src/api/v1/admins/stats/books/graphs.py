@@ -6,6 +6,7 @@ from database.relational_db import User
 from domain.statistics import BookStatsGraph
 from core.config import Settings
 from core.security import require
+from core.replicas import read_replica
 from service.statistics import StatService, get_stats_service
 
 router = APIRouter()
@@ -16,6 +17,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/stats',
     response_model=list[BookStatsGraph],
     summary='Get graph data for all books together views, likes, reserves by days',
+    dependencies=[Depends(read_replica)],
 )
 async def stats(
     _: Annotated[User, Depends(require('admin'))],
@@ -0,0 +1,19 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+
+from database.relational_db import User, pool_stats
+from domain.admin import PoolStats
+from core.security import require
+
+router = APIRouter()
+
+
+@router.get(
+    path='/db-pool',
+    response_model=PoolStats,
+    summary='Database connection pool usage of this worker process',
+)
+async def db_pool(
+    _: Annotated[User, Depends(require('admin'))],
+):
+    return pool_stats()
@@ -5,6 +5,7 @@ from database.relational_db import User
 from domain.statistics import ActiveUsersGraph, RegistrationsGraph
 from core.config import Settings
 from core.security import require
+from core.replicas import read_replica
 from service.statistics import StatService, get_stats_service
 
 router = APIRouter()
@@ -15,6 +16,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/active-users',
     response_model=list[ActiveUsersGraph],
     summary='Get graph data for active users by days',
+    dependencies=[Depends(read_replica)],
 )
 async def active_users(
     _: Annotated[User, Depends(require('admin'))],
@@ -27,6 +29,7 @@ async def active_users(
     path='/registrations',
     response_model=list[RegistrationsGraph],
     summary='Get graph data for new registrations by days',
+    dependencies=[Depends(read_replica)],
 )
 async def registrations(
     _: Annotated[User, Depends(require('admin'))],
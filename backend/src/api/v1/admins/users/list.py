@@ -2,6 +2,8 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Query
 
 from core.security import require
+from core.replicas import read_replica
+from core.http import orm_json_response
 from database.relational_db import User
 from domain.users import UserModel, Gender
 from service.users import UserService, get_user_service
@@ -14,6 +16,7 @@ router = APIRouter()
     path='/users',
     response_model=CursorPage[UserModel],
     summary='List users with filters and search (cursor pagination)',
+    dependencies=[Depends(read_replica)],
 )
 async def list_users(
     _: Annotated[User, Depends(require('admin'))],
@@ -37,4 +40,6 @@ async def list_users(
         limit=limit,
         cursor=cursor,
     )
-    return CursorPage(items=users, next_cursor=next_cursor)
+    return orm_json_response(
+        CursorPage[UserModel], {'items': users, 'next_cursor': next_cursor}
+    )
@@ -6,6 +6,8 @@ def get_books_router() -> APIRouter:
     from .create import router as create_router
     from .for_you import router as for_you_router
     from .genres import get_genres_router
+    from .interactions import router as interactions_router
+    from .imports import router as imports_router
     from .list import router as list_router
     
     router = APIRouter(
@@ -18,6 +20,8 @@ def get_books_router() -> APIRouter:
     router.include_router(create_router, prefix='/books')
     router.include_router(get_authors_router(), prefix='/books')
     router.include_router(get_genres_router(), prefix='/books')
+    router.include_router(interactions_router, prefix='/books')
+    router.include_router(imports_router, prefix='/books')
     router.include_router(get_specific_book_router(), prefix='/books')
     
     return router
@@ -2,6 +2,7 @@ from typing import Annotated
 from uuid import UUID
 from fastapi import APIRouter, Depends, Path, HTTPException
 
+from database.relational_db import read_only
 from domain.books import AuthorModel
 from core.config import Settings
 from core.security import auth_user
@@ -15,6 +16,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/{author_id}',
     response_model=AuthorModel,
     summary='Get specific author by its id',
+    dependencies=[Depends(read_only)],
     responses={404: {'description': 'Author with this `author_id` not found'}},
 )
 async def get_author(
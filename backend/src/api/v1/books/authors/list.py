@@ -1,11 +1,12 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from database.relational_db import User
 from domain.books import AuthorModel
 from core.config import Settings
 from core.security import auth_user
-from service.books import BookService, get_books_service
+from core.http import json_bytes_response
+from service.reference import ReferenceService, get_reference_service
 
 router = APIRouter()
 config = Settings() # pyright: ignore[reportCallIssue]
@@ -17,7 +18,9 @@ config = Settings() # pyright: ignore[reportCallIssue]
     summary='List all available authors'
 )
 async def list_genres(
+    request: Request,
     # _: Annotated[User, Depends(auth_user)],
-    svc: Annotated[BookService, Depends(get_books_service)],
+    svc: Annotated[ReferenceService, Depends(get_reference_service)],
 ):
-    return await svc.list_authors()
+    authors = svc.authors()
+    return json_bytes_response(request, authors.body, authors.etag)
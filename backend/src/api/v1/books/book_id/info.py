@@ -1,11 +1,12 @@
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response
 
 from domain.statistics.enums import Interaction
 from domain.books import BookDetailModel
 from core.config import Settings
 from core.security import auth_user
+from core.http import etag_matches, not_modified
 from service.books import BookService, get_books_service
 from service.statistics import StatService, get_stats_service
 from database.relational_db import User
@@ -20,12 +21,20 @@ config = Settings() # pyright: ignore[reportCallIssue]
     summary='Get specific book by its id',
 )
 async def get_book_detail(
+    request: Request,
+    response: Response,
     book_id: Annotated[UUID, Path(...)],
     user: Annotated[User, Depends(auth_user)],
     book_svc: Annotated[BookService, Depends(get_books_service)],
     stats_svc: Annotated[StatService, Depends(get_stats_service)],
 ):
+    etag = await book_svc.book_detail_etag(book_id, user)
+    if etag_matches(request, etag):
+        await stats_svc.record_interaction(book_id, user, Interaction.CLICK)
+        return not_modified(etag)
+
     book = await book_svc.get_book_detail(book_id, user)
     await stats_svc.record_interaction(book_id, user, Interaction.CLICK)
     
+    response.headers['ETag'] = etag
     return book
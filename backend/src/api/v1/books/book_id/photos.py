@@ -1,9 +1,10 @@
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, Path, UploadFile, File
+from fastapi import APIRouter, Body, Depends, Path, UploadFile, File
 
 from database.relational_db import User
 from domain.books import BookModel
+from domain.common import DirectUploadRequest, DirectUpload, FinalizeUploads
 from core.config import Settings
 from core.security import auth_user
 from service.books import BookService, get_books_service
@@ -24,3 +25,32 @@ async def upload_book_photos(
     svc: Annotated[BookService, Depends(get_books_service)]
 ):
     return await svc.add_photos(book_id, files, user)
+
+
+@router.post(
+    "/photos/presign",
+    response_model=list[DirectUpload],
+    summary="Get presigned urls to upload book photos straight to storage",
+    responses={409: {'description': 'Storage has no direct uploads, use PUT /photos.'}},
+)
+async def presign_book_photos(
+    book_id: Annotated[UUID, Path(...)],
+    payload: Annotated[list[DirectUploadRequest], Body(..., min_length=1)],
+    user: Annotated[User, Depends(auth_user)],
+    svc: Annotated[BookService, Depends(get_books_service)]
+):
+    return await svc.presign_photos(book_id, payload, user)
+
+
+@router.post(
+    "/photos/finalize",
+    response_model=BookModel,
+    summary="Attach photos uploaded with presigned urls to a book"
+)
+async def finalize_book_photos(
+    book_id: Annotated[UUID, Path(...)],
+    payload: FinalizeUploads,
+    user: Annotated[User, Depends(auth_user)],
+    svc: Annotated[BookService, Depends(get_books_service)]
+):
+    return await svc.finalize_photos(book_id, payload.keys, user)
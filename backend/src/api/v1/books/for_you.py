@@ -5,6 +5,8 @@ from database.relational_db import User
 from domain.books import BookModel
 from core.config import Settings
 from core.security import auth_user
+from core.replicas import read_replica
+from core.http import orm_json_response
 from service.books import BookService, get_books_service
 
 router = APIRouter()
@@ -15,6 +17,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/for_you',
     response_model=list[BookModel],
     summary='Get books for "For You" page',
+    dependencies=[Depends(read_replica)],
 )
 async def for_you(
     user: Annotated[User, Depends(auth_user)],
@@ -54,4 +57,4 @@ async def for_you(
         max_distance=distance,
         min_rating=rating,
     )
-    return books
+    return orm_json_response(list[BookModel], books)
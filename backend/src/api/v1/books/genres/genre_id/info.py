@@ -1,6 +1,7 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Path, HTTPException
 
+from database.relational_db import read_only
 from domain.books import AuthorModel
 from core.config import Settings
 from core.security import auth_user
@@ -14,6 +15,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/{genre_id}',
     response_model=AuthorModel,
     summary='Get specific author by its id',
+    dependencies=[Depends(read_only)],
     responses={404: {'description': 'Genre with this `genre_id` not found'}},
 )
 async def get_author(
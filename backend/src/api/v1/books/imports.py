@@ -0,0 +1,40 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query, Request
+
+from database.relational_db import User, statement_timeout
+from domain.books import BookImportReport, ImportFormat
+from core.security import auth_user
+from service.books import BookService, get_books_service
+from service.books.exceptions import UnsupportedImportFormat
+
+router = APIRouter()
+
+CONTENT_TYPES = {
+    "text/csv": ImportFormat.CSV,
+    "application/x-ndjson": ImportFormat.NDJSON,
+    "application/jsonl": ImportFormat.NDJSON,
+}
+
+
+@router.post(
+    path='/import',
+    response_model=BookImportReport,
+    summary='Create many books from a CSV or NDJSON upload',
+    dependencies=[Depends(statement_timeout(5 * 60 * 1000))],
+    description=(
+        'The request body is the file itself, read as a stream. CSV needs a header row '
+        'with `BookCreate` field names. Invalid rows are listed in the report and skipped.'
+    ),
+)
+async def import_books(
+    request: Request,
+    user: Annotated[User, Depends(auth_user)],
+    svc: Annotated[BookService, Depends(get_books_service)],
+    format: ImportFormat | None = Query(None, description='Overrides the Content-Type header'),
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = CONTENT_TYPES.get(content_type)
+        if format is None:
+            raise UnsupportedImportFormat()
+    return await svc.import_books(request.stream(), format, user)
@@ -0,0 +1,23 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+
+from database.relational_db import User
+from domain.statistics import InteractionBatch, InteractionBatchResult
+from core.security import auth_user
+from service.statistics import StatService, get_stats_service
+
+router = APIRouter()
+
+
+@router.post(
+    "/interactions:batch",
+    response_model=InteractionBatchResult,
+    summary="Record buffered clicks and likes in one request",
+    description="Items are applied in order with the same rules as `/click` and `/like`.",
+)
+async def record_interactions(
+    payload: InteractionBatch,
+    user: Annotated[User, Depends(auth_user)],
+    svc: Annotated[StatService, Depends(get_stats_service)],
+):
+    return await svc.record_interactions(payload.items, user)
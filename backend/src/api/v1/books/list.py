@@ -1,10 +1,12 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 
-from database.relational_db import User
+from database.relational_db import User, read_only
 from domain.books import BookModel
 from core.config import Settings
 from core.security import auth_user
+from core.replicas import read_replica
+from core.http import etag_matches, not_modified, orm_json_response
 from service.books import BookService, get_books_service
 
 router = APIRouter()
@@ -15,6 +17,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/books',
     response_model=list[BookModel],
     summary='List all books without filters',
+    dependencies=[Depends(read_replica)],
 )
 async def get_books(
     user: Annotated[User, Depends(auth_user)],
@@ -52,18 +55,26 @@ async def get_books(
         max_distance=distance,
         min_rating=rating,
     )
-    return books
+    return orm_json_response(list[BookModel], books)
 
 
 @router.get(
     path='/books/my',
     response_model=list[BookModel],
     summary='List all books that belong to the current user',
+    dependencies=[Depends(read_only)],
 )
 async def get_my_books(
+    request: Request,
     user: Annotated[User, Depends(auth_user)],
     svc: Annotated[BookService, Depends(get_books_service)],
     limit: int = Query(50, description='Number of books to return'),
 ):
+    etag = await svc.user_books_etag(user, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     books = await svc.list_user_books(user, limit)
-    return books
+    response = orm_json_response(list[BookModel], books)
+    response.headers['ETag'] = etag
+    return response
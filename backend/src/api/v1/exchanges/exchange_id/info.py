@@ -1,12 +1,13 @@
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, Path, HTTPException
+from fastapi import APIRouter, Depends, Path, HTTPException, Request, Response
 
 from domain.exchanges import ExchangeModel
 from core.config import Settings
 from core.security import auth_user
+from core.http import etag_matches, not_modified
 from service.exchanges import ExchangeService, get_exchanges_service
-from database.relational_db import User
+from database.relational_db import User, read_only
 
 router = APIRouter()
 config = Settings() # pyright: ignore[reportCallIssue]
@@ -16,10 +17,18 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/{exchange_id}',
     response_model=ExchangeModel,
     summary='Get specific exchange',
+    dependencies=[Depends(read_only)],
 )
 async def get_exchange(
+    request: Request,
+    response: Response,
     exchange_id: Annotated[UUID, Path(...)],
     user: Annotated[User, Depends(auth_user)],
     svc: Annotated[ExchangeService, Depends(get_exchanges_service)],
 ):
+    etag = await svc.exchange_etag(exchange_id, user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers['ETag'] = etag
     return await svc.get_exchange(exchange_id, user)
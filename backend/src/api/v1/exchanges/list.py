@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Query
 from domain.exchanges import ExchangeModel
 from core.security import auth_user
 from service.exchanges import ExchangeService, get_exchanges_service
-from database.relational_db import User
+from database.relational_db import User, read_only
 
 router = APIRouter()
 
@@ -13,6 +13,7 @@ router = APIRouter()
     path='/exchanges',
     response_model=list[ExchangeModel],
     summary='List all exchanges related to current user',
+    dependencies=[Depends(read_only)],
 )
 async def list_all_exchanges(
     user: Annotated[User, Depends(auth_user)],
@@ -27,6 +28,7 @@ async def list_all_exchanges(
     path='/exchanges/owned',
     response_model=list[ExchangeModel],
     summary='List exchanges where current user is the owner',
+    dependencies=[Depends(read_only)],
 )
 async def list_owned_exchanges(
     user: Annotated[User, Depends(auth_user)],
@@ -42,6 +44,7 @@ async def list_owned_exchanges(
     path='/exchanges/requested',
     response_model=list[ExchangeModel],
     summary='List exchanges requested by current user',
+    dependencies=[Depends(read_only)],
 )
 async def list_requested_exchanges(
     user: Annotated[User, Depends(auth_user)],
@@ -1,10 +1,11 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from domain.geo import CityModel
 from core.config import Settings
 from core.security import auth_user
-from service.geo import GeoService, get_geo_service
+from core.http import json_bytes_response
+from service.reference import ReferenceService, get_reference_service
 
 router = APIRouter()
 config = Settings() # pyright: ignore[reportCallIssue]
@@ -16,7 +17,9 @@ config = Settings() # pyright: ignore[reportCallIssue]
     summary='List all supported cities'
 )
 async def list_cities(
+    request: Request,
     # _: Annotated[User, Depends(auth_user)],
-    svc: Annotated[GeoService, Depends(get_geo_service)],
+    svc: Annotated[ReferenceService, Depends(get_reference_service)],
 ):
-    return await svc.list_cities()
+    cities = svc.cities()
+    return json_bytes_response(request, cities.body, cities.etag)
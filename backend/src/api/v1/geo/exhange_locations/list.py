@@ -1,11 +1,11 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
 from database.relational_db import User
 from domain.geo import ExchangeLocation
 from core.config import Settings
 from core.security import auth_user
-from service.geo import GeoService, get_geo_service
+from service.reference import ReferenceService, get_reference_service
 
 router = APIRouter()
 config = Settings() # pyright: ignore[reportCallIssue]
@@ -18,8 +18,8 @@ config = Settings() # pyright: ignore[reportCallIssue]
 )
 async def list_locations(
     user: Annotated[User, Depends(auth_user)],
-    svc: Annotated[GeoService, Depends(get_geo_service)],
+    svc: Annotated[ReferenceService, Depends(get_reference_service)],
     limit: int = Query(30),
     filter: bool = Query(True, description='Whether to sort points by distance from the user'),
 ):
-    return await svc.list_locations(user, filter, limit)
+    return Response(svc.locations(user, filter, limit), media_type='application/json')
@@ -1,6 +1,7 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Path, HTTPException
 
+from database.relational_db import read_only
 from domain.books import BookModel
 from core.config import Settings
 from core.security import auth_user
@@ -14,6 +15,7 @@ config = Settings() # pyright: ignore[reportCallIssue]
     path='/{location_id}',
     response_model=BookModel,
     summary='Get specific location by its id',
+    dependencies=[Depends(read_only)],
     responses={404: {'description': 'Location with this `location_id` not found'}},
 )
 async def get_location(
@@ -1,7 +1,7 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends
 
-from database.relational_db import User
+from database.relational_db import User, read_only
 from domain.geo import ExchangeLocation
 from core.config import Settings
 from core.security import auth_user
@@ -14,7 +14,8 @@ config = Settings() # pyright: ignore[reportCallIssue]
 @router.get(
     path='/exchange_locations/nearest',
     response_model=ExchangeLocation,
-    summary='Get nearest exchange point to user'
+    summary='Get nearest exchange point to user',
+    dependencies=[Depends(read_only)],
 )
 async def nearest_point(
     user: Annotated[User, Depends(auth_user)],
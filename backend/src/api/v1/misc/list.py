@@ -1,8 +1,9 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query, Response, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, HTTPException
 
 from domain.misc import LanguageModel
-from service.users import UserService, get_user_service
+from core.http import json_bytes_response
+from service.reference import ReferenceService, get_reference_service
 
 
 router = APIRouter()
@@ -14,17 +15,16 @@ router = APIRouter()
     summary='List all languages'
 )
 async def list_languages(
-    response: Response,
-    svc: Annotated[UserService, Depends(get_user_service)],
+    request: Request,
+    svc: Annotated[ReferenceService, Depends(get_reference_service)],
     query: str | None = Query(None, max_length=50),
     limit: int | None = Query(None, ge=1, le=50),
 ):
     if not query:
         if limit is not None:
             raise HTTPException(400, detail="Limit is not allowed when query is empty")
-        limit_ = 50
-        response.headers["Cache-Control"] = "max-age=86400"
-    else:
-        limit_ = limit or 10
+        languages = svc.languages(None, 50)
+        return json_bytes_response(request, languages.body, languages.etag, cache_control="max-age=86400")
 
-    return await svc.list_languages(query, limit_)
+    languages = svc.languages(query, limit or 10)
+    return json_bytes_response(request, languages.body, languages.etag)
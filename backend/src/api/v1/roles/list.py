@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, Query, Path
 from domain.roles import RoleModel
 from service.users import UserService, get_user_service
 from core.security import auth_user
-from database.relational_db import User
+from database.relational_db import User, read_only
 
 router = APIRouter()
 
@@ -13,7 +13,8 @@ router = APIRouter()
 @router.get(
     path='/roles',
     response_model=list[RoleModel],
-    summary='List all roles'
+    summary='List all roles',
+    dependencies=[Depends(read_only)],
 )
 async def list_roles(
     svc: Annotated[UserService, Depends(get_user_service)],
@@ -26,7 +27,8 @@ async def list_roles(
 @router.get(
     path='/roles/{role_id}',
     response_model=RoleModel,
-    summary='Get a role by id'
+    summary='Get a role by id',
+    dependencies=[Depends(read_only)],
 )
 async def get_role(
     svc: Annotated[UserService, Depends(get_user_service)],
@@ -37,7 +39,8 @@ async def get_role(
 @router.get(
     path='/roles/my',
     response_model=list[RoleModel],
-    summary='Get current user roles'
+    summary='Get current user roles',
+    dependencies=[Depends(read_only)],
 )
 async def get_user_roles(
     user: Annotated[User, Depends(auth_user)],
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+
+
+def get_sync_router() -> APIRouter:
+    from .sync import router as sync_router
+
+    router = APIRouter(
+        tags=['Sync'],
+        responses={401: {"description": "Not authorized"}}
+    )
+
+    router.include_router(sync_router)
+
+    return router
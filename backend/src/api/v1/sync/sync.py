@@ -0,0 +1,25 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+
+from database.relational_db import User, read_only
+from domain.sync import SyncResponse
+from core.security import auth_user
+from core.http import orm_json_response
+from service.sync import SyncService, get_sync_service
+
+router = APIRouter()
+
+
+@router.get(
+    path='/sync',
+    response_model=SyncResponse,
+    summary="Own books, exchanges and likes changed since the last sync",
+    dependencies=[Depends(read_only)],
+)
+async def sync(
+    user: Annotated[User, Depends(auth_user)],
+    svc: Annotated[SyncService, Depends(get_sync_service)],
+    since: str | None = Query(None, max_length=64, description='`token` of the previous sync response'),
+):
+    payload = await svc.sync(user, since)
+    return orm_json_response(SyncResponse, payload)
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, UploadFile, File
 
 from database.relational_db import User
 from domain.users import UserModel
+from domain.common import DirectUploadRequest, DirectUpload, FinalizeUpload
 from core.config import Settings
 from core.security import auth_user
 from service.users import UserService, get_user_service
@@ -23,3 +24,31 @@ async def update_profile(
 ):
     await svc.add_picture(file, user)
     return user
+
+
+@router.post(
+    path='/picture/presign',
+    response_model=DirectUpload,
+    summary='Get a presigned url to upload profile picture straight to storage',
+    responses={409: {'description': 'Storage has no direct uploads, use PUT /picture.'}},
+)
+async def presign_picture(
+    payload: DirectUploadRequest,
+    user: Annotated[User, Depends(auth_user)],
+    svc: Annotated[UserService, Depends(get_user_service)],
+):
+    return await svc.presign_picture(payload, user)
+
+
+@router.post(
+    path='/picture/finalize',
+    response_model=UserModel,
+    summary='Set profile picture uploaded with a presigned url'
+)
+async def finalize_picture(
+    payload: FinalizeUpload,
+    user: Annotated[User, Depends(auth_user)],
+    svc: Annotated[UserService, Depends(get_user_service)],
+):
+    await svc.finalize_picture(payload.key, user)
+    return user
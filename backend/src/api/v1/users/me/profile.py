@@ -1,11 +1,12 @@
 import logging
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
-from database.relational_db import User
+from database.relational_db import User, read_only
 from domain.users import UserModel, UserPatch
 from core.config import Settings
 from core.security import auth_user
+from core.http import etag_matches, make_etag, not_modified
 from service.users import UserService, get_user_service
 
 router = APIRouter()
@@ -15,14 +16,29 @@ logger = logging.getLogger(__name__)
 @router.get(
     path='/me',
     response_model=UserModel,
-    summary='Get user account info'
+    summary='Get user account info',
+    dependencies=[Depends(read_only)],
 )
 async def profile(
+    request: Request,
+    response: Response,
     user: Annotated[User, Depends(auth_user)],
     # TODO: Add expandable fields
     # expand: Annotated[list[ExpandUserFields], Query(default_factory=list, description="Fields to expand with in the response")],
     # svc: Annotated[UserService, Depends(get_user_service)],
 ):
+    # Genres and roles live in association tables and don't bump `updated_at`
+    etag = make_etag(
+        'users:me',
+        user.id,
+        user.updated_at or user.created_at,
+        sorted(g.id for g in user.favorite_genres),
+        sorted(user.role_slugs),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response.headers['ETag'] = etag
     return user
 
 
@@ -5,6 +5,7 @@ from database.relational_db import User
 from domain.users import UserNearby
 from core.config import Settings
 from core.security import auth_user
+from core.replicas import read_replica
 from service.users import UserService, get_user_service
 
 router = APIRouter()
@@ -14,7 +15,8 @@ config = Settings() # pyright: ignore[reportCallIssue]
 @router.get(
     path='/nearby',
     response_model=list[UserNearby],
-    summary='Get nearby users (not tested yet)'
+    summary='Get nearby users (not tested yet)',
+    dependencies=[Depends(read_replica)],
 )
 async def nearby_users(
     user: Annotated[User, Depends(auth_user)],
@@ -0,0 +1,5 @@
+"""
+Standalone performance checks, run from `backend/src`:
+
+    python -m benchmarks.<name> --help
+"""
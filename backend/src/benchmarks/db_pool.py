@@ -0,0 +1,91 @@
+"""
+Connection pool under overload: `--overload` times more concurrent requests
+than the pool can serve at once (`pool_size + max_overflow`), each holding a
+connection for `--hold-ms`. Shows checkout waits, overflow and timeouts as
+counted by `InstrumentedPool`.
+
+Needs a reachable `DATABASE_URL`; the engine is built from the same `DB_*`
+settings as the app (set `DB_PGBOUNCER=true` to check the PgBouncer profile).
+
+    python -m benchmarks.db_pool --pool-size 10 --max-overflow 10 --overload 2
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.config import Settings
+from database.relational_db.session import engine_options
+
+
+async def main(pool_size: int, max_overflow: int, pool_timeout: float, overload: float, hold_ms: int, rounds: int) -> None:
+    engine = create_async_engine(
+        Settings().DATABASE_URL,  # type: ignore
+        **engine_options(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout, echo=False),
+    )
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    workers = max(1, int((pool_size + max_overflow) * overload))
+    latencies: list[float] = []
+    failed = 0
+
+    async def _request() -> None:
+        nonlocal failed
+        started = time.perf_counter()
+        try:
+            async with sessions() as session:
+                await session.execute(text("SELECT pg_sleep(:s)"), {"s": hold_ms / 1000})
+        except PoolTimeout:
+            failed += 1
+            return
+        latencies.append(time.perf_counter() - started)
+
+    async def _worker() -> None:
+        for _ in range(rounds):
+            await _request()
+
+    # Warm up so connection setup is not counted as waiting
+    await asyncio.gather(*(_request() for _ in range(pool_size)))
+    engine.pool.metrics.__init__()  # type: ignore[attr-defined]
+    latencies.clear()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+    stats = engine.pool.stats()  # type: ignore[attr-defined]
+    await engine.dispose()
+
+    latencies.sort()
+    ideal = hold_ms / 1000 * rounds * workers / (pool_size + max_overflow)
+    print(f"{workers} concurrent workers x {rounds} requests, pool {pool_size}+{max_overflow}, hold {hold_ms}ms")
+    print(f"elapsed {elapsed:.2f}s (ideal {ideal:.2f}s), {len(latencies) / elapsed:.0f} req/s, {failed} timed out")
+    if latencies:
+        print(
+            "request latency ms: "
+            f"p50 {latencies[len(latencies) // 2] * 1000:.0f}  "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.0f}  "
+            f"max {latencies[-1] * 1000:.0f}"
+        )
+    print(
+        "checkout wait ms: "
+        + "  ".join(f"{key[5:]} {stats[key] * 1000:.1f}" for key in ("wait_avg", "wait_p50", "wait_p95", "wait_p99", "wait_max"))
+    )
+    print(
+        f"in use max {stats['in_use_max']}, overflow events {stats['overflow_events']}, "
+        f"slow checkouts {stats['slow_checkouts']}, timeouts {stats['timeouts']}"
+    )
+
+
+if __name__ == "__main__":
+    settings = Settings()  # type: ignore
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool-size", type=int, default=settings.DB_POOL_SIZE)
+    parser.add_argument("--max-overflow", type=int, default=settings.DB_MAX_OVERFLOW)
+    parser.add_argument("--pool-timeout", type=float, default=settings.DB_POOL_TIMEOUT)
+    parser.add_argument("--overload", type=float, default=2.0, help="Concurrent workers per pooled connection")
+    parser.add_argument("--hold-ms", type=int, default=50, help="Time every request holds its connection")
+    parser.add_argument("--rounds", type=int, default=20, help="Requests per worker")
+    args = parser.parse_args()
+    asyncio.run(main(args.pool_size, args.max_overflow, args.pool_timeout, args.overload, args.hold_ms, args.rounds))
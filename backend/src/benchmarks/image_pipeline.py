@@ -0,0 +1,65 @@
+"""
+Images per second of the photo pipeline: one core rendering every
+`IMAGE_VARIANTS` entry in-process, then the process pool used by the API.
+
+The source is a synthetic JPEG, noise keeps the encoder from taking shortcuts.
+
+    python -m benchmarks.image_pipeline --images 20 --megapixels 12
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+
+from PIL import Image
+
+from core.config import Settings
+from core.images import IMAGE_VARIANTS, _render_variants, render_variants, shutdown_image_pool
+
+
+settings = Settings()  # type: ignore
+
+
+def _source(megapixels: float) -> bytes:
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    img = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=90)
+    return out.getvalue()
+
+
+def _single_core(data: bytes, images: int) -> float:
+    started = time.perf_counter()
+    for _ in range(images):
+        _render_variants(
+            data, IMAGE_VARIANTS, settings.IMAGE_FORMAT, settings.IMAGE_QUALITY, settings.IMAGE_MAX_PIXELS
+        )
+    return images / (time.perf_counter() - started)
+
+
+async def _pool(data: bytes, images: int) -> float:
+    await render_variants(data)  # spawn the workers outside of the timing
+    started = time.perf_counter()
+    await asyncio.gather(*(render_variants(data) for _ in range(images)))
+    return images / (time.perf_counter() - started)
+
+
+def main(images: int, megapixels: float) -> None:
+    data = _source(megapixels)
+    print(f"source: {megapixels} MP JPEG, {len(data) // 1024} KB, format {settings.IMAGE_FORMAT}")
+    print(f"1 core: {_single_core(data, images):.2f} images/s")
+    try:
+        workers = settings.IMAGE_WORKERS or os.cpu_count()
+        print(f"pool ({workers} workers): {asyncio.run(_pool(data, images)):.2f} images/s")
+    finally:
+        shutdown_image_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--megapixels", type=float, default=12)
+    args = parser.parse_args()
+    main(args.images, args.megapixels)
@@ -0,0 +1,297 @@
+"""
+Index advisor. Runs the hot repository queries of `BooksInterface`,
+`ExchangesInterface`, `BookEventsInterface` and `UserInterface`, including
+the selectin loads the ORM issues after them, under
+EXPLAIN (ANALYZE, BUFFERS) and reports sequential scans of large tables with
+the filter they evaluated. Every call runs in a transaction that is rolled
+back, so the few writes among them leave nothing behind.
+
+Run it against a seeded dataset, small tables are scanned whatever the
+indexes are:
+
+    python -m seeders bulk --users 100000 --books 1000000 --events 5000000
+    python -m benchmarks.index_advisor
+    python -m benchmarks.index_advisor --min-rows 50000 --only books --json advisor.json
+
+Exits with 1 when some query still scans a table over `--min-rows`, so the
+report can gate a migration.
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import domain.users  # noqa: F401, mappers of `domain.books` need it first
+from database.relational_db import (
+    BookEventsInterface,
+    BooksInterface,
+    ExchangesInterface,
+    UserInterface,
+)
+from database.relational_db.session import async_session, engine
+from domain.books import ApprovalStatus
+from domain.exchanges import ExchangeProgress
+
+SAMPLE = """
+SELECT e.owner_id, e.requester_id, e.book_id, u.email, u.latitude, u.longitude, u.city_id, b.genre_id
+FROM exchanges e
+JOIN users u ON u.id = e.requester_id
+JOIN books b ON b.id = e.book_id
+WHERE u.latitude IS NOT NULL
+ORDER BY e.created_at DESC
+LIMIT 1
+"""
+LIKED = "SELECT book_id FROM book_events WHERE user_id = :user_id AND interaction = 'LIKE' LIMIT 20"
+# Quoted constants with their cast, and bare numbers compared against
+_LITERALS = re.compile(r"'(?:[^']|'')*'(?:::[\w ]+(?:\[\])?)?|(?<=[=<>] )-?\d+(?:\.\d+)?\b")
+
+
+@dataclass
+class Sample:
+    """Ids of a user who owns books and requested an exchange, so every query finds rows"""
+    owner_id: Any
+    user_id: Any
+    book_id: Any
+    email: str
+    lat: float
+    lon: float
+    city_id: int | None
+    genre_id: int
+    liked: list = field(default_factory=list)
+
+    @property
+    def since(self) -> datetime:
+        return datetime.now(UTC) - timedelta(days=7)
+
+
+Case = Callable[[AsyncSession, Sample], Awaitable[Any]]
+
+
+async def _user(session: AsyncSession, s: Sample):
+    return await UserInterface(session).get_by_id(s.user_id)
+
+
+async def _list_books(session: AsyncSession, s: Sample, **kwargs: Any):
+    return await BooksInterface(session).list_books(await _user(session, s), 50, **kwargs)
+
+
+async def _recommended(session: AsyncSession, s: Sample):
+    return await BooksInterface(session).recommended_books(await _user(session, s), s.lat, s.lon, 20)
+
+
+async def _with_distance(session: AsyncSession, s: Sample):
+    return await BooksInterface(session).with_distance(s.book_id, await _user(session, s))
+
+
+CASES: dict[str, Case] = {
+    # Books
+    "books.by_id": lambda session, s: BooksInterface(session).by_id(s.book_id),
+    "books.with_distance": _with_distance,
+    "books.check_ownership": lambda session, s: BooksInterface(session).check_ownership(s.book_id, s.owner_id),
+    "books.list_books": _list_books,
+    "books.list_books[search]": lambda session, s: _list_books(session, s, search="river"),
+    "books.list_books[genre]": lambda session, s: _list_books(session, s, genre=str(s.genre_id)),
+    "books.list_books[rating]": lambda session, s: _list_books(session, s, sort="rating"),
+    "books.recommended_books": _recommended,
+    "books.detail_version": lambda session, s: BooksInterface(session).detail_version(s.book_id, s.user_id),
+    "books.user_books_version": lambda session, s: BooksInterface(session).user_books_version(s.owner_id),
+    "books.changed_user_books": lambda session, s: BooksInterface(session).changed_user_books(s.owner_id, s.since),
+    "books.list_user_books": lambda session, s: BooksInterface(session).list_user_books(s.owner_id, 50),
+    "books.list_books_for_approval": (
+        lambda session, s: BooksInterface(session).list_books_for_approval(ApprovalStatus.PENDING, 50)
+    ),
+    # Exchanges
+    "exchanges.changed_for_user": (
+        lambda session, s: ExchangesInterface(session).changed_for_user(s.user_id, s.since)
+    ),
+    "exchanges.list_all": lambda session, s: ExchangesInterface(session).list_all(limit=50),
+    "exchanges.admin_list_exchanges": (
+        lambda session, s: ExchangesInterface(session).admin_list_exchanges(progress=ExchangeProgress.CREATED)
+    ),
+    "exchanges.by_requester": lambda session, s: ExchangesInterface(session).by_requester(s.user_id),
+    "exchanges.by_owner": lambda session, s: ExchangesInterface(session).by_owner(s.owner_id),
+    "exchanges.by_book_for_requester": (
+        lambda session, s: ExchangesInterface(session).by_book_for_requester(s.book_id, s.user_id)
+    ),
+    "exchanges.exists_finished_for_book": (
+        lambda session, s: ExchangesInterface(session).exists_finished_for_book(s.book_id)
+    ),
+    # Events
+    "events.liked_book_ids": (
+        lambda session, s: BookEventsInterface(session).liked_book_ids(s.user_id, [s.book_id, *s.liked])
+    ),
+    "events.delete_likes": lambda session, s: BookEventsInterface(session).delete_likes(s.user_id, s.liked),
+    "events.list_by_user_books": (
+        lambda session, s: BookEventsInterface(session).list_by_user_books([s.book_id, *s.liked], s.user_id)
+    ),
+    "events.likes_since": lambda session, s: BookEventsInterface(session).likes_since(s.user_id, s.since),
+    "events.users_by_day": lambda session, s: BookEventsInterface(session).users_by_day(30),
+    "events.stats_by_days[book]": lambda session, s: BookEventsInterface(session).stats_by_days(30, s.book_id),
+    # Users
+    "users.get_by_email": lambda session, s: UserInterface(session).get_by_email(s.email),
+    "users.nearby_users": lambda session, s: UserInterface(session).nearby_users(s.lat, s.lon, 5),
+    "users.admin_list_users": lambda session, s: UserInterface(session).admin_list_users(limit=50),
+    "users.admin_list_users[city]": (
+        lambda session, s: UserInterface(session).admin_list_users(city_id=s.city_id, limit=50)
+    ),
+    "users.registrations_by_days": lambda session, s: UserInterface(session).registrations_by_days(30),
+}
+
+
+def filter_shape(condition: str | None) -> str:
+    """Scan filter with its literals replaced, so the same predicate groups across values"""
+    return _LITERALS.sub("?", condition) if condition else "(no filter)"
+
+
+@dataclass
+class SeqScan:
+    table: str
+    filter: str | None
+    rows: int  # returned, over all loops
+    removed: int  # discarded by the filter, over all loops
+    blocks: int  # shared buffers hit or read
+
+
+@dataclass
+class Explained:
+    statement: str
+    milliseconds: float
+    scans: list[SeqScan]
+
+
+def _seq_scans(node: dict[str, Any]) -> list[SeqScan]:
+    scans = []
+    if node["Node Type"] == "Seq Scan":
+        loops = node.get("Actual Loops", 1)
+        scans.append(SeqScan(
+            table=node["Relation Name"],
+            filter=node.get("Filter"),
+            rows=int(node.get("Actual Rows", 0) * loops),
+            removed=int(node.get("Rows Removed by Filter", 0) * loops),
+            blocks=node.get("Shared Hit Blocks", 0) + node.get("Shared Read Blocks", 0),
+        ))
+    for child in node.get("Plans", ()):
+        scans.extend(_seq_scans(child))
+    return scans
+
+
+class Capture:
+    """Statements the engine runs while `active`, with their driver parameters"""
+    def __init__(self):
+        self.active = False
+        self.statements: list[tuple[str, Any]] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_execute)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.active and not executemany:
+            self.statements.append((statement, parameters))
+
+    async def run(self, case: Case, sample: Sample) -> list[Explained]:
+        """Runs `case` in a fresh session, then explains what it ran in the same transaction"""
+        async with async_session() as session:
+            self.statements, self.active = [], True
+            try:
+                await case(session, sample)
+            finally:
+                self.active = False
+            connection = await session.connection()
+            explained = []
+            for statement, parameters in self.statements:
+                if not statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE")):
+                    continue
+                result = await connection.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+                )
+                plan = result.scalar_one()
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+                explained.append(Explained(
+                    statement=" ".join(statement.split()),
+                    milliseconds=plan["Execution Time"],
+                    scans=_seq_scans(plan["Plan"]),
+                ))
+            await session.rollback()
+        return explained
+
+
+async def _sample(session: AsyncSession) -> Sample:
+    row = (await session.execute(text(SAMPLE))).first()
+    if row is None:
+        raise SystemExit("No exchanges in the database, run `python -m seeders bulk` first")
+    sample = Sample(*row)
+    sample.liked = list((await session.scalars(text(LIKED), {"user_id": sample.user_id})).all())
+    return sample
+
+
+async def _table_rows(session: AsyncSession) -> dict[str, int]:
+    """Planner estimate of every table's size, current after ANALYZE"""
+    rows = await session.execute(text(
+        "SELECT relname, reltuples::bigint FROM pg_class "
+        "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+    ))
+    return {name: count for name, count in rows.tuples()}
+
+
+async def main(args: argparse.Namespace) -> int:
+    async with async_session() as session:
+        sample = await _sample(session)
+        sizes = await _table_rows(session)
+    capture = Capture()
+    cases = {name: case for name, case in CASES.items() if not args.only or name.startswith(tuple(args.only))}
+
+    report: dict[str, list[dict[str, Any]]] = {}
+    findings: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for name, case in cases.items():
+        started = time.perf_counter()
+        explained = await capture.run(case, sample)
+        elapsed = (time.perf_counter() - started) * 1000
+        large = [
+            (statement, scan)
+            for statement in explained
+            for scan in statement.scans
+            if sizes.get(scan.table, 0) >= args.min_rows
+        ]
+        for _, scan in large:
+            findings[scan.table, filter_shape(scan.filter)].append(name)
+        report[name] = [
+            {"statement": e.statement, "milliseconds": e.milliseconds, "seq_scans": [vars(s) for s in e.scans]}
+            for e in explained
+        ]
+
+        print(f"{name:<36} {len(explained):>3} statements {sum(e.milliseconds for e in explained):>9.1f} ms "
+              f"(call {elapsed:.0f} ms)")
+        for statement, scan in large:
+            print(f"    seq scan of {scan.table} ({sizes[scan.table]:,} rows), kept {scan.rows:,}, "
+                  f"removed {scan.removed:,}, {scan.blocks:,} blocks, filter: {filter_shape(scan.filter)}")
+            if args.verbose:
+                print(f"      {statement.statement[:400]}")
+
+    if findings:
+        print(f"\nsequential scans of tables over {args.min_rows:,} rows:")
+        for (table, condition), names in sorted(findings.items(), key=lambda item: -len(item[1])):
+            print(f"  {table:<14} {condition}\n    in {', '.join(sorted(set(names)))}")
+    else:
+        print(f"\nno sequential scans of tables over {args.min_rows:,} rows")
+
+    if args.json:
+        args.json.write_text(json.dumps({"sizes": sizes, "cases": report}, indent=2, default=str) + "\n")
+    await engine.dispose()
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-rows", type=int, default=10_000, help="Smaller tables are not reported")
+    parser.add_argument("--only", nargs="*", help="Case name prefixes, e.g. books exchanges.by_")
+    parser.add_argument("--json", type=Path, help="Write every plan summary as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Print the statement of every reported scan")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args)))
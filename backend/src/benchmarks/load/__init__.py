@@ -0,0 +1,6 @@
+"""
+End-to-end load tests against a running API and a generated dataset:
+
+    python -m seeders bulk --help              # build the dataset
+    python -m benchmarks.load --help           # run the traffic, compare with the baseline
+"""
@@ -0,0 +1,109 @@
+"""
+Load test of a running API. Virtual users log in as generated accounts
+(`python -m seeders bulk`) and run the scenarios of `--mix` in a
+closed loop for `--duration` seconds after `--warmup`. Prints p50 / p95 / p99
+and throughput per endpoint, and the change against the stored baseline;
+exits with 1 when something regressed by more than `--tolerance`.
+
+    python -m benchmarks.load --base-url http://localhost:8080 --concurrency 50 --duration 60
+    python -m benchmarks.load --mix clicks=1 --save-baseline   # store this run as the baseline
+
+Compare runs of the same dataset, mix, concurrency and machine only.
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from random import Random
+
+import httpx
+
+from .report import BASELINE, Recorder, diff, load, print_table, results, save
+from .scenarios import DEFAULT_MIX, SCENARIOS, VirtualUser
+
+
+def _mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}, one of {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def _virtual_user(vu: VirtualUser, mix: dict[str, float], until: float, counts: dict[str, int]) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < until:
+        name = vu.rng.choices(names, weights)[0]
+        await SCENARIOS[name](vu)
+        counts[name] = counts.get(name, 0) + 1
+
+
+async def main(args: argparse.Namespace) -> int:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        rng = Random(args.seed)
+        vus = [
+            VirtualUser(n, client, recorder, Random(rng.random()), args.users)
+            for n in rng.sample(range(args.users), args.concurrency)
+        ]
+        signed_in = await asyncio.gather(*(vu.sign_in() for vu in vus))
+        if not all(signed_in):
+            print(f"{signed_in.count(False)} of {len(vus)} virtual users could not log in, is the dataset loaded?")
+            return 2
+
+        counts: dict[str, int] = {}
+        started = time.monotonic()
+        until = started + args.warmup + args.duration
+        runs = asyncio.gather(*(_virtual_user(vu, args.mix, until, counts) for vu in vus))
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        measured = time.monotonic()
+        await runs
+        recorder.recording = False
+        duration = time.monotonic() - measured
+
+    result = results(recorder, duration, {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "mix": args.mix,
+        "seed": args.seed,
+        "scenarios_run": counts,
+    })
+    print_table(result)
+    if args.out:
+        save(result, args.out)
+
+    if args.save_baseline:
+        save(result, args.baseline)
+        print(f"\nstored as the baseline in {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nno baseline in {args.baseline}, store one with --save-baseline")
+        return 0
+    regressions = diff(result, load(args.baseline), args.tolerance)
+    if regressions:
+        print("\nregressions:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--users", type=int, default=100_000, help="Generated accounts in the dataset")
+    parser.add_argument("--concurrency", type=int, default=50, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds before measuring")
+    parser.add_argument("--mix", type=_mix, default=_mix(DEFAULT_MIX), help=f"Scenario weights, default {DEFAULT_MIX}")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--out", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative change reported as a regression")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args)))
@@ -0,0 +1,115 @@
+"""Latency and throughput per endpoint of a load run, and the diff against a baseline"""
+import json
+import math
+import platform
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+@dataclass
+class Recorder:
+    """Every request of the measured window, by endpoint label (method and route template)"""
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, Counter[int]] = field(default_factory=lambda: defaultdict(Counter))
+    recording: bool = False  # off during warm-up and setup
+
+    def observe(self, label: str, seconds: float, status: int) -> None:
+        if self.recording:
+            self.latencies[label].append(seconds)
+            self.statuses[label][status] += 1
+
+    def summary(self, duration: float) -> dict[str, dict[str, Any]]:
+        endpoints = {}
+        for label in sorted(self.latencies):
+            ordered = sorted(self.latencies[label])
+            statuses = self.statuses[label]
+            endpoints[label] = {
+                "requests": len(ordered),
+                "errors": sum(n for status, n in statuses.items() if status >= 400 or status == 0),
+                "statuses": {str(status): n for status, n in sorted(statuses.items())},
+                "rps": len(ordered) / duration,
+                "p50": percentile(ordered, 50) * 1000,
+                "p95": percentile(ordered, 95) * 1000,
+                "p99": percentile(ordered, 99) * 1000,
+            }
+        return endpoints
+
+
+def results(recorder: Recorder, duration: float, options: dict[str, Any]) -> dict[str, Any]:
+    endpoints = recorder.summary(duration)
+    return {
+        "meta": {
+            "finished": datetime.now(UTC).isoformat(timespec="seconds"),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "duration": duration,
+            **options,
+        },
+        "total_rps": sum(endpoint["requests"] for endpoint in endpoints.values()) / duration,
+        "endpoints": endpoints,
+    }
+
+
+def print_table(result: dict[str, Any]) -> None:
+    print(f"{'endpoint':<44} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, row in result["endpoints"].items():
+        print(
+            f"{label:<44} {row['requests']:>9} {row['errors']:>7} {row['rps']:>8.1f} "
+            f"{row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f}"
+        )
+    print(f"{'total':<44} {'':>9} {'':>7} {result['total_rps']:>8.1f}")
+
+
+def _change(current: float, base: float) -> float:
+    return (current - base) / base if base else 0.0
+
+
+def diff(result: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """
+    Prints the change of every metric against `baseline` and returns the
+    regressions: a latency percentile over `tolerance` slower, or throughput
+    or the error-free share of requests `tolerance` lower.
+    """
+    regressions = []
+    print(f"\nagainst the baseline of {baseline['meta'].get('finished', '?')} (tolerance {tolerance:.0%})")
+    print(f"{'endpoint':<44} {'req/s':>16} {'p50':>16} {'p95':>16} {'p99':>16}")
+    for label, row in result["endpoints"].items():
+        base = baseline["endpoints"].get(label)
+        if base is None:
+            print(f"{label:<44} new endpoint")
+            continue
+        cells = []
+        for metric in ("rps", "p50", "p95", "p99"):
+            change = _change(row[metric], base[metric])
+            worse = change < -tolerance if metric == "rps" else change > tolerance
+            cells.append(f"{change:>+14.1%}{' !' if worse else '  '}")
+            if worse:
+                regressions.append(f"{label} {metric} {base[metric]:.1f} -> {row[metric]:.1f}")
+        error_rate = row["errors"] / max(row["requests"], 1)
+        base_error_rate = base["errors"] / max(base["requests"], 1)
+        if error_rate > base_error_rate + tolerance / 10:
+            regressions.append(f"{label} errors {base_error_rate:.1%} -> {error_rate:.1%}")
+        print(f"{label:<44} {''.join(cells)}")
+    for label in baseline["endpoints"].keys() - result["endpoints"].keys():
+        print(f"{label:<44} not requested in this run")
+    return regressions
+
+
+def save(result: dict[str, Any], path: Path) -> None:
+    path.write_text(json.dumps(result, indent=2) + "\n")
+
+
+def load(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
@@ -0,0 +1,141 @@
+"""
+Scripted traffic. A virtual user logs in once and then runs scenarios picked
+by weight, back to back. Every request is recorded under its method and route
+template, so `/books/{book_id}` is one row whatever the id.
+"""
+import asyncio
+import time
+from random import Random
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from seeders.bulk import LOAD_PASSWORD, WORDS, load_email
+from .report import Recorder
+
+API = "/api/v1"
+
+
+class VirtualUser:
+    def __init__(self, n: int, client: httpx.AsyncClient, recorder: Recorder, rng: Random, users: int):
+        self.n = n
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.users = users
+        self.user_id: str | None = None
+        self.headers: dict[str, str] = {}
+        self.book_ids: list[str] = []  # seen in listings, other users' only
+
+    async def call(self, method: str, path: str, label: str | None = None, **kwargs: Any) -> httpx.Response | None:
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, API + path, headers=headers, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0
+        self.recorder.observe(f"{method} {label or path}", time.perf_counter() - started, status)
+        return response
+
+    async def login(self, n: int | None = None) -> httpx.Response | None:
+        return await self.call(
+            "POST", "/auth/login",
+            json={"email": load_email(self.n if n is None else n), "password": LOAD_PASSWORD},
+            headers={"X-Client": "mobile"},
+        )
+
+    async def sign_in(self) -> bool:
+        response = await self.login()
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        me = await self.call("GET", "/users/me")
+        if me is not None and me.status_code == 200:
+            self.user_id = me.json()["id"]
+        return True
+
+    def remember(self, response: httpx.Response | None) -> None:
+        if response is None or response.status_code != 200:
+            return
+        ids = [book["id"] for book in response.json() if book["owner"]["id"] != self.user_id]
+        self.book_ids = (ids + self.book_ids)[:200]
+
+    async def some_books(self, k: int) -> list[str]:
+        if not self.book_ids:
+            self.remember(await self.call("GET", "/books", params={"limit": 50}))
+        return self.rng.sample(self.book_ids, min(k, len(self.book_ids)))
+
+
+async def browse(vu: VirtualUser) -> None:
+    sort = vu.rng.choice([None, "newest", "distance", "rating"])
+    params = {"limit": 50, **({"sort": sort} if sort else {})}
+    vu.remember(await vu.call("GET", "/books", params=params))
+    for book_id in await vu.some_books(3):
+        await vu.call("GET", f"/books/{book_id}", "/books/{book_id}")
+    await vu.call("GET", "/books/genres")
+
+
+async def search(vu: VirtualUser) -> None:
+    query = vu.rng.choice(WORDS)
+    if vu.rng.random() < 0.3:
+        query = query[: vu.rng.randint(3, len(query))]  # typing in progress
+    vu.remember(await vu.call("GET", "/books", "/books?query", params={"query": query, "limit": 20}))
+
+
+async def for_you(vu: VirtualUser) -> None:
+    vu.remember(await vu.call("GET", "/books/for_you", params={"limit": 20}))
+
+
+async def clicks(vu: VirtualUser) -> None:
+    """A storm of single clicks, then the batched form of the same traffic"""
+    book_ids = await vu.some_books(20)
+    await asyncio.gather(*(vu.call("POST", f"/books/{book_id}/click", "/books/{book_id}/click") for book_id in book_ids))
+    items = [{"book_id": vu.rng.choice(book_ids), "interaction": "click"} for _ in range(50)] if book_ids else []
+    if items:
+        await vu.call("POST", "/books/interactions:batch", json={"items": items})
+
+
+async def login(vu: VirtualUser) -> None:
+    """Password checks of other accounts, the argon2 thread pool under pressure"""
+    await vu.login(vu.rng.randrange(vu.users))
+
+
+async def exchange(vu: VirtualUser) -> None:
+    """Reserve a book and withdraw the request, then go through incoming requests"""
+    for book_id in await vu.some_books(1):
+        response = await vu.call("POST", f"/books/{book_id}/reserve", "/books/{book_id}/reserve", json={"comment": "load test"})
+        if response is not None and response.status_code == 200:
+            exchange_id = response.json()["id"]
+            await vu.call("GET", f"/exchanges/{exchange_id}", "/exchanges/{exchange_id}")
+            await vu.call(
+                "PATCH", f"/exchanges/{exchange_id}/cancel", "/exchanges/{exchange_id}/cancel",
+                json={"cancel_reason": "load test"},
+            )
+        else:
+            vu.book_ids.remove(book_id)  # reserved by someone else meanwhile
+    owned = await vu.call("GET", "/exchanges/owned", params={"limit": 20})
+    await vu.call("GET", "/exchanges/requested", params={"limit": 20})
+    if owned is None or owned.status_code != 200:
+        return
+    for item in owned.json():
+        if item["progress"] == "created":
+            await vu.call(
+                "PATCH", f"/exchanges/{item['id']}/decline", "/exchanges/{exchange_id}/decline",
+                json={"cancel_reason": "load test"},
+            )
+            break
+
+
+Scenario = Callable[[VirtualUser], Awaitable[None]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "browse": browse,
+    "search": search,
+    "for_you": for_you,
+    "clicks": clicks,
+    "login": login,
+    "exchange": exchange,
+}
+
+DEFAULT_MIX = "browse=35,search=15,for_you=20,clicks=15,login=5,exchange=10"
@@ -0,0 +1,40 @@
+"""
+How much `LoopWatchdog`'s heartbeat costs a busy loop: iterations of short
+callbacks with and without it. Stall reporting is covered by
+`tests/test_loop_watchdog.py`.
+
+    python -m benchmarks.loop_watchdog --seconds 2
+"""
+import argparse
+import asyncio
+import time
+
+from core.watchdog import LoopWatchdog
+
+
+async def _busy(seconds: float) -> int:
+    """Short callbacks for `seconds`, the number that ran"""
+    ran = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0)
+        ran += 1
+    return ran
+
+
+async def main(seconds: float, interval: float) -> None:
+    plain = await _busy(seconds)
+    watchdog = LoopWatchdog(interval=interval, threshold=1)
+    watchdog.start()
+    watched = await _busy(seconds)
+    await watchdog.stop()
+    print(f"loop iterations in {seconds} s: {plain} without the watchdog, {watched} with it "
+          f"({(plain - watched) / plain:.2%} fewer)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2)
+    parser.add_argument("--interval", type=float, default=0.02, help="Heartbeat of the watchdog")
+    args = parser.parse_args()
+    asyncio.run(main(args.seconds, args.interval))
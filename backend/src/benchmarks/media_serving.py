@@ -0,0 +1,87 @@
+"""
+Requests per second of the `/media` mount: stock `StaticFiles` against
+`MediaFiles` with and without X-Accel-Redirect offload.
+
+Apps are called in-process through ASGI, so numbers show the worker cost per
+request, not network throughput.
+
+    python -m benchmarks.media_serving --requests 2000 --size-kb 200
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from core.storage import MediaFiles
+
+
+KEY = "media/benchmark/full.webp"
+
+
+def _app(files: StaticFiles) -> Starlette:
+    return Starlette(routes=[Mount("/media", files)])
+
+
+async def _run(app: Starlette, requests: int, concurrency: int, headers: dict[str, str]) -> tuple[float, int]:
+    transport = httpx.ASGITransport(app=app)
+    sem = asyncio.Semaphore(concurrency)
+    status: int = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def _one() -> None:
+            nonlocal status
+            async with sem:
+                resp = await client.get(f"/media/{KEY}", headers=headers)
+                status = resp.status_code
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+    return requests / elapsed, status
+
+
+async def main(requests: int, concurrency: int, size_kb: int) -> None:
+    with tempfile.TemporaryDirectory() as root:
+        path = Path(root) / KEY
+        path.parent.mkdir(parents=True)
+        path.write_bytes(os.urandom(size_kb * 1024))
+
+        plain = StaticFiles(directory=root)
+        etag = MediaFiles.etag_for(path.stat())
+        plain_etag = (await httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=_app(plain)), base_url="http://bench"
+        ).get(f"/media/{KEY}")).headers["etag"]
+
+        apps = {
+            "StaticFiles": (_app(plain), plain_etag),
+            "MediaFiles": (_app(MediaFiles(root)), etag),
+            "MediaFiles x-accel": (_app(MediaFiles(root, offload="x-accel", offload_prefix="/internal")), etag),
+        }
+        scenarios = {
+            "full GET": lambda _: {},
+            "If-None-Match": lambda tag: {"if-none-match": tag},
+            "Range 64 KiB": lambda _: {"range": "bytes=0-65535"},
+        }
+
+        print(f"{requests} requests, concurrency {concurrency}, {size_kb} KiB file")
+        print(f"{'app':<20}{'scenario':<16}{'req/s':>10}{'status':>8}")
+        for name, (app, tag) in apps.items():
+            for scenario, headers in scenarios.items():
+                rps, status = await _run(app, requests, concurrency, headers(tag))
+                print(f"{name:<20}{scenario:<16}{rps:>10.0f}{status:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--size-kb", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.size_kb))
@@ -0,0 +1,83 @@
+"""
+Per-request cost of `MetricsMiddleware`: a bare ASGI endpoint (what routing
+leaves behind) called with and without the middleware in front of it.
+`--multiprocess` uses the mmap-backed values of multi-worker deployments.
+
+    python -m benchmarks.metrics_middleware --requests 20000 --multiprocess
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+def _scope() -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/books/42",
+        "raw_path": b"/books/42",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+
+async def _per_request(app, requests: int) -> float:
+    for _ in range(200):
+        await app(_scope(), _receive, _send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(_scope(), _receive, _send)
+    return (time.perf_counter() - started) / requests
+
+
+async def main(requests: int, rounds: int) -> None:
+    from types import SimpleNamespace
+
+    from core.metrics import MULTIPROCESS, MetricsMiddleware
+
+    route = SimpleNamespace(path="/books/{book_id}")
+
+    async def endpoint(scope, receive, send) -> None:
+        scope["route"] = route  # set by the router in the app
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    instrumented = MetricsMiddleware(endpoint)
+    bare, wrapped = [], []
+    # Interleaved rounds, the best of each keeps scheduler noise out
+    for _ in range(rounds):
+        bare.append(await _per_request(endpoint, requests))
+        wrapped.append(await _per_request(instrumented, requests))
+
+    print(f"values: {'multiprocess (mmap)' if MULTIPROCESS else 'in-process'}")
+    print(f"without middleware {min(bare) * 1e6:.2f} us per request")
+    print(f"with middleware    {min(wrapped) * 1e6:.2f} us per request")
+    print(f"overhead           {(min(wrapped) - min(bare)) * 1e6:.2f} us per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--multiprocess", action="store_true", help="Write samples to a temporary directory")
+    args = parser.parse_args()
+    if args.multiprocess:
+        # Read when prometheus_client is first imported
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-bench-")
+    asyncio.run(main(args.requests, args.rounds))
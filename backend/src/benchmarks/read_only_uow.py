@@ -0,0 +1,81 @@
+"""
+Database round trips of a typical GET request (user lookup plus one list
+query) in a regular unit of work against a read-only one. Needs a reachable
+`DATABASE_URL` with at least one user.
+
+Round trips are counted on the driver: BEGIN / COMMIT / ROLLBACK, the
+pre-ping and every statement (prepared statements are warmed up first).
+
+    python -m benchmarks.read_only_uow --requests 500
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import asyncpg
+from sqlalchemy import event, select
+
+import domain.users  # noqa: F401, mappers of `domain.books` need it first
+from database.relational_db import Book, UoW, User
+from database.relational_db.session import async_session, engine, read_only_options
+
+trips: Counter[str] = Counter()
+
+
+def _count(name: str, method):
+    async def wrapper(*args, **kwargs):
+        trips[name] += 1
+        return await method(*args, **kwargs)
+    return wrapper
+
+
+def _instrument() -> None:
+    transaction = asyncpg.transaction.Transaction
+    transaction.start = _count("begin", transaction.start)
+    transaction.commit = _count("commit", transaction.commit)
+    transaction.rollback = _count("rollback", transaction.rollback)
+    asyncpg.Connection.fetchrow = _count("ping", asyncpg.Connection.fetchrow)
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *_: trips.update(["statement"]))
+
+
+async def _request(user_id, read_only: bool) -> None:
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            if read_only:
+                uow.set_read_only(**read_only_options())
+            user = await session.get(User, user_id)
+            await session.scalars(select(Book).where(Book.owner_id == user.id).limit(50))  # type: ignore[union-attr]
+
+
+async def main(requests: int) -> None:
+    async with async_session() as session:
+        user_id = await session.scalar(select(User.id).limit(1))
+    if user_id is None:
+        raise SystemExit("No users in the database, run the seeders first")
+
+    _instrument()
+    for read_only in (False, True):
+        for _ in range(3):
+            await _request(user_id, read_only)
+        trips.clear()
+        started = time.perf_counter()
+        for _ in range(requests):
+            await _request(user_id, read_only)
+        elapsed = time.perf_counter() - started
+
+        per_request = {name: count / requests for name, count in sorted(trips.items())}
+        total = sum(trips.values()) / requests
+        print(
+            f"{'read-only' if read_only else 'transaction':<12} {total:.1f} round trips "
+            f"({', '.join(f'{name} {count:g}' for name, count in per_request.items())}), "
+            f"{elapsed / requests * 1000:.2f} ms per request"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
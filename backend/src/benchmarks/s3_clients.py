@@ -0,0 +1,54 @@
+"""
+Upload throughput of the two S3 clients behind `get_s3_client()`: aiobotocore
+with its shared connection pool against boto3 run through the default thread
+pool, on the local S3 stand-in.
+
+    python -m benchmarks.s3_clients --objects 200 --size-kb 200 --concurrency 16 --latency-ms 20
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.s3_standin import BUCKET, s3_standin
+
+
+async def _throughput(client, objects: int, size_kb: int, concurrency: int) -> float:
+    data = os.urandom(size_kb * 1024)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _put(i: int) -> None:
+        async with sem:
+            await client.call("put_object", Bucket=BUCKET, Key=f"benchmark/{i}", Body=data)
+
+    await _put(-1)  # open the first connection outside of the timing
+    started = time.perf_counter()
+    await asyncio.gather(*(_put(i) for i in range(objects)))
+    return objects / (time.perf_counter() - started)
+
+
+async def main(objects: int, size_kb: int, concurrency: int, latency_ms: float) -> None:
+    from core.storage.s3 import AioS3Client, S3Client
+
+    print(f"{objects} x {size_kb} KB, concurrency {concurrency}, {latency_ms} ms per request")
+
+    boto = S3Client()
+    print(f"boto3 + threads: {await _throughput(boto, objects, size_kb, concurrency):.1f} obj/s")
+
+    aio = AioS3Client()
+    await aio.start()
+    try:
+        print(f"aiobotocore:     {await _throughput(aio, objects, size_kb, concurrency):.1f} obj/s")
+    finally:
+        await aio.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+    with s3_standin(args.latency_ms):
+        asyncio.run(main(args.objects, args.size_kb, args.concurrency, args.latency_ms))
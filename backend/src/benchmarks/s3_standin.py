@@ -0,0 +1,98 @@
+"""
+Local S3 for the storage benchmarks: a moto server in its own process,
+optionally answering every request after a fixed delay to imitate the round
+trip to a real bucket.
+
+`s3_standin()` starts it and points the `S3_*` settings at it, so core modules
+have to be imported inside the block. It can also be run on its own:
+
+    python -m benchmarks.s3_standin --port 5005 --latency-ms 20
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+BUCKET = "benchmark"
+
+
+class _Delayed:
+    def __init__(self, app, latency: float) -> None:
+        self.app = app
+        self.latency = latency
+
+    def __call__(self, environ, start_response):
+        time.sleep(self.latency)
+        return self.app(environ, start_response)
+
+
+def serve(port: int, latency_ms: float) -> None:
+    from moto.server import DomainDispatcherApplication, create_backend_app
+    from werkzeug.serving import make_server
+
+    app = DomainDispatcherApplication(create_backend_app)
+    make_server("127.0.0.1", port, _Delayed(app, latency_ms / 1000), threaded=True).serve_forever()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(port: int, timeout: float = 15) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@contextmanager
+def s3_standin(latency_ms: float = 0) -> Iterator[str]:
+    """Yields the endpoint url, `BUCKET` exists and the `S3_*` env vars point at it."""
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.s3_standin", "--port", str(port), "--latency-ms", str(latency_ms)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for(port)
+        endpoint = f"http://127.0.0.1:{port}"
+        os.environ.update(
+            S3_ENDPOINT_URL=endpoint,
+            S3_BUCKET=BUCKET,
+            S3_ACCESS_KEY_ID="benchmark",
+            S3_SECRET_ACCESS_KEY="benchmark",
+            S3_REGION="us-east-1",
+        )
+        import boto3
+
+        boto3.client(
+            "s3",
+            endpoint_url=endpoint,
+            aws_access_key_id="benchmark",
+            aws_secret_access_key="benchmark",
+            region_name="us-east-1",
+        ).create_bucket(Bucket=BUCKET)
+        yield endpoint
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+    serve(args.port, args.latency_ms)
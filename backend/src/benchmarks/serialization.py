@@ -0,0 +1,103 @@
+"""
+Response serialization of the large list endpoints: FastAPI's `response_model`
+path against `core.http.orm_json_response`, on ORM-like rows.
+
+    python -m benchmarks.serialization --rows 200 --repeat 50
+"""
+import argparse
+import asyncio
+import enum
+import time
+import types
+import typing
+from datetime import date, datetime, UTC
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from pydantic import BaseModel, EmailStr, HttpUrl
+
+from core.http import orm_json_response
+from domain.users import UserModel
+from domain.books import BookModel
+from domain.common import CursorPage
+from domain.exchanges import ExchangeModel
+
+
+def _fake(tp: typing.Any) -> typing.Any:
+    """Attribute object shaped like an ORM row for `tp`."""
+    origin = typing.get_origin(tp)
+    if origin is typing.Annotated:
+        return _fake(typing.get_args(tp)[0])
+    if origin in (typing.Union, types.UnionType):
+        return _fake(next(a for a in typing.get_args(tp) if a is not type(None)))
+    if origin is list:
+        return [_fake(typing.get_args(tp)[0]) for _ in range(2)]
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        row = types.SimpleNamespace()
+        for name, field in tp.model_fields.items():
+            setattr(row, field.alias or name, _fake(field.annotation))
+        return row
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return next(iter(tp))
+    if tp is HttpUrl:
+        return "https://cdn.example.com/media/0a1b/full.webp"
+    if tp is EmailStr:
+        return "reader@example.com"
+    return {
+        str: "en",
+        int: 1,
+        float: 55.75,
+        bool: True,
+        datetime: datetime.now(UTC),
+        date: date(1990, 1, 1),
+    }.get(tp, uuid4())
+
+
+ENDPOINTS = {
+    "/books, /for_you, admin books": (list[BookModel], lambda n: [_fake(BookModel) for _ in range(n)]),
+    "admin users": (CursorPage[UserModel], lambda n: {"items": [_fake(UserModel) for _ in range(n)], "next_cursor": "c"}),
+    "admin exchanges": (CursorPage[ExchangeModel], lambda n: {"items": [_fake(ExchangeModel) for _ in range(n)], "next_cursor": "c"}),
+}
+
+
+def _app(tp: typing.Any, rows: typing.Any) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=tp)
+    async def default():
+        return rows
+
+    @app.get("/fast", response_model=tp)
+    async def fast():
+        return orm_json_response(tp, rows)
+
+    return app
+
+
+async def _time(client: httpx.AsyncClient, path: str, repeat: int) -> tuple[float, bytes]:
+    body = (await client.get(path)).content  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await client.get(path)
+    return (time.perf_counter() - started) / repeat * 1000, body
+
+
+async def main(rows: int, repeat: int) -> None:
+    print(f"{rows} rows per response, {repeat} requests each")
+    print(f"{'endpoint':<32}{'default ms':>12}{'fast ms':>10}{'speedup':>9}")
+    for name, (tp, make_rows) in ENDPOINTS.items():
+        transport = httpx.ASGITransport(app=_app(tp, make_rows(rows)))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            default_ms, default_body = await _time(client, "/default", repeat)
+            fast_ms, fast_body = await _time(client, "/fast", repeat)
+        assert httpx.Response(200, content=default_body).json() == httpx.Response(200, content=fast_body).json()
+        print(f"{name:<32}{default_ms:>12.2f}{fast_ms:>10.2f}{default_ms / fast_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
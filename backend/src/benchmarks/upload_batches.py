@@ -0,0 +1,58 @@
+"""
+Latency of storing a batch of 1-10 photo variants: uploads one after another
+against `MediaStorage.upload_many`, on a local S3 stand-in that delays every
+request by `--latency-ms`.
+
+    python -m benchmarks.upload_batches --latency-ms 30 --size-kb 300 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.s3_standin import s3_standin
+
+
+async def _measure(storage, batch: int, data: bytes, repeat: int) -> tuple[float, float]:
+    sequential: list[float] = []
+    concurrent: list[float] = []
+    for run in range(repeat):
+        items = [(f"media/benchmark/{batch}-{run}-{i}.webp", data) for i in range(batch)]
+
+        started = time.perf_counter()
+        for key, blob in items:
+            await storage.upload_bytes(key, blob, "image/webp")
+        sequential.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await storage.upload_many(items)
+        concurrent.append(time.perf_counter() - started)
+    return statistics.median(sequential), statistics.median(concurrent)
+
+
+async def main(latency_ms: float, size_kb: int, repeat: int) -> None:
+    from core.storage import MediaStorage, close_s3_client, init_s3_client
+
+    storage = MediaStorage()
+    data = os.urandom(size_kb * 1024)
+    await init_s3_client()
+    try:
+        await storage.upload_many([("media/benchmark/warmup.webp", data)])
+        print(f"{size_kb} KB objects, {latency_ms} ms per request, median of {repeat}")
+        print(f"{'photos':>6} {'sequential, ms':>15} {'upload_many, ms':>16}")
+        for batch in range(1, 11):
+            sequential, concurrent = await _measure(storage, batch, data, repeat)
+            print(f"{batch:>6} {sequential * 1000:>15.1f} {concurrent * 1000:>16.1f}")
+    finally:
+        await close_s3_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--size-kb", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with s3_standin(args.latency_ms):
+        asyncio.run(main(args.latency_ms, args.size_kb, args.repeat))
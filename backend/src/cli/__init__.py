@@ -0,0 +1,5 @@
+"""
+Operational commands, run from `backend/src`:
+
+    python -m cli.<name> --help
+"""
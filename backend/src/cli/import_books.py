@@ -0,0 +1,67 @@
+"""
+Bulk import books for a user from a CSV (with header) or NDJSON file,
+same rules and report as `POST /v1/books/import`.
+
+    python -m cli.import_books books.csv --owner partner@example.com
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import AsyncIterator
+
+import domain.users  # noqa: F401, resolves the users <-> books schema import order
+from core.config import configure_logging
+from database.relational_db import UserInterface
+from database.relational_db.session import async_session, wait_for_db, UoW
+from domain.books import ImportFormat
+from service.books import get_books_service
+from service.media import get_media_service
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 1024 * 1024
+
+
+async def _read(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := await asyncio.to_thread(file.read, READ_SIZE):
+            yield chunk
+
+
+async def run(path: Path, owner: str, fmt: ImportFormat) -> int:
+    await wait_for_db()
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            user = await UserInterface(session).get_by_email(owner)
+            if user is None:
+                logger.error("No user with email %s", owner)
+                return 1
+            book_service = await get_books_service(uow, await get_media_service(uow))
+            report = await book_service.import_books(_read(path), fmt, user)
+
+    logger.info("Received %d rows, imported %d, failed %d", report.received, report.imported, report.failed)
+    for error in report.errors:
+        logger.warning("Row %d: %s", error.row, "; ".join(error.errors))
+    return 0 if not report.failed else 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--owner", required=True, help="E-mail of the user the books are listed for")
+    parser.add_argument(
+        "--format",
+        choices=[f.value for f in ImportFormat],
+        help="Defaults to the file extension: .csv or .ndjson/.jsonl",
+    )
+    args = parser.parse_args()
+
+    fmt = ImportFormat(args.format) if args.format else (ImportFormat.CSV if args.path.suffix.lower() == ".csv" else ImportFormat.NDJSON)
+    configure_logging()
+    sys.exit(asyncio.run(run(args.path, args.owner, fmt)))
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,31 @@ class Settings(BaseSettings):
     # Media settings
     MEDIA_DIR: str = 'media'
     MAX_PHOTO_SIZE: int = 5  # in MB
+    UPLOAD_CHUNK_SIZE: int = 256  # in KB
+    UPLOAD_SPOOL_DIR: str | None = None  # uploads being processed are copied here, system temp dir otherwise
+    MEDIA_KEEP_ORIGINALS: bool = False  # also store uploads as they came, EXIF and GPS tags included
+    UPLOAD_CONCURRENCY: int = 4  # parallel uploads per request
+    UPLOAD_GLOBAL_CONCURRENCY: int = 16  # parallel uploads per worker
+    MEDIA_SERVING: Literal["plain", "immutable"] = "immutable"  # plain is the stock StaticFiles
+    MEDIA_OFFLOAD: Literal["none", "x-accel", "x-sendfile"] = "none"  # let the proxy send file bodies
+    MEDIA_OFFLOAD_PREFIX: str = "/internal-media"  # nginx `internal` location for X-Accel-Redirect
+    PRESIGNED_UPLOAD_TTL: int = 15 * 60  # in seconds
+    MEDIA_GC_INTERVAL: int = 10  # in minutes
+    MEDIA_GC_GRACE: int = 60 * 60  # in seconds, unreferenced media is kept this long
+    MEDIA_GC_BATCH: int = 1000
+    MEDIA_ORPHAN_SWEEP_INTERVAL: int = 24  # in hours
+    MEDIA_ORPHAN_DELETE_RATE: int = 1000  # objects per second
+    MEDIA_ORPHAN_DELETE: bool = False  # scheduled sweep deletes orphans, it only reports them otherwise
+
+    # Delta sync settings
+    SYNC_OVERLAP: int = 5  # in seconds, re-sent window covering in-flight transactions
+    SYNC_TOMBSTONE_TTL: int = 30  # in days, older tokens get a full snapshot
+
+    # Image pipeline settings
+    IMAGE_FORMAT: Literal["webp", "avif"] = "webp"
+    IMAGE_QUALITY: int = 80
+    IMAGE_MAX_PIXELS: int = 40_000_000  # decompression bomb guard
+    IMAGE_WORKERS: int = 0  # process pool size, 0 means cpu count
 
     # S3/Tigris settings
     S3_ENDPOINT_URL: str | None = None
@@ -39,6 +64,25 @@ class Settings(BaseSettings):
     S3_SECRET_ACCESS_KEY: str | None = None
     S3_REGION: str = "auto"
     S3_ADDRESSING_STYLE: Literal["virtual", "path"] = "path"
+    S3_ASYNC_CLIENT: bool = True  # aiobotocore client, boto3 in a thread pool otherwise
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_KEEPALIVE_TIMEOUT: int = 30  # in seconds
+    S3_CONNECT_TIMEOUT: int = 5  # in seconds
+    S3_READ_TIMEOUT: int = 30  # in seconds
+    S3_MAX_ATTEMPTS: int = 3
+    S3_RETRY_MODE: Literal["legacy", "standard", "adaptive"] = "standard"
+
+    # Bulk import settings
+    BOOK_IMPORT_CHUNK: int = 5000  # rows validated and copied at a time
+    BOOK_IMPORT_MAX_ROWS: int = 200_000
+    BOOK_IMPORT_MAX_ERRORS: int = 1000  # rows listed in the report
+
+    # Analytics export settings
+    EXPORT_BATCH_SIZE: int = 5000  # rows fetched from the server-side cursor at a time
+    EXPORT_GZIP_LEVEL: int = 5
+
+    # Statistics settings
+    INTERACTION_TS_MAX_AGE: int = 24 * 60 * 60  # in seconds, older client timestamps are clamped
 
     # Seeder settings
     SEED_BOOK_PHOTOS_DIR: str | None = None
@@ -67,6 +111,46 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     REDIS_URL: str
 
+    # Database pool settings, per worker process
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load and closed when returned
+    DB_POOL_TIMEOUT: float = 10  # in seconds, waiting for a free connection
+    DB_POOL_RECYCLE: int = 30 * 60  # in seconds, older connections are reopened
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = True  # keep reusing hot connections, idle ones time out on the server
+    DB_POOL_SLOW_CHECKOUT: float = 0.1  # in seconds, counted in pool stats
+    DB_CONNECT_TIMEOUT: float = 5  # in seconds
+    DB_STATEMENT_CACHE_SIZE: int = 500  # prepared statements kept per connection
+    DB_STATEMENT_TIMEOUT: int = 15_000  # in ms, routes may override it, 0 disables it
+    DB_IDLE_IN_TRANSACTION_TIMEOUT: int = 60_000  # in ms
+    DB_PGBOUNCER: bool = False  # PgBouncer in transaction mode: no prepared statement cache or startup settings
+
+    # SQL instrumentation settings
+    SQL_SLOW_STATEMENT: int = 200  # in ms, slower statements are logged
+    SQL_SLOW_REQUEST: int = 500  # in ms of database time per request
+    SQL_N_PLUS_ONE: int = 10  # same statement this many times in a request is logged
+    SERVER_TIMING: bool | None = None  # Server-Timing response header, on in dev by default
+
+    # Read replica settings
+    DATABASE_REPLICA_URLS: str = ""  # comma separated, same credentials format as DATABASE_URL
+    DB_REPLICA_MAX_LAG: float = 2  # in seconds, replicas further behind are skipped
+    DB_REPLICA_LAG_CHECK: float = 1  # in seconds, how long a lag reading is trusted
+    DB_REPLICA_STICKY: int = 5  # in seconds, a user's reads go to the primary after their own write
+
+    # Profiler settings
+    PROFILER_INTERVAL: float = 0.005  # in seconds between stack samples
+    PROFILER_MAX_SECONDS: int = 60  # longest worker profile
+    PROFILER_TICKET_TTL: int = 5 * 60  # in seconds, to send the profiled request
+    PROFILER_RESULT_TTL: int = 60 * 60  # in seconds, request profiles are kept this long
+
+    # Event loop watchdog settings
+    LOOP_WATCHDOG: bool = True
+    LOOP_LAG_INTERVAL: float = 0.05  # in seconds between lag measurements
+    LOOP_BLOCK_THRESHOLD: float = 0.25  # in seconds, longer blocking callbacks are logged with a stack dump
+
+    # Metrics settings
+    METRICS_TOKEN: str | None = None  # Bearer token Prometheus scrapes /metrics with, without one /metrics answers 404
+
     @field_validator("COOKIE_SAMESITE", mode="before")
     @classmethod
     def _normalize_samesite(cls, value: str) -> str:
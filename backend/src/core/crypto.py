@@ -1,6 +1,10 @@
 import asyncio
+from typing import Any, Callable
+
 from passlib.context import CryptContext
 
+from core.metrics import PASSWORD_HASH_JOBS
+
 pwd_context = CryptContext(
     schemes=["argon2"],
     deprecated="auto",
@@ -10,11 +14,16 @@ pwd_context = CryptContext(
     argon2__parallelism=2,
 )
 
+async def _in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    # Argon2 is slow on purpose, jobs pile up in the default thread pool under login bursts
+    with PASSWORD_HASH_JOBS.track_inprogress():
+        return await asyncio.to_thread(func, *args)
+
 async def hash_password(password: str) -> str:
-    return await asyncio.to_thread(pwd_context.hash, password)
+    return await _in_thread(pwd_context.hash, password)
 
 async def verify_password(password: str, hashed_password: str) -> bool:
-    return await asyncio.to_thread(pwd_context.verify, password, hashed_password)
+    return await _in_thread(pwd_context.verify, password, hashed_password)
 
 async def needs_rehash(hashed_password: str) -> bool:
     return await asyncio.to_thread(pwd_context.needs_update, hashed_password)
@@ -1 +1,3 @@
 from .cookies import clear_auth_cookies, set_auth_cookies
+from .etags import etag_matches, make_etag, not_modified
+from .responses import json_bytes_response, orm_json_response
@@ -0,0 +1,117 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fastapi import HTTPException, status
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core.config import Settings
+
+
+settings = Settings()  # type: ignore
+
+# Longest side of every variant, in px
+IMAGE_VARIANTS: dict[str, int] = {
+    "full": 1600,
+    "medium": 800,
+    "thumb": 200,
+}
+
+ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp", "image/avif"}
+
+_pool: ProcessPoolExecutor | None = None
+
+
+class InvalidImage(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail='File is not a valid image or it is too large to process',
+        )
+
+
+def _render_variants(
+    source: bytes | Path,
+    variants: dict[str, int],
+    image_format: str,
+    quality: int,
+    max_pixels: int,
+) -> dict[str, bytes]:
+    """
+    Runs in a worker process: decode, auto-orient, drop metadata and
+    encode every variant. Pixel count is checked before decoding. A path is
+    read by the worker, so the image is not copied through the pool.
+    """
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(source if isinstance(source, Path) else io.BytesIO(source)) as img:
+        if img.width * img.height > max_pixels:
+            raise ValueError("Image has too many pixels")
+
+        # JPEG can be decoded at a reduced scale straight away
+        largest = max(variants.values())
+        img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+        rendered: dict[str, bytes] = {}
+        for name, size in variants.items():
+            variant = img.copy()
+            variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            # Image.info is not passed on, so EXIF / ICC / XMP are dropped
+            variant.save(out, format=image_format.upper(), quality=quality)
+            rendered[name] = out.getvalue()
+        return rendered
+
+
+def sniff_content_type(head: bytes) -> str | None:
+    """Detect an allowed image type from its leading magic bytes."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    return None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS or None,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def variant_key(prefix: str, variant: str) -> str:
+    return f"{prefix}/{variant}.{settings.IMAGE_FORMAT}"
+
+
+async def render_variants(source: bytes | Path) -> dict[str, bytes]:
+    """Produce every `IMAGE_VARIANTS` entry for an uploaded image (content or local file) in the process pool."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_pool(),
+            _render_variants,
+            source,
+            IMAGE_VARIANTS,
+            settings.IMAGE_FORMAT,
+            settings.IMAGE_QUALITY,
+            settings.IMAGE_MAX_PIXELS,
+        )
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError) as exc:
+        raise InvalidImage() from exc
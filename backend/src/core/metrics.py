@@ -0,0 +1,135 @@
+import os
+import time
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# With several workers every process writes its samples to this directory and
+# the scraped worker merges them. It must be emptied before the server starts.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to the end of the response body, by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being served", multiprocess_mode="livesum"
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool, opening new ones included",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Checked out connections", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Counter(
+    "db_pool_overflow_connections", "Connections opened beyond pool_size", ["pool"]
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts", "Checkouts that gave up after DB_POOL_TIMEOUT", ["pool"]
+)
+
+REDIS_COMMAND_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis round trip by command",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop runs a timer, time other callbacks held it",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks", "Callbacks that held the event loop over LOOP_BLOCK_THRESHOLD"
+)
+
+PASSWORD_HASH_JOBS = Gauge(
+    "password_hash_jobs",
+    "Argon2 hash / verify jobs queued or running in the thread pool",
+    multiprocess_mode="livesum",
+)
+
+UPLOAD_BYTES = Counter("media_upload_bytes", "Bytes written to media storage", ["storage"])
+
+INTERACTION_LAG = Histogram(
+    "interaction_ingestion_lag_seconds",
+    "Delay between a batched interaction on the client and its ingestion",
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600, 6 * 3600, 24 * 3600),
+)
+
+
+def metrics_response() -> Response:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead() -> None:
+    """
+    Drop the `livesum` gauges of this worker from the merged samples, call on
+    shutdown. A worker killed without shutdown keeps its last values until restart.
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """
+    Request latency by method, route template and status code, plus requests
+    in flight. Unknown paths share one `unmatched` label to keep cardinality bounded.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        root_path = scope.get("root_path", "")
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            REQUEST_LATENCY.labels(scope["method"], _route(scope, root_path), status).observe(
+                time.perf_counter() - started
+            )
+
+
+def _route(scope: Scope, root_path: str) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounted apps (static media) move their prefix into `root_path`
+    mount = scope.get("root_path", "")[len(root_path):]
+    return f"{mount}/*" if mount else "unmatched"
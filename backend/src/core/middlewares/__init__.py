@@ -0,0 +1,2 @@
+from .query_stats import QueryStatsMiddleware, QueryStats, count_queries
+from .profiler import RequestProfilerMiddleware, PROFILE_HEADER
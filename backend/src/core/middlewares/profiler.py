@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import sys
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.config import Settings
+from core.profiler import TaskSampler
+from database.redis import get_redis
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+_HEADER = PROFILE_HEADER.lower().encode()
+
+
+def ticket_key(token: str) -> str:
+    return f"profile:ticket:{token}"
+
+
+def result_key(token: str) -> str:
+    return f"profile:result:{token}"
+
+
+class RequestProfilerMiddleware:
+    """
+    Profiles a single request that carries an `X-Profile` ticket issued by
+    `POST /admins/profiler/requests`. A ticket is good for one request, the
+    collapsed stacks are stored in Redis for the admin to fetch. Requests
+    without the header only pay for the header lookup.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        token = None
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == _HEADER:
+                    token = value.decode("latin-1")
+                    break
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            mode = await get_redis().getdel(ticket_key(token))
+        except Exception:
+            logger.warning("Could not redeem a profiling ticket", exc_info=True)
+            mode = None
+        if mode is None:  # unknown, expired or used already
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        assert task is not None
+        sampler = TaskSampler(task, sys._getframe(), settings.PROFILER_INTERVAL, cpu=mode == b"cpu").start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await sampler.stop()
+            try:
+                await get_redis().set(result_key(token), sampler.collapsed(), ex=settings.PROFILER_RESULT_TTL)
+            except Exception:
+                logger.warning("Could not store the profile of %s %s", scope["method"], scope["path"], exc_info=True)
@@ -0,0 +1,142 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import Settings, is_debug_mode
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDERS = re.compile(r"\$\d+(?:::[\w ]+(?:\[\])?)?(?:\s*,\s*\$\d+(?:::[\w ]+(?:\[\])?)?)*")
+_START_KEY = "query_stats_start"
+
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """Statement with every parameter list collapsed, `IN ($1, $2)` and `IN ($1)` look the same"""
+    return _PLACEHOLDERS.sub("?", " ".join(statement.split()))
+
+
+@dataclass
+class QueryStats:
+    """Statements one request (or `count_queries` block) ran"""
+    count: int = 0
+    total: float = 0.0  # in seconds
+    slowest: float = 0.0
+    slowest_statement: str | None = None
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def observe(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.shapes[statement_shape(statement)] += 1
+        if duration > self.slowest:
+            self.slowest = duration
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run at least `threshold` times, likely an N+1 pattern"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+# Every collector active in this context: the request's and any `count_queries` blocks
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - conn.info[_START_KEY].pop()
+    for stats in _active.get():
+        stats.observe(statement, duration)
+    if duration * 1000 >= settings.SQL_SLOW_STATEMENT:
+        logger.warning("Slow statement (%.0f ms): %s", duration * 1000, " ".join(statement.split())[:1000])
+
+
+@event.listens_for(Engine, "handle_error")
+def _failed_execute(context) -> None:
+    starts = context.connection.info.get(_START_KEY) if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+@contextmanager
+def count_queries(budget: int | None = None) -> Iterator[QueryStats]:
+    """
+    Collect the statements run inside the block; with `budget` more of them
+    fail an assertion. Meant for query budgets in tests:
+
+        with count_queries(budget=4):
+            await client.get("/api/v1/books/my", headers=auth)
+    """
+    stats = QueryStats()
+    token = _active.set((*_active.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+    if budget is not None:
+        assert stats.count <= budget, (
+            f"{stats.count} statements over a budget of {budget}, most repeated: {stats.shapes.most_common(3)}"
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    Counts statements and database time of every request. Adds a `Server-Timing`
+    header (dev by default), logs requests over `SQL_SLOW_REQUEST` ms of database
+    time and statement shapes repeated `SQL_N_PLUS_ONE` times or more.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.server_timing = settings.SERVER_TIMING if settings.SERVER_TIMING is not None else is_debug_mode(settings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _active.set((*_active.get(), stats))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing and stats.count:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", f'db;dur={stats.total * 1000:.1f};desc="{stats.count} queries"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        if not stats.count:
+            return
+        route = getattr(scope.get("route"), "path", scope["path"])
+        if stats.total * 1000 >= settings.SQL_SLOW_REQUEST:
+            logger.warning(
+                "%s %s spent %.0f ms in %d statements, slowest %.0f ms: %s",
+                scope["method"], route, stats.total * 1000, stats.count, stats.slowest * 1000,
+                " ".join((stats.slowest_statement or "").split())[:500],
+            )
+        for shape, n in stats.repeated(settings.SQL_N_PLUS_ONE):
+            logger.warning("Possible N+1 in %s %s: %d x %s", scope["method"], route, n, shape[:500])
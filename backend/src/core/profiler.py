@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from types import CodeType, CoroutineType, FrameType
+
+logger = logging.getLogger(__name__)
+
+_ROOTS = sorted(
+    {os.path.dirname(os.path.dirname(os.path.abspath(__file__))), *(p for p in sys.path if p)},
+    key=len,
+    reverse=True,
+)
+_labels: dict[CodeType, str] = {}
+
+
+def _label(code: CodeType) -> str:
+    """`module/path.py:Class.method` without the separators collapsed stacks use"""
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for root in _ROOTS:
+            if filename.startswith(root + os.sep):
+                filename = filename[len(root) + 1:]
+                break
+        label = _labels[code] = f"{filename}:{code.co_qualname}".replace(";", ":").replace(" ", "_")
+    return label
+
+
+def _thread_stack(frame: FrameType | None) -> list[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_label(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _await_chain(coro) -> list[str]:
+    """Frames of a suspended coroutine, outermost first, ending at what it awaits"""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        stack.append(_label(frame.f_code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None)
+    if coro is not None:
+        stack.append("[awaiting]")  # a future, I/O or a timer
+    return stack
+
+
+class Sampler:
+    """
+    Samples the stack of one thread every `interval` seconds from a background
+    thread. Every sample is weighted by the microseconds since the previous one,
+    wall clock time or, with `cpu`, the thread's CPU time (idle samples drop out).
+    Nothing runs while it is stopped.
+    """
+    def __init__(self, thread_id: int, interval: float, cpu: bool = False):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.cpu = cpu
+        self.samples: Counter[str] = Counter()
+        self.started = self.finished = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def _stack(self, frame: FrameType) -> list[str] | None:
+        return _thread_stack(frame)
+
+    def _run(self) -> None:
+        clock = time.pthread_getcpuclockid(self.thread_id) if self.cpu else time.CLOCK_MONOTONIC
+        last = time.clock_gettime(clock)
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:  # the thread is gone
+                return
+            now = time.clock_gettime(clock)
+            weight, last = round((now - last) * 1_000_000), now
+            if weight <= 0:
+                continue
+            stack = self._stack(frame)
+            del frame
+            if stack:
+                self.samples[";".join(stack)] += weight
+
+    def start(self) -> "Sampler":
+        self.started = time.time()
+        self._thread.start()
+        return self
+
+    async def stop(self) -> "Sampler":
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join)
+        self.finished = time.time()
+        return self
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format, for flamegraph.pl, speedscope or inferno"""
+        return "".join(f"{stack} {weight}\n" for stack, weight in self.samples.most_common())
+
+
+class TaskSampler(Sampler):
+    """
+    Samples one asyncio task on the event loop thread. While the task runs its
+    live stack is recorded; in wall mode the time it spends suspended is added
+    under the coroutine it awaits in, so I/O waits show up too.
+    """
+    def __init__(self, task: asyncio.Task, marker: FrameType, interval: float, cpu: bool = False):
+        super().__init__(threading.get_ident(), interval, cpu)
+        self.task = task
+        self.marker = marker  # a frame of the task, found in its stack when it runs
+
+    def _stack(self, frame: FrameType) -> list[str] | None:
+        if self.task.done():
+            return None
+        node: FrameType | None = frame
+        while node is not None and node is not self.marker:
+            node = node.f_back
+        if node is not None:
+            return _thread_stack(frame)
+        if self.cpu:
+            return None
+        return _await_chain(self.task.get_coro())
+
+
+_worker_lock = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+async def profile_worker(seconds: float, interval: float, cpu: bool = False) -> Sampler:
+    """
+    Profile the event loop thread of this process for `seconds`. One worker
+    profile runs at a time, `ProfilerBusy` is raised for a second one.
+    """
+    if not _worker_lock.acquire(blocking=False):
+        raise ProfilerBusy
+    try:
+        sampler = Sampler(threading.get_ident(), interval, cpu).start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await sampler.stop()
+        return sampler
+    finally:
+        _worker_lock.release()
+
+
+def dump_tasks(loop: asyncio.AbstractEventLoop, thread_id: int) -> str:
+    """
+    What the loop thread runs right now and where every pending task is
+    suspended. Safe to call from another thread while the loop is stuck.
+    """
+    lines = [f"Event loop thread {thread_id}, pid {os.getpid()}:\n"]
+    frame = sys._current_frames().get(thread_id)
+    lines.extend(traceback.format_stack(frame) if frame is not None else ["  (thread is gone)\n"])
+    del frame
+
+    tasks = sorted(asyncio.all_tasks(loop), key=lambda task: task.get_name())
+    lines.append(f"\n{len(tasks)} pending tasks:\n")
+    for task in tasks:
+        coro = task.get_coro()
+        lines.append(f"{task.get_name()} {getattr(coro, '__qualname__', coro)!s}\n")
+        while isinstance(coro, CoroutineType) and coro.cr_frame is not None:
+            code = coro.cr_frame.f_code
+            lines.append(f'  File "{code.co_filename}", line {coro.cr_frame.f_lineno}, in {code.co_qualname}\n')
+            coro = coro.cr_await
+        if coro is not None and not isinstance(coro, CoroutineType):
+            lines.append(f"  awaiting {coro!r:.300}\n")
+    return "".join(lines)
+
+
+# Dumps taken when the loop stalled, newest last
+stalls: deque[tuple[float, str]] = deque(maxlen=20)
+
+
+def capture_stall(loop: asyncio.AbstractEventLoop, thread_id: int, blocked_for: float) -> str:
+    """
+    Stall hook: records (and logs) a task dump of a loop that has not run a
+    callback for `blocked_for` seconds. Called from outside the loop thread.
+    """
+    dump = dump_tasks(loop, thread_id)
+    stalls.append((time.time(), dump))
+    logger.warning("Event loop blocked for %.2f s\n%s", blocked_for, dump)
+    return dump
@@ -0,0 +1,90 @@
+import logging
+from typing import Annotated
+
+import jwt
+from fastapi import Depends
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import Settings
+from core.security import parse_token
+from database.redis import get_redis
+from database.relational_db import UoW, get_uow
+from database.relational_db.session import read_only_options, replicas
+from service.auth.tokens.token_service import PUBLIC_KEY
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _primary_key(user_id: str) -> str:
+    return f"db:primary:{user_id}"
+
+
+def _bearer_subject(headers: Headers) -> str | None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, PUBLIC_KEY, algorithms=[settings.JWT_ALGO])
+    except jwt.PyJWTError:
+        return None
+    return str(payload["sub"]) if payload.get("typ") == "access" else None
+
+
+class ReadYourWritesMiddleware:
+    """
+    After a user's successful write their reads stay on the primary for
+    `DB_REPLICA_STICKY` seconds, so they never see a replica without it.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not replicas or scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        user_id = _bearer_subject(Headers(scope=scope))
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                try:
+                    await get_redis().set(_primary_key(user_id), 1, ex=settings.DB_REPLICA_STICKY)
+                except Exception:
+                    logger.warning("Could not pin reads of %s to the primary", user_id, exc_info=True)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+async def read_replica(
+    payload: Annotated[dict[str, int | str], Depends(parse_token)],
+    uow: Annotated[UoW, Depends(get_uow)],
+) -> None:
+    """
+    Route dependency sending the request's reads to a replica, unless the user
+    wrote recently or every replica lags. Implies `read_only`, so only for
+    endpoints that never write:
+
+        @router.get(..., dependencies=[Depends(read_replica)])
+    """
+    if uow.session.in_transaction():
+        return
+    if replicas and not await _wrote_recently(str(payload["sub"])):
+        engine = await replicas.pick()
+        if engine is not None:
+            uow.session.sync_session.bind = engine.sync_engine
+    uow.set_read_only(**read_only_options())
+
+
+async def _wrote_recently(user_id: str) -> bool:
+    try:
+        return bool(await get_redis().exists(_primary_key(user_id)))
+    except Exception:
+        logger.warning("Could not check recent writes, reading from the primary", exc_info=True)
+        return True
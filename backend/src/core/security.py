@@ -1,3 +1,4 @@
+import hmac
 import jwt
 import json
 from typing import Annotated, Literal
@@ -19,6 +20,7 @@ from service.users import UserService, get_user_service
 security = HTTPBearer(
     description="Access token must be passed as Bearer to authorize request"
 )
+metrics_security = HTTPBearer(auto_error=False)
 settings = Settings()  # type: ignore
 
 
@@ -43,6 +45,21 @@ async def extract_jti(request: Request) -> str:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Bad refresh token passed")
     return jti
 
+async def metrics_scraper(
+    creds: Annotated[HTTPAuthorizationCredentials | None, Depends(metrics_security)],
+) -> None:
+    # Closed until METRICS_TOKEN is set, the endpoint is not even acknowledged
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Not Found")
+    if creds is None or not hmac.compare_digest(
+        creds.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            "Bad metrics token passed",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 async def parse_token(
     creds: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     token_svc: Annotated[TokenService, Depends(get_token_service)],
@@ -0,0 +1,3 @@
+from .media import MediaStorage, MediaTooLarge, SpooledUpload
+from .s3 import init_s3_client, close_s3_client
+from .static import MediaFiles, get_media_files
@@ -0,0 +1,428 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import tempfile
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from pathlib import Path
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional, Sequence
+
+import aiofiles
+from fastapi import HTTPException, status
+
+from botocore.exceptions import ClientError
+
+from core.config import Settings
+from core.metrics import UPLOAD_BYTES
+from .s3 import get_s3_client, s3_configured
+
+
+settings = Settings()  # type: ignore
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one),
+# so this is the smallest buffer the S3 streaming path can work with.
+S3_PART_SIZE = 5 * 1024 * 1024
+S3_DELETE_BATCH = 1000  # DeleteObjects limit
+# Local files being streamed are written under this suffix, then renamed into place
+PARTIAL_SUFFIX = ".part"
+
+# Shared by all requests of the worker, caps uploads in flight to storage
+_upload_slots = asyncio.Semaphore(settings.UPLOAD_GLOBAL_CONCURRENCY)
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    """An upload copied to a local temporary file, the caller removes it."""
+    path: Path
+    digest: str  # sha256 of the content
+    size: int
+
+
+class MediaTooLarge(HTTPException):
+    def __init__(self, limit_mb: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File is too large, max size is {limit_mb} MB",
+        )
+
+
+class MediaStorage:
+    def __init__(self) -> None:
+        self._s3_enabled = s3_configured()
+        self._uploaded = UPLOAD_BYTES.labels("s3" if self._s3_enabled else "local")
+
+    @property
+    def s3_enabled(self) -> bool:
+        return self._s3_enabled
+
+    def _public_base_url(self) -> str:
+        if self._s3_enabled:
+            if settings.S3_PUBLIC_URL:
+                return settings.S3_PUBLIC_URL.rstrip("/")
+            endpoint = (settings.S3_ENDPOINT_URL or "").rstrip("/")
+            bucket = settings.S3_BUCKET or ""
+            addressing = (settings.S3_ADDRESSING_STYLE or "path").strip().lower()
+            if addressing == "virtual" and endpoint and bucket:
+                parts = urlsplit(endpoint if "://" in endpoint else f"https://{endpoint}")
+                host = parts.netloc or parts.path
+                scheme = parts.scheme or "https"
+                return f"{scheme}://{bucket}.{host}"
+            return f"{endpoint}/{bucket}"
+        site = settings.SITE_URL.rstrip("/")
+        media = settings.MEDIA_DIR.strip("/")
+        if site:
+            return f"{site}/{media}"
+        return f"/{media}"
+
+    def url_for(self, key: str) -> str:
+        return f"{self._public_base_url()}/{key}"
+
+    def key_for(self, url: str) -> str | None:
+        """Reverse of `url_for`, None for urls outside of this storage."""
+        base = f"{self._public_base_url()}/"
+        if not url.startswith(base):
+            return None
+        return url[len(base):]
+
+    async def presign_put(self, key: str, content_type: str, size: int, expires_in: int) -> str:
+        """
+        URL a client can PUT exactly `size` bytes of `content_type` to, both headers
+        are part of the signature. S3 mode only.
+        """
+        return await get_s3_client().call(
+            "generate_presigned_url",
+            ClientMethod="put_object",
+            Params={
+                "Bucket": settings.S3_BUCKET,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+            },
+            ExpiresIn=expires_in,
+        )
+
+    async def fetch(self, key: str, max_size_mb: int | None = None) -> bytes | None:
+        """Read a whole stored object, None if it's missing. Size is checked before download."""
+        limit_mb = max_size_mb or settings.MAX_PHOTO_SIZE
+        if self._s3_enabled:
+            client = get_s3_client()
+            try:
+                head = await client.call("head_object", Bucket=settings.S3_BUCKET, Key=key)
+            except ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                    return None
+                raise
+            if head["ContentLength"] > limit_mb * 1024 * 1024:
+                raise MediaTooLarge(limit_mb)
+            return await client.read_object(Bucket=settings.S3_BUCKET, Key=key)
+
+        path = Path(settings.MEDIA_DIR) / key
+        if not path.is_file():
+            return None
+        if path.stat().st_size > limit_mb * 1024 * 1024:
+            raise MediaTooLarge(limit_mb)
+        async with aiofiles.open(path, "rb") as f:
+            return await f.read()
+
+    async def list_objects(self, older_than: datetime) -> AsyncIterator[list[tuple[str, int]]]:
+        """
+        Pages of `(key, size)` for objects last modified before `older_than`,
+        at most `S3_DELETE_BATCH` per page so every page fits one delete call.
+        """
+        if self._s3_enabled:
+            client = get_s3_client()
+            kwargs = dict(Bucket=settings.S3_BUCKET, MaxKeys=S3_DELETE_BATCH)
+            while True:
+                resp = await client.call("list_objects_v2", **kwargs)
+                page = [
+                    (obj["Key"], obj["Size"])
+                    for obj in resp.get("Contents", [])
+                    if obj["LastModified"] < older_than
+                ]
+                if page:
+                    yield page
+                if not resp.get("IsTruncated"):
+                    return
+                kwargs["ContinuationToken"] = resp["NextContinuationToken"]
+
+        root = Path(settings.MEDIA_DIR)
+        threshold = older_than.timestamp()
+
+        def _walk() -> Iterator[list[tuple[str, int]]]:
+            page: list[tuple[str, int]] = []
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    path = Path(dirpath) / name
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    if stat.st_mtime >= threshold:
+                        continue
+                    page.append((path.relative_to(root).as_posix(), stat.st_size))
+                    if len(page) == S3_DELETE_BATCH:
+                        yield page
+                        page = []
+            if page:
+                yield page
+
+        pages = _walk()
+        while (page := await asyncio.to_thread(next, pages, None)) is not None:
+            yield page
+
+    async def delete_keys(self, keys: Sequence[str]) -> None:
+        if not keys:
+            return
+        if self._s3_enabled:
+            client = get_s3_client()
+            for start in range(0, len(keys), S3_DELETE_BATCH):
+                await client.call(
+                    "delete_objects",
+                    Bucket=settings.S3_BUCKET,
+                    Delete={
+                        "Objects": [{"Key": key} for key in keys[start:start + S3_DELETE_BATCH]],
+                        "Quiet": True,
+                    },
+                )
+            return
+
+        def _unlink() -> None:
+            for key in keys:
+                path = Path(settings.MEDIA_DIR) / key
+                path.unlink(missing_ok=True)
+                try:
+                    path.parent.rmdir()
+                except OSError:  # not empty yet
+                    pass
+
+        await asyncio.to_thread(_unlink)
+
+    async def upload_bytes(
+        self,
+        key: str,
+        data: bytes,
+        content_type: Optional[str] = None,
+    ) -> str:
+        self._uploaded.inc(len(data))
+        if self._s3_enabled:
+            extra = {}
+            if content_type:
+                extra["ContentType"] = content_type
+            await get_s3_client().call(
+                "put_object",
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                Body=data,
+                **extra,
+            )
+        else:
+            path = Path(settings.MEDIA_DIR) / key
+            await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+            async with aiofiles.open(path, "wb") as out:
+                await out.write(data)
+
+        return self.url_for(key)
+
+    async def upload_stream(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Upload data coming in chunks without holding the whole object in memory.
+        Local mode appends chunks to a temporary file, S3 mode switches
+        to multipart upload once the data outgrows a single part.
+        """
+        chunks = self._counted(chunks)
+        if self._s3_enabled:
+            await self._stream_to_s3(key, chunks, content_type)
+        else:
+            await self._stream_to_disk(key, chunks)
+
+        return self.url_for(key)
+
+    async def _counted(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            self._uploaded.inc(len(chunk))
+            yield chunk
+
+    async def _stream_to_disk(self, key: str, chunks: AsyncIterator[bytes]) -> None:
+        path = Path(settings.MEDIA_DIR) / key
+        tmp_path = path.with_name(f"{path.name}{PARTIAL_SUFFIX}")
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        try:
+            async with aiofiles.open(tmp_path, "wb") as out:
+                async for chunk in chunks:
+                    await out.write(chunk)
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+
+    async def _stream_to_s3(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        content_type: Optional[str],
+    ) -> None:
+        client = get_s3_client()
+        extra = {"ContentType": content_type} if content_type else {}
+        buffer = bytearray()
+        upload_id: str | None = None
+        parts: list[dict] = []
+
+        async def _flush_part() -> None:
+            nonlocal buffer, upload_id
+            if upload_id is None:
+                created = await client.call(
+                    "create_multipart_upload",
+                    Bucket=settings.S3_BUCKET,
+                    Key=key,
+                    **extra,
+                )
+                upload_id = created["UploadId"]
+            part, buffer = buffer, bytearray()
+            number = len(parts) + 1
+            uploaded = await client.call(
+                "upload_part",
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=part,
+            )
+            parts.append({"ETag": uploaded["ETag"], "PartNumber": number})
+
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= S3_PART_SIZE:
+                    await _flush_part()
+
+            if upload_id is None:
+                # Small object: a single request is cheaper than multipart
+                await client.call(
+                    "put_object",
+                    Bucket=settings.S3_BUCKET,
+                    Key=key,
+                    Body=buffer,
+                    **extra,
+                )
+                return
+
+            if buffer:
+                await _flush_part()
+            await client.call(
+                "complete_multipart_upload",
+                Bucket=settings.S3_BUCKET,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            if upload_id is not None:
+                await asyncio.shield(client.call(
+                    "abort_multipart_upload",
+                    Bucket=settings.S3_BUCKET,
+                    Key=key,
+                    UploadId=upload_id,
+                ))
+            raise
+
+    async def _read_uploadfile(
+        self,
+        file,
+        max_size_mb: int,
+    ) -> AsyncIterator[bytes]:
+        chunk_size = settings.UPLOAD_CHUNK_SIZE * 1024
+        limit = max_size_mb * 1024 * 1024
+        total = 0
+        await file.seek(0)
+        while chunk := await file.read(chunk_size):
+            total += len(chunk)
+            if total > limit:
+                raise MediaTooLarge(max_size_mb)
+            yield chunk
+
+    async def spool_uploadfile(self, file, max_size_mb: int | None = None) -> SpooledUpload:
+        """
+        Copy `UploadFile` to a temporary file in `UPLOAD_SPOOL_DIR` chunk by chunk,
+        hashing it on the way and failing as soon as the size limit is exceeded.
+        """
+        if max_size_mb is None:
+            max_size_mb = settings.MAX_PHOTO_SIZE
+        fd, name = await asyncio.to_thread(tempfile.mkstemp, prefix="upload-", dir=settings.UPLOAD_SPOOL_DIR)
+        path = Path(name)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(fd, "wb") as out:
+                async for chunk in self._read_uploadfile(file, max_size_mb):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await out.write(chunk)
+        except BaseException:
+            await asyncio.to_thread(path.unlink, missing_ok=True)
+            raise
+        await file.seek(0)
+        return SpooledUpload(path, digest.hexdigest(), size)
+
+    async def upload_file_path(self, key: str, path: Path, content_type: Optional[str] = None) -> str:
+        if content_type is None:
+            content_type, _ = mimetypes.guess_type(path.name)
+        if content_type is None:
+            content_type = "application/octet-stream"
+
+        async def _read() -> AsyncIterator[bytes]:
+            chunk_size = settings.UPLOAD_CHUNK_SIZE * 1024
+            async with aiofiles.open(path, "rb") as src:
+                while chunk := await src.read(chunk_size):
+                    yield chunk
+
+        return await self.upload_stream(key, _read(), content_type)
+
+    async def upload_many(
+        self,
+        items: Sequence[tuple[str, bytes | Path]],
+        *,
+        concurrency: int | None = None,
+        return_exceptions: bool = False,
+    ) -> list:
+        """
+        Upload a batch of `(key, data)` pairs concurrently, returning urls in order.
+        Local paths are streamed, the content type of either follows the key's extension.
+        Fan-out is limited per call by `concurrency` and per worker by `UPLOAD_GLOBAL_CONCURRENCY`.
+
+        If any upload fails, the rest are cancelled, already stored objects are
+        deleted and the error is re-raised. With `return_exceptions=True` every
+        item is attempted and failures are returned in place of their urls.
+        """
+        slots = asyncio.Semaphore(concurrency or settings.UPLOAD_CONCURRENCY)
+
+        async def _upload(key: str, data: bytes | Path) -> str:
+            async with slots, _upload_slots:
+                content_type, _ = mimetypes.guess_type(key)
+                if isinstance(data, Path):
+                    return await self.upload_file_path(key, data, content_type)
+                return await self.upload_bytes(key, data, content_type)
+
+        tasks = [asyncio.create_task(_upload(key, data)) for key, data in items]
+        if return_exceptions:
+            return list(await asyncio.gather(*tasks, return_exceptions=True))
+
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            uploaded = [
+                key
+                for (key, _), task in zip(items, tasks)
+                if not task.cancelled() and task.exception() is None
+            ]
+            await asyncio.shield(self.delete_keys(uploaded))
+            raise
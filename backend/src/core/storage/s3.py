@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+from core.config import Settings
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+except ImportError:  # boto3 in a thread pool is used instead
+    AioConfig = None
+    get_session = None
+
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+def s3_configured() -> bool:
+    return all(
+        [
+        settings.S3_ENDPOINT_URL,
+        settings.S3_ACCESS_KEY_ID,
+        settings.S3_SECRET_ACCESS_KEY,
+        settings.S3_BUCKET,
+        ]
+    )
+
+
+def _client_kwargs() -> dict[str, Any]:
+    return dict(
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        region_name=settings.S3_REGION,
+    )
+
+
+def _config_kwargs() -> dict[str, Any]:
+    return dict(
+        s3={"addressing_style": settings.S3_ADDRESSING_STYLE},
+        signature_version="s3v4",
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        connect_timeout=settings.S3_CONNECT_TIMEOUT,
+        read_timeout=settings.S3_READ_TIMEOUT,
+        retries={
+            "max_attempts": settings.S3_MAX_ATTEMPTS,
+            "mode": settings.S3_RETRY_MODE,
+        },
+    )
+
+
+class S3Client:
+    """Fallback client: synchronous boto3, every call runs in the default thread pool."""
+    def __init__(self) -> None:
+        self._client = boto3.client(
+            "s3",
+            config=Config(tcp_keepalive=True, **_config_kwargs()),
+            **_client_kwargs(),
+        )
+
+    async def call(self, operation: str, **kwargs) -> dict:
+        return await asyncio.to_thread(getattr(self._client, operation), **kwargs)
+
+    async def read_object(self, **kwargs) -> bytes:
+        def _read() -> bytes:
+            return self._client.get_object(**kwargs)["Body"].read()
+        return await asyncio.to_thread(_read)
+
+
+class AioS3Client:
+    """Native asyncio client with its own keep-alive connection pool."""
+    def __init__(self) -> None:
+        self._stack = AsyncExitStack()
+        self._client = None
+
+    async def start(self) -> None:
+        config = AioConfig(
+            connector_args={"keepalive_timeout": settings.S3_KEEPALIVE_TIMEOUT},
+            **_config_kwargs(),
+        )
+        self._client = await self._stack.enter_async_context(
+            get_session().create_client("s3", config=config, **_client_kwargs())
+        )
+
+    async def close(self) -> None:
+        await self._stack.aclose()
+        self._client = None
+
+    async def call(self, operation: str, **kwargs) -> dict:
+        return await getattr(self._client, operation)(**kwargs)
+
+    async def read_object(self, **kwargs) -> bytes:
+        resp = await self._client.get_object(**kwargs)
+        async with resp["Body"] as body:
+            return await body.read()
+
+
+_aio_client: AioS3Client | None = None
+_fallback_client: S3Client | None = None
+
+
+def get_s3_client() -> AioS3Client | S3Client:
+    """
+    Returns the shared asyncio client when it was started in the app lifespan,
+    boto3 fallback otherwise (scripts, disabled `S3_ASYNC_CLIENT`, missing aiobotocore).
+    """
+    global _fallback_client
+    if _aio_client is not None:
+        return _aio_client
+    if _fallback_client is None:
+        _fallback_client = S3Client()
+    return _fallback_client
+
+
+async def init_s3_client() -> None:
+    global _aio_client
+    if not s3_configured() or not settings.S3_ASYNC_CLIENT or _aio_client is not None:
+        return
+    if get_session is None:
+        logger.warning("aiobotocore is not installed, falling back to boto3 for S3")
+        return
+
+    client = AioS3Client()
+    await client.start()
+    _aio_client = client
+
+
+async def close_s3_client() -> None:
+    global _aio_client
+    if _aio_client is None:
+        return
+    client, _aio_client = _aio_client, None
+    await client.close()
@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+from core.config import Settings
+from .media import PARTIAL_SUFFIX
+
+
+settings = Settings()  # type: ignore
+
+# Every key is written once (content hash or uuid4 names), so clients never need to revalidate
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class MediaFiles(StaticFiles):
+    """
+    `StaticFiles` for uploaded media: far-future caching, strong ETags from
+    file metadata and, behind nginx / Apache, handing the body off to the proxy.
+    Range requests are served by `FileResponse`.
+    """
+    def __init__(self, directory: str, offload: str = "none", offload_prefix: str = "/") -> None:
+        super().__init__(directory=directory, check_dir=False)
+        self.offload = offload
+        self.offload_prefix = offload_prefix.rstrip("/")
+
+    @staticmethod
+    def etag_for(stat_result: os.stat_result) -> str:
+        return f'"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if str(full_path).endswith(PARTIAL_SUFFIX):
+            # Upload still being written by `MediaStorage.upload_stream`
+            raise HTTPException(status_code=404)
+
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL,
+            "etag": self.etag_for(stat_result),
+        }
+        if self.offload == "x-accel":
+            relative = Path(full_path).relative_to(Path(self.directory).resolve()).as_posix()
+            headers["x-accel-redirect"] = f"{self.offload_prefix}/{relative}"
+        elif self.offload == "x-sendfile":
+            headers["x-sendfile"] = os.fspath(full_path)
+
+        if self.offload != "none":
+            response = Response(status_code=status_code, headers=headers)
+        else:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def get_media_files() -> StaticFiles:
+    if settings.MEDIA_SERVING == "plain":
+        return StaticFiles(directory=settings.MEDIA_DIR, check_dir=False)
+    return MediaFiles(
+        directory=settings.MEDIA_DIR,
+        offload=settings.MEDIA_OFFLOAD,
+        offload_prefix=settings.MEDIA_OFFLOAD_PREFIX,
+    )
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import threading
+import time
+
+from core.config import Settings
+from core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+from core.profiler import capture_stall
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+class LoopWatchdog:
+    """
+    A timer on the event loop wakes up every `interval` seconds and reports how
+    late it ran as `event_loop_lag_seconds`. A monitor thread watches the same
+    heartbeat: once the loop has not run the timer for `threshold` seconds, a
+    callback is blocking it and the loop thread's stack is dumped while it still
+    blocks (`core.profiler.capture_stall`), once per stall.
+    """
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._monitor: threading.Thread | None = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self._beat = now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(now - expected, 0.0))
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, thread_id: int) -> None:
+        reported = None  # heartbeat of the stall reported last
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for < self.threshold or reported == beat:
+                continue
+            reported = beat
+            self.stalls += 1
+            EVENT_LOOP_BLOCKS.inc()
+            try:
+                capture_stall(loop, thread_id, blocked_for)
+            except Exception:
+                logger.warning("Event loop blocked for %.2f s, no task dump", blocked_for, exc_info=True)
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._beat = time.monotonic()
+        self._task = loop.create_task(self._heartbeat(), name="loop-watchdog")
+        self._monitor = threading.Thread(
+            target=self._watch, args=(loop, threading.get_ident()), name="loop-watchdog", daemon=True
+        )
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._monitor is not None:
+            await asyncio.to_thread(self._monitor.join)
+
+
+def start_loop_watchdog() -> LoopWatchdog | None:
+    if not settings.LOOP_WATCHDOG:
+        return None
+    watchdog = LoopWatchdog(settings.LOOP_LAG_INTERVAL, settings.LOOP_BLOCK_THRESHOLD)
+    watchdog.start()
+    return watchdog
@@ -1,9 +1,23 @@
+import time
+
 from redis.asyncio import Redis
 from core.config import Settings
+from core.metrics import REDIS_COMMAND_LATENCY
 
 config = Settings() # pyright: ignore[reportCallIssue]
 
-redis_client = Redis.from_url(config.REDIS_URL)
+
+class TimedRedis(Redis):
+    """Client reporting the latency of every command (pipelines excluded)"""
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_LATENCY.labels(str(args[0]).upper()).observe(time.perf_counter() - started)
+
+
+redis_client = TimedRedis.from_url(config.REDIS_URL)
 
 def get_redis() -> Redis:
     """Returns prepared Redis session"""
@@ -1,3 +1,3 @@
 from .tables import *
-from .session import get_uow
+from .session import get_uow, read_only, statement_timeout, pool_stats
 from .unit_of_work import UoW
\ No newline at end of file
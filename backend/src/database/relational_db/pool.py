@@ -0,0 +1,111 @@
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.config import Settings
+from core.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_IN_USE, DB_POOL_OVERFLOW, DB_POOL_TIMEOUTS
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+@dataclass
+class PoolMetrics:
+    """Counters of one connection pool since it was created"""
+    checkouts: int = 0
+    timeouts: int = 0
+    overflow_events: int = 0  # connections opened beyond `pool_size`
+    slow_checkouts: int = 0
+    wait_total: float = 0.0  # in seconds
+    wait_max: float = 0.0
+    in_use_max: int = 0
+    recent_waits: deque[float] = field(default_factory=lambda: deque(maxlen=2048))
+
+    def observe(self, waited: float, in_use: int, overflowed: bool, slow: bool) -> None:
+        self.checkouts += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.in_use_max = max(self.in_use_max, in_use)
+        self.recent_waits.append(waited)
+        self.overflow_events += overflowed
+        self.slow_checkouts += slow
+
+    def wait_percentiles(self) -> dict[str, float]:
+        """Checkout wait of the recent checkouts, in seconds"""
+        waits = list(self.recent_waits)
+        return {name: _percentile(waits, q) for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))}
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that times every checkout: waiting for a free connection
+    (and opening a new one) is what requests lose when the pool is too small.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        name = self._orig_logging_name or "primary"
+        self._wait = DB_POOL_CHECKOUT_WAIT.labels(name)
+        self._in_use = DB_POOL_IN_USE.labels(name)
+        self._overflow_events = DB_POOL_OVERFLOW.labels(name)
+        self._timeouts = DB_POOL_TIMEOUTS.labels(name)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        overflow = self._overflow
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            self._timeouts.inc()
+            logger.warning(
+                "No database connection within %.1fs: %d in use, pool_size=%d max_overflow=%d",
+                time.perf_counter() - started, self.checkedout(), self.size(), self._max_overflow,
+            )
+            raise
+        waited = time.perf_counter() - started
+        overflowed = self._overflow > overflow and self._overflow > 0
+        self.metrics.observe(
+            waited,
+            in_use=self.checkedout(),
+            overflowed=overflowed,
+            slow=waited >= settings.DB_POOL_SLOW_CHECKOUT,
+        )
+        self._wait.observe(waited)
+        self._in_use.inc()
+        if overflowed:
+            self._overflow_events.inc()
+        return connection
+
+    def _do_return_conn(self, record):
+        self._in_use.dec()
+        super()._do_return_conn(record)
+
+    def stats(self) -> dict[str, float | int]:
+        metrics = self.metrics
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "in_use_max": metrics.in_use_max,
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "overflow_events": metrics.overflow_events,
+            "slow_checkouts": metrics.slow_checkouts,
+            "wait_avg": metrics.wait_total / metrics.checkouts if metrics.checkouts else 0.0,
+            "wait_max": metrics.wait_max,
+            **{f"wait_{name}": value for name, value in metrics.wait_percentiles().items()},
+        }
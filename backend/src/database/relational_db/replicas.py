@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from core.config import Settings
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind; 0 while it has replayed everything it received,
+# so an idle primary does not look like lag
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    lag: float | None = None  # None when the last check failed
+    checked_at: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaSet:
+    """
+    Read replicas from `DATABASE_REPLICA_URLS`. Replication lag is checked at
+    most every `DB_REPLICA_LAG_CHECK` seconds; a replica further behind than
+    `DB_REPLICA_MAX_LAG` (or unreachable) is skipped until it catches up.
+    """
+    def __init__(self, urls: list[str], **engine_options):
+        self.replicas = [
+            Replica(create_async_engine(url, pool_logging_name=f"replica{i}", **engine_options))
+            for i, url in enumerate(urls)
+        ]
+        self._lock = asyncio.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(settings.DB_CONNECT_TIMEOUT):
+                async with replica.engine.connect() as conn:
+                    lag = await conn.scalar(REPLICATION_LAG_SQL)
+            replica.lag = float(lag) if lag is not None else None
+        except Exception as exc:
+            if replica.lag is not None:
+                logger.warning("Replica %s is unavailable: %s", replica.name, exc)
+            replica.lag = None
+        replica.checked_at = time.monotonic()
+
+    async def _refresh(self) -> None:
+        deadline = time.monotonic() - settings.DB_REPLICA_LAG_CHECK
+        if all(replica.checked_at > deadline for replica in self.replicas):
+            return
+        async with self._lock:
+            stale = [replica for replica in self.replicas if replica.checked_at <= deadline]
+            await asyncio.gather(*(self._check(replica) for replica in stale))
+
+    async def pick(self) -> AsyncEngine | None:
+        """An up-to-date replica, None if every replica lags (read from the primary then)."""
+        if not self.replicas:
+            return None
+        await self._refresh()
+        healthy = [
+            replica for replica in self.replicas
+            if replica.lag is not None and replica.lag <= settings.DB_REPLICA_MAX_LAG
+        ]
+        return random.choice(healthy).engine if healthy else None
+
+    async def dispose(self) -> None:
+        await asyncio.gather(*(replica.engine.dispose() for replica in self.replicas))
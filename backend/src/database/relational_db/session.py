@@ -1,11 +1,15 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable, Coroutine
 from contextlib import asynccontextmanager
+from uuid import uuid4
 
-from sqlalchemy import text
-from sqlalchemy.exc import SQLAlchemyError
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import InvalidRequestError, SQLAlchemyError
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction, UOWTransaction
 from sqlalchemy.ext.asyncio import(
     create_async_engine,
     async_sessionmaker,
@@ -14,13 +18,126 @@ from sqlalchemy.ext.asyncio import(
 )
 
 from core.config import Settings
-from .unit_of_work import UoW
+from .pool import InstrumentedPool
+from .replicas import ReplicaSet
+from .unit_of_work import READ_ONLY, UoW
 
 config = Settings() # pyright: ignore[reportCallIssue]
 logger = logging.getLogger(__name__)
 
-engine: AsyncEngine = create_async_engine(config.DATABASE_URL, echo=config.DEBUG)
+# `session.info` key of a statement timeout (in ms) overriding `DB_STATEMENT_TIMEOUT`
+STATEMENT_TIMEOUT = "statement_timeout"
+# `session.info` key of an idle timeout (in ms) overriding `DB_IDLE_IN_TRANSACTION_TIMEOUT`
+IDLE_IN_TRANSACTION_TIMEOUT = "idle_in_transaction_timeout"
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(**overrides: Any) -> dict[str, Any]:
+    """
+    `create_async_engine` arguments built from `DB_*` settings.
+
+    Behind PgBouncer in transaction mode consecutive transactions may run on
+    different server connections: statements are not cached, get unique names
+    and timeouts are set per transaction instead of as startup parameters
+    (PgBouncer 1.21+ with `max_prepared_statements` or a `DISCARD ALL` reset
+    query keeps the server side clean).
+    """
+    connect_args: dict[str, Any] = {"timeout": config.DB_CONNECT_TIMEOUT}
+    if config.DB_PGBOUNCER:
+        connect_args |= {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+    else:
+        connect_args |= {
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(config.DB_STATEMENT_TIMEOUT),
+                "idle_in_transaction_session_timeout": str(config.DB_IDLE_IN_TRANSACTION_TIMEOUT),
+                # JIT makes asyncpg's enum type introspection on new connections slow
+                "jit": "off",
+            },
+        }
+    return {
+        "echo": config.DEBUG,
+        "poolclass": InstrumentedPool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_use_lifo": config.DB_POOL_USE_LIFO,
+        "connect_args": connect_args,
+    } | overrides
+
+
+engine: AsyncEngine = create_async_engine(config.DATABASE_URL, **engine_options())
 async_session: async_sessionmaker[AsyncSession] = async_sessionmaker(engine, expire_on_commit=False)
+replicas = ReplicaSet(
+    [url.strip() for url in config.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    **engine_options(),
+)
+
+
+def _timeouts_sql(statement_timeout: int, idle_timeout: int | None = None) -> str:
+    sql = f"SELECT set_config('statement_timeout', '{int(statement_timeout)}', true)"
+    if idle_timeout is None and config.DB_PGBOUNCER:
+        idle_timeout = config.DB_IDLE_IN_TRANSACTION_TIMEOUT
+    if idle_timeout is not None:
+        sql += f", set_config('idle_in_transaction_session_timeout', '{int(idle_timeout)}', true)"
+    return sql
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_timeouts(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    """Transaction-local timeouts: a session override, or the defaults behind PgBouncer."""
+    if session.info.get(READ_ONLY) and not config.DB_PGBOUNCER:
+        return  # autocommit, connection defaults apply
+    timeout = session.info.get(STATEMENT_TIMEOUT)
+    idle_timeout = session.info.get(IDLE_IN_TRANSACTION_TIMEOUT)
+    if timeout is None and idle_timeout is None and not config.DB_PGBOUNCER:
+        return
+    connection.exec_driver_sql(
+        _timeouts_sql(config.DB_STATEMENT_TIMEOUT if timeout is None else timeout, idle_timeout)
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _forbid_read_only_flush(session: Session, flush_context: UOWTransaction, instances: object) -> None:
+    if session.info.get(READ_ONLY):
+        raise InvalidRequestError("Changes can't be flushed in a read-only unit of work")
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _forbid_read_only_dml(state: ORMExecuteState) -> None:
+    if state.session.info.get(READ_ONLY) and (state.is_insert or state.is_update or state.is_delete):
+        raise InvalidRequestError("INSERT / UPDATE / DELETE in a read-only unit of work")
+
+
+def read_only_options() -> dict[str, Any]:
+    """
+    Autocommit: no BEGIN / COMMIT round trips, every statement sees the latest data.
+    Behind PgBouncer a statement and its prepare have to share a transaction,
+    so a READ ONLY transaction is used there.
+    """
+    if config.DB_PGBOUNCER:
+        return {"postgresql_readonly": True}
+    return {"isolation_level": "AUTOCOMMIT"}
+
+
+async def set_statement_timeout(session: AsyncSession, timeout: int) -> None:
+    """Statement timeout (in ms, 0 for none) for every following transaction of `session`."""
+    session.info[STATEMENT_TIMEOUT] = timeout
+    if session.in_transaction():
+        await session.execute(text(_timeouts_sql(timeout, session.info.get(IDLE_IN_TRANSACTION_TIMEOUT))))
+
+
+def pool_stats() -> dict[str, float | int]:
+    return engine.pool.stats()  # type: ignore[attr-defined]
 
 
 async def wait_for_db(timeout: int = 15, retry_interval: int = 3) -> None:
@@ -63,3 +180,27 @@ async def get_uow() -> AsyncGenerator[UoW, None]:
     async with async_session() as session:
         async with UoW(session) as uow:
             yield uow
+
+
+def statement_timeout(timeout: int) -> Callable[..., Coroutine[Any, Any, None]]:
+    """
+    Route dependency overriding `DB_STATEMENT_TIMEOUT` (in ms, 0 for none)
+    for the request's unit of work:
+
+        @router.post(..., dependencies=[Depends(statement_timeout(60_000))])
+    """
+    async def dependency(uow: UoW = Depends(get_uow)) -> None:
+        await set_statement_timeout(uow.session, timeout)
+
+    return dependency
+
+
+async def read_only(uow: UoW = Depends(get_uow)) -> None:
+    """
+    Route dependency for endpoints that never write: the request's unit of
+    work runs without a transaction to commit.
+
+        @router.get(..., dependencies=[Depends(read_only)])
+    """
+    if not uow.session.in_transaction():
+        uow.set_read_only(**read_only_options())
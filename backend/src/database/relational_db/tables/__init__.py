@@ -8,3 +8,6 @@ from .statistics import *
 from .recommendations import *
 from .exchanges import *
 from .roles import *
+from .media import *
+from .sync import *
+from .exports import *
@@ -1,18 +1,27 @@
 from uuid import UUID
-from sqlalchemy import select, func, or_, case
+from datetime import datetime
+from sqlalchemy import Row, select, func, or_, case, exists, text
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.books import ApprovalStatus
+from domain.statistics.enums import Interaction
 from utils import dist_expression
 from .books_table import Book
 from .authors_table import Author
 from .genres_table import Genre
 from ..recommendations import UserInterest
-from ..statistics import BookStats
+from ..statistics import BookStats, BookEvent
 from ..geography import ExchangeLocation
 from ..users import User
 
 
+IMPORT_STAGING_COLUMNS = (
+    "row_no", "id", "author_id", "genre_id", "exchange_location_id", "title",
+    "description", "extra_terms", "language_code", "pages", "condition", "is_available",
+)
+
+
 class BooksInterface:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -48,6 +57,66 @@ class BooksInterface:
     def add(self, book: Book):
         self.session.add(book)
 
+    async def genre_ids(self, book_ids: list[UUID]) -> dict[UUID, int]:
+        """`genre_id` of every existing book among `book_ids`"""
+        if not book_ids:
+            return {}
+        result = await self.session.execute(
+            select(Book.id, Book.genre_id).where(Book.id.in_(book_ids))
+        )
+        return dict(result.tuples().all())
+
+    async def create_import_staging(self) -> None:
+        """Unlogged per-transaction table the bulk import COPYs into, see `merge_import_staging`"""
+        await self.session.execute(text(
+            "CREATE TEMP TABLE books_import ("
+            " row_no integer NOT NULL, id uuid NOT NULL, author_id integer NOT NULL,"
+            " genre_id integer NOT NULL, exchange_location_id integer NOT NULL, title text NOT NULL,"
+            " description text, extra_terms text, language_code varchar(2) NOT NULL, pages integer,"
+            " condition text NOT NULL, is_available boolean NOT NULL"
+            ") ON COMMIT DROP"
+        ))
+
+    async def copy_to_import_staging(self, records: list[tuple]) -> None:
+        """Binary COPY of `IMPORT_STAGING_COLUMNS` tuples, straight through the asyncpg connection"""
+        if not records:
+            return
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "books_import", records=records, columns=IMPORT_STAGING_COLUMNS
+        )
+
+    async def merge_import_staging(self, owner_id: UUID, approval_status: ApprovalStatus) -> list[int]:
+        """
+        Move every staged row into `books` in one statement.
+        Rows whose author, genre, language or location vanished since validation
+        are left behind, their `row_no`s are returned.
+        """
+        result = await self.session.execute(
+            text(
+                "WITH inserted AS ("
+                " INSERT INTO books (id, owner_id, author_id, genre_id, exchange_location_id, title,"
+                "  description, extra_terms, language_code, pages, condition, photo_urls,"
+                "  is_available, approval_status)"
+                " SELECT s.id, :owner_id, s.author_id, s.genre_id, s.exchange_location_id, s.title,"
+                "  s.description, s.extra_terms, s.language_code, s.pages, CAST(s.condition AS \"condition\"),"
+                "  '{}', s.is_available, CAST(:approval_status AS approvalstatus)"
+                " FROM books_import s"
+                " JOIN authors a ON a.id = s.author_id"
+                " JOIN genres g ON g.id = s.genre_id"
+                " JOIN languages l ON l.code = s.language_code"
+                " JOIN exchange_locations e ON e.id = s.exchange_location_id"
+                " RETURNING id"
+                ")"
+                " SELECT s.row_no FROM books_import s"
+                " WHERE NOT EXISTS (SELECT 1 FROM inserted i WHERE i.id = s.id)"
+                " ORDER BY s.row_no"
+            ),
+            dict(owner_id=owner_id, approval_status=approval_status.name),
+        )
+        return list(result.scalars().all())
+
     async def check_ownership(self, book_id: UUID, user_id: UUID) -> Book | None:
         book = await self.session.scalar(
             select(Book)
@@ -212,6 +281,82 @@ class BooksInterface:
         books = await self.session.scalars(stmt)
         return list(books.all())
 
+    async def detail_version(self, book_id: UUID, user_id: UUID) -> Row | None:
+        """
+        Everything the detail representation depends on, as one narrow row:
+        row timestamps, counters and the user's own flags. No ORM objects are loaded.
+        Views are left out on purpose: every detail request records a click, so
+        including them would make every validator stale by the next request.
+        """
+        def user_event(interaction: Interaction):
+            return exists().where(
+                BookEvent.book_id == Book.id,
+                BookEvent.user_id == user_id,
+                BookEvent.interaction == interaction,
+            )
+
+        result = await self.session.execute(
+            select(
+                func.coalesce(Book.updated_at, Book.created_at),
+                func.coalesce(User.updated_at, User.created_at),
+                func.coalesce(ExchangeLocation.updated_at, ExchangeLocation.created_at),
+                BookStats.likes,
+                BookStats.reserves,
+                Book.has_active_exchange,
+                user_event(Interaction.LIKE),
+                user_event(Interaction.CLICK),
+            )
+            .join(User, User.id == Book.owner_id)
+            .join(ExchangeLocation, ExchangeLocation.id == Book.exchange_location_id)
+            .outerjoin(BookStats, BookStats.book_id == Book.id)
+            .where(Book.id == book_id)
+        )
+        return result.first()
+
+    async def user_books_version(self, user_id: UUID) -> Row:
+        """Aggregated version of every book owned by `user_id`, see `detail_version`."""
+        owned = aliased(Book)
+        # Event ids only grow, so their sum changes on every insert and delete
+        own_events = (
+            select(func.coalesce(func.sum(BookEvent.id), 0))
+            .join(owned, owned.id == BookEvent.book_id)
+            .where(owned.owner_id == user_id, BookEvent.user_id == user_id)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            select(
+                func.count(Book.id),
+                func.max(func.coalesce(Book.updated_at, Book.created_at)),
+                func.max(func.coalesce(ExchangeLocation.updated_at, ExchangeLocation.created_at)),
+                func.coalesce(func.sum(BookStats.views), 0),
+                func.coalesce(func.sum(BookStats.likes), 0),
+                func.coalesce(func.sum(BookStats.reserves), 0),
+                own_events,
+            )
+            .select_from(Book)
+            .join(ExchangeLocation, ExchangeLocation.id == Book.exchange_location_id)
+            .outerjoin(BookStats, BookStats.book_id == Book.id)
+            .where(Book.owner_id == user_id)
+        )
+        return result.one()
+
+    async def changed_user_books(self, user_id: UUID, since: datetime | None) -> list[Book]:
+        """Books of `user_id` whose row or counters changed after `since`, all of them when it is None."""
+        stmt = select(Book).where(Book.owner_id == user_id)
+        if since is not None:
+            stmt = stmt.where(
+                or_(
+                    func.coalesce(Book.updated_at, Book.created_at) > since,
+                    exists().where(
+                        BookStats.book_id == Book.id,
+                        # Counters inserted by the first event have no `updated_at` yet
+                        func.coalesce(BookStats.updated_at, BookStats.created_at) > since,
+                    ),
+                )
+            )
+        books = await self.session.scalars(stmt)
+        return list(books.all())
+
     async def list_user_books(self, user_id: UUID, limit: int) -> list[Book]:
         books = await self.session.scalars(
             select(Book)
@@ -223,7 +368,33 @@ class BooksInterface:
     async def list_books_for_approval(self, status: ApprovalStatus, limit: int) -> list[Book]:
         books = await self.session.scalars(
             select(Book)
-            .where(Book.approval_status == status)
+            .where(Book.approval_status == Book.approval_status_literal(status))
             .limit(limit)
         )
         return list(books.all())
+
+    async def referenced_photo_keys(self, keys: list[str]) -> set[str]:
+        """
+        Subset of storage `keys` some book photo url ends with. Matching the key
+        instead of the whole url survives changes of the public base url.
+        """
+        if not keys:
+            return set()
+        by_length: dict[int, set[str]] = {}
+        for key in keys:
+            by_length.setdefault(len(key), set()).add(key)
+        url = func.unnest(Book.photo_urls).column_valued("url")
+        used = await self.session.scalars(
+            select(url)
+            .select_from(Book)
+            .where(or_(*(
+                func.right(url, length + 1).in_([f"/{key}" for key in group])
+                for length, group in by_length.items()
+            )))
+        )
+        return {
+            url[-length:]
+            for url in used.all()
+            for length, group in by_length.items()
+            if url[-length:] in group
+        }
@@ -1,6 +1,6 @@
 from uuid import UUID, uuid4
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Uuid, String, Boolean, ForeignKey, Integer
+from sqlalchemy import Uuid, String, Boolean, ForeignKey, Integer, Index, literal, text
 from sqlalchemy.dialects.postgresql import ARRAY, ENUM
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -40,6 +40,30 @@ class Book(TimestampMixin, Base):
         ENUM(ApprovalStatus), nullable=False, default=ApprovalStatus.PENDING, server_default=ApprovalStatus.PENDING.value
     )
     moderation_reason: Mapped[str] = mapped_column(String, nullable=True)
+
+    __table_args__ = (
+        # Delta sync: the owner's books changed since a watermark
+        Index('ix_books_owner_changed', 'owner_id', text('coalesce(updated_at, created_at)')),
+        # Public listings, newest first, and their genre filter
+        Index(
+            'ix_books_public_created_at',
+            'created_at',
+            postgresql_where=text("approval_status = 'APPROVED' AND is_available"),
+        ),
+        Index(
+            'ix_books_public_genre_created_at',
+            'genre_id',
+            'created_at',
+            postgresql_where=text("approval_status = 'APPROVED' AND is_available"),
+        ),
+        # Moderation queue, oldest first
+        Index(
+            'ix_books_moderation_queue',
+            'approval_status',
+            'created_at',
+            postgresql_where=text("approval_status <> 'APPROVED'"),
+        ),
+    )
     
     @hybrid_property
     def has_active_exchange(self) -> bool:
@@ -54,6 +78,14 @@ class Book(TimestampMixin, Base):
         from ..exchanges import Exchange
         return cls.exchange.has(Exchange.is_active)
     
+    @classmethod
+    def approval_status_literal(cls, status: ApprovalStatus):
+        """
+        `status` rendered into the statement instead of bound, so the planner
+        can match the partial indexes on `approval_status` in generic plans too
+        """
+        return literal(status, cls.approval_status.type, literal_execute=True)
+
     @hybrid_property  
     def is_publicly_visible(self) -> bool:
         """Book is visible in public listings if: approved, user wants it available, and no active exchange"""
@@ -67,7 +99,7 @@ class Book(TimestampMixin, Base):
     def is_publicly_visible(cls):
         """SQLAlchemy expression for is_publicly_visible"""
         return (
-            (cls.approval_status == ApprovalStatus.APPROVED) &
+            (cls.approval_status == cls.approval_status_literal(ApprovalStatus.APPROVED)) &
             cls.is_available &
             ~cls.has_active_exchange
         )
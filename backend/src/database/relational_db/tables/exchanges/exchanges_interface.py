@@ -1,9 +1,12 @@
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import Row, select, and_, or_, func, exists
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .exchanges_table import Exchange
+from ..books import Book
+from ..users import User
 from domain.exchanges import ExchangeProgress
 
 
@@ -19,6 +22,45 @@ class ExchangesInterface:
         
         return exchange
     
+    async def version(self, id: UUID) -> Row | None:
+        """Participants and row timestamps of the exchange and everything nested in it."""
+        owner, requester = aliased(User), aliased(User)
+        result = await self.session.execute(
+            select(
+                Exchange.owner_id,
+                Exchange.requester_id,
+                func.coalesce(Exchange.updated_at, Exchange.created_at),
+                func.coalesce(Book.updated_at, Book.created_at),
+                func.coalesce(owner.updated_at, owner.created_at),
+                func.coalesce(requester.updated_at, requester.created_at),
+            )
+            .join(Book, Book.id == Exchange.book_id)
+            .join(owner, owner.id == Exchange.owner_id)
+            .join(requester, requester.id == Exchange.requester_id)
+            .where(Exchange.id == id)
+        )
+        return result.first()
+
+    async def changed_for_user(self, user_id: UUID, since: datetime | None) -> list[Exchange]:
+        """
+        Exchanges `user_id` takes part in that changed after `since`, all of them when it is None.
+        Edits of the nested book count as a change of the exchange.
+        """
+        participant = or_(Exchange.owner_id == user_id, Exchange.requester_id == user_id)
+        stmt = select(Exchange).where(participant)
+        if since is not None:
+            stmt = stmt.where(
+                or_(
+                    func.coalesce(Exchange.updated_at, Exchange.created_at) > since,
+                    exists().where(
+                        Book.id == Exchange.book_id,
+                        func.coalesce(Book.updated_at, Book.created_at) > since,
+                    ),
+                )
+            )
+        result = await self.session.scalars(stmt)
+        return list(result)
+
     def add(self, obj: Exchange):
         self.session.add(obj)
         
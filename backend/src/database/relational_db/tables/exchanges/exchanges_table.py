@@ -1,7 +1,7 @@
 from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Uuid, String, ForeignKey, Integer, DateTime
+from sqlalchemy import Uuid, String, ForeignKey, Integer, DateTime, Index, text
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.dialects.postgresql import ENUM
 
@@ -34,6 +34,16 @@ class Exchange(TimestampMixin, Base):
     
     # confirmed_by_owner: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
     # confirmed_by_requester: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
+
+    __table_args__ = (
+        # Delta sync: exchanges changed since a watermark, for either participant
+        Index('ix_exchanges_owner_changed', 'owner_id', text('coalesce(updated_at, created_at)')),
+        Index('ix_exchanges_requester_changed', 'requester_id', text('coalesce(updated_at, created_at)')),
+        # The book's exchange (every selectin load of `Book.exchange`) and its state
+        Index('ix_exchanges_book_id_progress', 'book_id', 'progress'),
+        # Active exchanges behind `Book.has_active_exchange`, admin lists by progress
+        Index('ix_exchanges_progress_created_at', 'progress', 'created_at'),
+    )
     
     @hybrid_property
     def is_active(self) -> bool:
@@ -0,0 +1 @@
+from .exports_interface import ExportsInterface
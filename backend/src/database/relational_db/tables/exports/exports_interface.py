@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Any, AsyncIterator
+from sqlalchemy import Table, select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ExportsInterface:
+    """Raw table rows for analytics exports, read through a server-side cursor."""
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def stream_rows(
+        self,
+        table: Table,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        after: Any | None = None,
+        batch_size: int = 5000,
+    ) -> AsyncIterator[list[RowMapping]]:
+        """
+        Rows of `table` created in `[since, until)` in primary key order, resuming
+        after the `after` key. Only `batch_size` rows are held in memory at a time.
+        Plain columns are selected, so no ORM objects or relationship loads are involved.
+        """
+        (pk,) = table.primary_key.columns
+        stmt = select(table).order_by(pk)
+        if since is not None:
+            stmt = stmt.where(table.c.created_at >= since)
+        if until is not None:
+            stmt = stmt.where(table.c.created_at < until)
+        if after is not None:
+            stmt = stmt.where(pk > after)
+
+        # A consistent snapshot that never blocks writers; options apply as the transaction begins
+        await self.session.connection(
+            execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+        )
+        result = await self.session.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.mappings().partitions():
+            yield partition
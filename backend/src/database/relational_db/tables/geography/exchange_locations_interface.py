@@ -11,10 +11,10 @@ class ExchangeLocationsInterface:
         
     async def list_all(
         self, 
-        limit: int,
+        limit: int | None = None,
     ) -> list[ExchangeLocation]:
         locations = await self.session.scalars(
-            select(ExchangeLocation).limit(limit)
+            select(ExchangeLocation).order_by(ExchangeLocation.id).limit(limit)
         )
         return list(locations.all())
     
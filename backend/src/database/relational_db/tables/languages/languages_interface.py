@@ -8,6 +8,12 @@ class LanguagesInterface:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def list_all(self) -> list[Language]:
+        languages = await self.session.scalars(
+            select(Language).order_by(Language.code)
+        )
+        return list(languages.all())
+
     async def search(self, q: str | None, limit: int) -> list[Language]:
         stmt = select(Language)
 
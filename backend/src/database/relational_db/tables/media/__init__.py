@@ -0,0 +1,2 @@
+from .media_objects_table import MediaObject
+from .media_objects_interface import MediaObjectsInterface
@@ -0,0 +1,64 @@
+from datetime import datetime
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .media_objects_table import MediaObject
+
+
+class MediaObjectsInterface:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def acquire(self, digest: str, count: int = 1) -> list[str] | None:
+        """Add references to already stored content, returns its keys or None if it's missing."""
+        return await self.session.scalar(
+            update(MediaObject)
+            .where(MediaObject.digest == digest)
+            .values(ref_count=MediaObject.ref_count + count)
+            .returning(MediaObject.keys)
+        )
+
+    async def add(self, digest: str, keys: list[str], size: int, ref_count: int = 1) -> None:
+        """Register freshly uploaded content, a concurrent upload of the same bytes just adds references."""
+        stmt = insert(MediaObject).values(digest=digest, keys=keys, size=size, ref_count=ref_count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=(MediaObject.digest,),
+            set_=dict(ref_count=MediaObject.ref_count + stmt.excluded.ref_count),
+        )
+        await self.session.execute(stmt)
+
+    async def release(self, digest: str, count: int = 1) -> None:
+        await self.session.execute(
+            update(MediaObject)
+            .where(MediaObject.digest == digest)
+            .values(ref_count=func.greatest(MediaObject.ref_count - count, 0))
+        )
+
+    async def pop_unreferenced(self, older_than: datetime, limit: int) -> list[list[str]]:
+        """
+        Delete rows nobody references since `older_than` and return their keys.
+        Row locks are held until commit, so concurrent `acquire` waits for the
+        storage cleanup and then uploads the content again.
+        """
+        candidates = (
+            select(MediaObject.digest)
+            .where(
+                MediaObject.ref_count <= 0,
+                func.coalesce(MediaObject.updated_at, MediaObject.created_at) < older_than,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        keys = await self.session.scalars(
+            delete(MediaObject)
+            .where(MediaObject.digest.in_(candidates))
+            .returning(MediaObject.keys)
+        )
+        return list(keys.all())
+
+    async def existing(self, digests: list[str]) -> set[str]:
+        found = await self.session.scalars(
+            select(MediaObject.digest).where(MediaObject.digest.in_(digests))
+        )
+        return set(found.all())
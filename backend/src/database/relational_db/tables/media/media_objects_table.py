@@ -0,0 +1,18 @@
+from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy import String, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from ..table_base import Base
+from ..mixins import TimestampMixin
+
+
+class MediaObject(TimestampMixin, Base):
+    """Content-addressed upload: stored once, shared by every book or avatar referencing it."""
+    __tablename__ = "media_objects"
+
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True, comment='sha256 of uploaded bytes')
+    keys: Mapped[list[str]] = mapped_column(
+        ARRAY(String, dimensions=1), nullable=False, comment='Storage keys, full variant first'
+    )
+    size: Mapped[int] = mapped_column(Integer, nullable=False, comment='Uploaded size in bytes')
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
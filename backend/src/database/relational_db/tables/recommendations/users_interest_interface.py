@@ -31,3 +31,20 @@ class UserInterestInterface:
             )
         )
         await self.session.execute(stmt)
+
+    async def edit_coefs(self, coef_deltas: dict[int, float], user_id: UUID):
+        """`edit_coef` for several genres in one statement"""
+        if not coef_deltas:
+            return
+        stmt = insert(UserInterest).values(
+            [
+                dict(genre_id=genre_id, user_id=user_id, coef=delta)
+                for genre_id, delta in coef_deltas.items()
+            ]
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=("genre_id", "user_id"),
+                set_=dict(coef=UserInterest.coef + stmt.excluded.coef)
+            )
+        )
@@ -43,6 +43,40 @@ class BookEventsInterface:
             await self.session.execute(del_stmt)
         return event_id
         
+    async def add_many(self, rows: list[dict]) -> None:
+        """One multi-row insert, a like that already exists is skipped"""
+        if rows:
+            await self.session.execute(
+                insert(BookEvent)
+                .values(rows)
+                .on_conflict_do_nothing(
+                    index_elements=("book_id", "user_id"),
+                    index_where=text("interaction = 'LIKE'"),
+                )
+            )
+
+    async def liked_book_ids(self, user_id: UUID, book_ids: list[UUID]) -> set[UUID]:
+        if not book_ids:
+            return set()
+        result = await self.session.scalars(
+            select(BookEvent.book_id).where(
+                BookEvent.user_id == user_id,
+                BookEvent.book_id.in_(book_ids),
+                BookEvent.interaction == Interaction.LIKE,
+            )
+        )
+        return set(result.all())
+
+    async def delete_likes(self, user_id: UUID, book_ids: list[UUID]) -> None:
+        if book_ids:
+            await self.session.execute(
+                delete(BookEvent).where(
+                    BookEvent.user_id == user_id,
+                    BookEvent.book_id.in_(book_ids),
+                    BookEvent.interaction == Interaction.LIKE,
+                )
+            )
+
     async def by_book_user(
         self,
         book_id: UUID,
@@ -73,6 +107,18 @@ class BookEventsInterface:
         )
         return list(events.all())
     
+    async def likes_since(self, user_id: UUID, since: datetime | None) -> list[BookEvent]:
+        """Likes of `user_id` stored after `since`, whatever time the client reported for them."""
+        stmt = select(BookEvent).where(
+            BookEvent.user_id == user_id,
+            # Literal, so the planner can match the partial `ix_book_events_user_likes_ingested`
+            text("book_events.interaction = 'LIKE'"),
+        )
+        if since is not None:
+            stmt = stmt.where(BookEvent.ingested_at > since)
+        events = await self.session.scalars(stmt.order_by(BookEvent.ingested_at))
+        return list(events.all())
+
     async def users_by_day(
         self,
         days: int,
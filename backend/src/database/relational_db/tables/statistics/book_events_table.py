@@ -1,6 +1,7 @@
 from uuid import UUID
+from datetime import datetime
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Uuid, ForeignKey, Integer, Index, text
+from sqlalchemy import Uuid, ForeignKey, Integer, Index, DateTime, func, text
 from sqlalchemy.dialects.postgresql import ENUM
 
 from domain.statistics import Interaction
@@ -21,6 +22,10 @@ class BookEvent(CreatedAtMixin, Base):
     )
     
     interaction: Mapped[Interaction] = mapped_column(ENUM(Interaction), nullable=False)
+    # Database clock at insert; `created_at` may be a client timestamp from the past
+    ingested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
     
     __table_args__ = (
         Index(
@@ -30,4 +35,17 @@ class BookEvent(CreatedAtMixin, Base):
             unique=True,
             postgresql_where=text("interaction = 'LIKE'"),
         ),
+        # Delta sync: likes added by a user since a watermark
+        Index(
+            'ix_book_events_user_likes_ingested',
+            'user_id',
+            'ingested_at',
+            postgresql_where=text("interaction = 'LIKE'"),
+        ),
+        # A user's events on given books, and the cascade when a user is deleted
+        Index('ix_book_events_user_book', 'user_id', 'book_id'),
+        # Daily stats of one book, and the cascade when a book is deleted
+        Index('ix_book_events_book_created_at', 'book_id', 'created_at'),
+        # Events are appended in time order, block ranges are enough for date windows
+        Index('ix_book_events_created_at', 'created_at', postgresql_using='brin'),
     )
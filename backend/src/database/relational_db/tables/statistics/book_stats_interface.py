@@ -1,4 +1,5 @@
 from uuid import UUID
+from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -27,17 +28,34 @@ class BookStatsInterface:
             case Interaction.CLICK:
                 stmt = stmt.values(views=1).on_conflict_do_update(
                     index_elements=("book_id",),
-                    set_=dict(views=BookStats.views + 1)
+                    set_=dict(views=BookStats.views + 1, updated_at=func.now())
                 )
             case Interaction.LIKE:
                 stmt = stmt.values(likes=1).on_conflict_do_update(
                     index_elements=("book_id",),
-                    set_=dict(likes=BookStats.likes + 1)
+                    set_=dict(likes=BookStats.likes + 1, updated_at=func.now())
                 )
             case Interaction.RESERVE:
                 stmt = stmt.values(reserves=1).on_conflict_do_update(
                     index_elements=("book_id",),
-                    set_=dict(reserves=BookStats.reserves + 1)
+                    set_=dict(reserves=BookStats.reserves + 1, updated_at=func.now())
                 )
             
         await self.session.execute(stmt)
+
+    async def add_counters(self, deltas: list[dict]) -> None:
+        """Upsert `{book_id, views, likes, reserves}` increments for many books in one statement"""
+        if not deltas:
+            return
+        stmt = insert(BookStats).values(deltas)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=("book_id",),
+                set_=dict(
+                    views=BookStats.views + stmt.excluded.views,
+                    likes=BookStats.likes + stmt.excluded.likes,
+                    reserves=BookStats.reserves + stmt.excluded.reserves,
+                    updated_at=func.now(),
+                ),
+            )
+        )
@@ -0,0 +1,2 @@
+from .sync_tombstones_table import SyncTombstone
+from .sync_tombstones_interface import SyncTombstonesInterface
@@ -0,0 +1,29 @@
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .sync_tombstones_table import SyncTombstone
+
+
+class SyncTombstonesInterface:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def watermark(self) -> datetime:
+        """Database clock, the one tombstones and ingestion times are stamped with."""
+        return await self.session.scalar(select(func.now()))  # type: ignore[return-value]
+
+    async def since(self, user_id: UUID, since: datetime) -> list[SyncTombstone]:
+        result = await self.session.scalars(
+            select(SyncTombstone)
+            .where(SyncTombstone.user_id == user_id, SyncTombstone.deleted_at > since)
+            .order_by(SyncTombstone.deleted_at)
+        )
+        return list(result)
+
+    async def prune(self, before: datetime) -> int:
+        result = await self.session.execute(
+            delete(SyncTombstone).where(SyncTombstone.deleted_at < before)
+        )
+        return result.rowcount
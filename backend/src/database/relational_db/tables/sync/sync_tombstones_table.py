@@ -0,0 +1,27 @@
+from uuid import UUID
+from datetime import datetime
+from sqlalchemy.orm import mapped_column, Mapped
+from sqlalchemy import BigInteger, String, Uuid, DateTime, Index, func
+
+from ..table_base import Base
+
+
+class SyncTombstone(Base):
+    """
+    Deleted row as seen by one user, written by the `record_sync_tombstone` trigger
+    on books, exchanges and likes, so cascades are covered too.
+    No FK on `user_id`: deleting a user cascades into rows that write tombstones for them.
+    """
+    __tablename__ = "sync_tombstones"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    user_id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
+    entity: Mapped[str] = mapped_column(String(16), nullable=False, comment='book | exchange | like')
+    entity_id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index('ix_sync_tombstones_user_deleted_at', 'user_id', 'deleted_at'),
+    )
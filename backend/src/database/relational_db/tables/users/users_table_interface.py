@@ -138,3 +138,23 @@ class UserInterface:
         
         await self.session.flush()
         return user
+
+    async def referenced_avatar_keys(self, keys: list[str]) -> set[str]:
+        """Subset of storage `keys` somebody's avatar url ends with, see `BooksInterface.referenced_photo_keys`."""
+        if not keys:
+            return set()
+        by_length: dict[int, set[str]] = {}
+        for key in keys:
+            by_length.setdefault(len(key), set()).add(key)
+        used = await self.session.scalars(
+            select(User.avatar_url).where(or_(*(
+                func.right(User.avatar_url, length + 1).in_([f"/{key}" for key in group])
+                for length, group in by_length.items()
+            )))
+        )
+        return {
+            url[-length:]
+            for url in used.all()
+            for length, group in by_length.items()
+            if url[-length:] in group
+        }
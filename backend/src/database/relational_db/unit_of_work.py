@@ -1,32 +1,45 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# `session.info` key set while the unit of work is read-only
+READ_ONLY = "read_only"
+
 
 class UoW:
     """Unit-of-Work: single transaction, single session."""
     def __init__(self, session: AsyncSession):
         self.session = session
-        self._committed = False
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, *_):
-        if exc_type is None and not self._committed:
+        # Without a connection in use this only flushes pending changes, no round trip
+        if exc_type is None:
             await self.session.commit()
-        elif exc_type is not None:
+        else:
             await self.session.rollback()
-            
+
+    @property
+    def read_only(self) -> bool:
+        return bool(self.session.info.get(READ_ONLY))
+
+    def set_read_only(self, **execution_options) -> None:
+        """
+        Run the following statements with `execution_options` (autocommit, or a
+        read-only transaction) on whatever the session is bound to. Must be
+        called before the first statement; writes raise from then on.
+        """
+        sync_session = self.session.sync_session
+        sync_session.bind = sync_session.bind.execution_options(**execution_options)  # type: ignore[union-attr]
+        self.session.info[READ_ONLY] = True
+
     async def flush(self):
         """Flush the current session."""
         await self.session.flush()
 
     async def commit(self):
-        """Manually commit the current transaction and start a new one."""
+        """Commit the current transaction, the next statement begins a new one."""
         await self.session.commit()
-        self._committed = True
-        # Start a new transaction for any subsequent operations
-        await self.session.begin()
-        self._committed = False
 
     async def savepoint(self):
         """Create a savepoint for partial rollbacks."""
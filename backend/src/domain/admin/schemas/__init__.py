@@ -1,4 +1,8 @@
 from .administrating import BanRequest
 from .book_moderation import ModerationReason
+from .media import OrphanReport
+from .exports import ExportDataset, ExportFormat
+from .database import PoolStats
+from .profiler import ProfileMode, ProfileTicket
 
-__all__ = ['BanRequest', 'ModerationReason']
+__all__ = ['BanRequest', 'ModerationReason', 'OrphanReport', 'ExportDataset', 'ExportFormat', 'PoolStats', 'ProfileMode', 'ProfileTicket']
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class PoolStats(BaseModel):
+    pool_size: int = Field(..., description='Connections kept open')
+    max_overflow: int = Field(..., description='Extra connections allowed under load')
+    in_use: int = Field(..., description='Connections checked out right now')
+    idle: int = Field(..., description='Open connections waiting in the pool')
+    overflow: int = Field(..., description='Overflow connections open right now')
+    in_use_max: int = Field(..., description='Most connections checked out at once')
+    checkouts: int
+    timeouts: int = Field(..., description='Checkouts that gave up after `DB_POOL_TIMEOUT`')
+    overflow_events: int = Field(..., description='Connections opened beyond `pool_size`')
+    slow_checkouts: int = Field(..., description='Checkouts waiting at least `DB_POOL_SLOW_CHECKOUT`')
+    wait_avg: float = Field(..., description='Checkout wait, in seconds')
+    wait_max: float
+    wait_p50: float = Field(..., description='Over the recent checkouts')
+    wait_p95: float
+    wait_p99: float
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class ExportDataset(Enum):
+    BOOK_EVENTS = "book_events"
+    BOOKS = "books"
+    EXCHANGES = "exchanges"
+
+
+class ExportFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
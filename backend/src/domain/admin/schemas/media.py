@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class OrphanReport(BaseModel):
+    dry_run: bool = Field(..., description='Nothing was deleted, orphans were only counted')
+    scanned: int = Field(0, description='Stored objects old enough to be checked')
+    orphaned: int = Field(0, description='Objects no book, avatar or media record points at')
+    orphaned_bytes: int = Field(0, description='Total size of orphaned objects')
+    deleted: int = Field(0, description='Objects removed from storage')
+    sample: list[str] = Field(default_factory=list, description='First orphaned keys')
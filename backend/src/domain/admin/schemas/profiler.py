@@ -0,0 +1,15 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class ProfileMode(Enum):
+    WALL = "wall"
+    CPU = "cpu"
+
+
+class ProfileTicket(BaseModel):
+    token: str = Field(..., description='Send it in the `header` of the request to profile')
+    header: str
+    mode: ProfileMode
+    expires_in: int = Field(..., description='Seconds left to send the request')
@@ -1,3 +1,4 @@
 from .books import BookModel, BookCreate, BookPatch, BookDetailModel
 from .genres import GenreModel
 from .authors import AuthorModel
+from .imports import ImportFormat, BookImportError, BookImportReport
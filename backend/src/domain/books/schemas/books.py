@@ -1,8 +1,8 @@
 from uuid import UUID
 from typing import Annotated
-from pydantic import BaseModel, Field, constr
+from pydantic import BaseModel, Field, constr, computed_field
 
-from domain.common import TimestampModel
+from domain.common import TimestampModel, ImageVariants
 from .authors import AuthorModel
 from .genres import GenreModel
 from ..enums import Condition, ApprovalStatus
@@ -36,6 +36,11 @@ class BookModel(TimestampModel, BaseModel):
     total_likes: int = Field(0)
     total_reserves: int = Field(0)
 
+    @computed_field(description='Resized copies of every photo in `photo_urls`, same order')
+    @property
+    def photo_variants(self) -> list[ImageVariants]:
+        return [ImageVariants.from_url(url) for url in self.photo_urls]
+
 
 class BookDetailModel(BookModel):
     """Enhanced book model for detailed view with additional data"""
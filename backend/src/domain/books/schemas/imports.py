@@ -0,0 +1,21 @@
+from enum import Enum
+from pydantic import BaseModel, Field
+
+
+class ImportFormat(Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class BookImportError(BaseModel):
+    row: int = Field(..., description='1-based data row, the CSV header is not counted')
+    errors: list[str] = Field(...)
+
+
+class BookImportReport(BaseModel):
+    received: int = Field(..., description='Data rows read from the upload')
+    imported: int = Field(...)
+    failed: int = Field(...)
+    errors: list[BookImportError] = Field(
+        default_factory=list, description='Per-row problems, capped at `BOOK_IMPORT_MAX_ERRORS`'
+    )
@@ -1,2 +1,4 @@
 from .pagination import CursorPage
 from .timestamps import CreatedAtModel, TimestampModel
+from .images import ImageVariants
+from .uploads import DirectUploadRequest, DirectUpload, FinalizeUpload, FinalizeUploads
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+
+class ImageVariants(BaseModel):
+    """Urls of the resized copies produced for an uploaded image."""
+    thumb: str = Field(..., description='Up to 200px on the longest side')
+    medium: str = Field(..., description='Up to 800px on the longest side')
+    full: str = Field(..., description='Up to 1600px on the longest side')
+
+    @classmethod
+    def from_url(cls, url: str) -> "ImageVariants":
+        """Variants are stored next to each other as `<prefix>/<variant>.<ext>`."""
+        base, _, name = url.rpartition("/")
+        stem, _, ext = name.partition(".")
+        if stem != "full":
+            # Uploaded before the image pipeline existed, only the original is stored
+            return cls(thumb=url, medium=url, full=url)
+        return cls(
+            thumb=f"{base}/thumb.{ext}",
+            medium=f"{base}/medium.{ext}",
+            full=url,
+        )
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+
+
+class DirectUploadRequest(BaseModel):
+    content_type: str = Field(..., description='MIME type the file will be uploaded with')
+    size: int = Field(..., gt=0, description='Exact file size in bytes')
+
+
+class DirectUpload(BaseModel):
+    """Presigned target the client PUTs the file to, then passes `key` to finalize."""
+    key: str = Field(..., description='Upload key to finalize')
+    url: str = Field(..., description='Presigned PUT url')
+    headers: dict[str, str] = Field(..., description='Headers the PUT must be sent with')
+    expires_in: int = Field(..., description='Seconds the url stays valid')
+
+
+class FinalizeUpload(BaseModel):
+    key: str = Field(..., description='Key of a completed direct upload')
+
+
+class FinalizeUploads(BaseModel):
+    keys: list[str] = Field(..., min_length=1, description='Keys of completed direct uploads')
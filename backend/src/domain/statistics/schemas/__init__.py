@@ -1,2 +1,3 @@
 from .user_graphs import ActiveUsersGraph, RegistrationsGraph
 from .book_graphs import BookStatsGraph
+from .interactions import InteractionItem, InteractionBatch, InteractionBatchResult
@@ -0,0 +1,33 @@
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+
+from ..enums import Interaction
+
+INTERACTION_BATCH_MAX = 200
+BATCHABLE_INTERACTIONS = (Interaction.CLICK, Interaction.LIKE)
+
+
+class InteractionItem(BaseModel):
+    book_id: UUID = Field(...)
+    interaction: Interaction = Field(..., description='`click` or `like`, reserves go through `/reserve`')
+    ts: datetime | None = Field(
+        None, description='When it happened on the client, clamped to a recent window by the server'
+    )
+
+    @field_validator('interaction')
+    @classmethod
+    def _batchable(cls, v: Interaction) -> Interaction:
+        if v not in BATCHABLE_INTERACTIONS:
+            raise ValueError('Only click and like can be sent in a batch')
+        return v
+
+
+class InteractionBatch(BaseModel):
+    """Interactions in the order they happened, a like sent twice toggles it back."""
+    items: list[InteractionItem] = Field(..., min_length=1, max_length=INTERACTION_BATCH_MAX)
+
+
+class InteractionBatchResult(BaseModel):
+    recorded: int = Field(..., description='Number of items applied')
+    skipped: list[UUID] = Field(default_factory=list, description='Unknown book ids, their items were dropped')
@@ -0,0 +1 @@
+from .sync import SyncDeleted, SyncLike, SyncResponse
@@ -0,0 +1,32 @@
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+from ...books import BookModel
+from ...exchanges import ExchangeModel
+
+
+class SyncLike(BaseModel):
+    book_id: UUID = Field(...)
+    created_at: datetime = Field(..., description='When the book was liked')
+
+
+class SyncDeleted(BaseModel):
+    books: list[UUID] = Field(default_factory=list)
+    exchanges: list[UUID] = Field(default_factory=list)
+    likes: list[UUID] = Field(default_factory=list, description='Ids of books that are no longer liked')
+
+
+class SyncResponse(BaseModel):
+    """
+    Rows of the current user changed since the `since` token.
+    Items may repeat across responses, clients should upsert them by id.
+    """
+    token: str = Field(..., description='Watermark to pass as `since` on the next sync')
+    reset: bool = Field(
+        ..., description='Full snapshot: the client should drop its local copy before applying it'
+    )
+    books: list[BookModel] = Field(default_factory=list, description='Own books, created or changed')
+    exchanges: list[ExchangeModel] = Field(default_factory=list, description='Owned and requested exchanges')
+    likes: list[SyncLike] = Field(default_factory=list)
+    deleted: SyncDeleted = Field(default_factory=SyncDeleted)
@@ -1,9 +1,9 @@
 from typing import Annotated
-from pydantic import BaseModel, Field, EmailStr, confloat, model_validator, HttpUrl, field_validator, constr
+from pydantic import BaseModel, Field, EmailStr, confloat, model_validator, HttpUrl, field_validator, constr, computed_field
 from datetime import date
 from uuid import UUID
 
-from domain.common import TimestampModel
+from domain.common import TimestampModel, ImageVariants
 from domain.books.schemas import GenreModel
 from ..enums import Gender
 from ...geo import CityModel
@@ -38,6 +38,13 @@ class UserModel(TimestampModel):
         description="User's roles."
     )
 
+    @computed_field(description='Resized copies of the avatar')
+    @property
+    def avatar_variants(self) -> ImageVariants | None:
+        if self.avatar_url is None:
+            return None
+        return ImageVariants.from_url(str(self.avatar_url))
+
 
 class UserPatch(BaseModel):
     username: str | None = Field(None, description="User's display name")
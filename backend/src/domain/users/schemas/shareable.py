@@ -1,8 +1,9 @@
 from typing import Annotated, TYPE_CHECKING
-from pydantic import BaseModel, Field, HttpUrl, constr, confloat
+from pydantic import BaseModel, Field, HttpUrl, constr, confloat, computed_field
 from uuid import UUID
 
 from domain.books.schemas.genres import GenreModel
+from domain.common import ImageVariants
 from ..enums import Gender
 from ...geo import CityModel
 
@@ -51,3 +52,10 @@ class UserBrief(BaseModel):
     id: UUID = Field(...)
     username: str | None = Field(None, description="User's display name")
     avatar_url: HttpUrl | None = Field(None)
+
+    @computed_field(description='Resized copies of the avatar')
+    @property
+    def avatar_variants(self) -> ImageVariants | None:
+        if self.avatar_url is None:
+            return None
+        return ImageVariants.from_url(str(self.avatar_url))
@@ -1,5 +1,4 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi import Depends, FastAPI
 from fastapi_limiter import FastAPILimiter
 from contextlib import asynccontextmanager
 from starlette.middleware.cors import CORSMiddleware
@@ -7,8 +6,17 @@ from starlette.middleware.cors import CORSMiddleware
 from api import get_api_routers
 from webhooks import get_webhooks
 from core.config import Settings, configure_logging
+from core.storage import init_s3_client, close_s3_client, get_media_files
+from core.images import shutdown_image_pool
+from core.replicas import ReadYourWritesMiddleware
+from core.middlewares import QueryStatsMiddleware, RequestProfilerMiddleware
+from core.metrics import MetricsMiddleware, mark_process_dead, metrics_response
+from core.security import metrics_scraper
+from core.watchdog import start_loop_watchdog
+from service.reference import init_reference_data, close_reference_data
 from database.redis import get_redis
-# from scheduler import init_scheduler
+from database.relational_db.session import replicas
+from scheduler import init_scheduler
 
 
 config = Settings() # pyright: ignore[reportCallIssue]
@@ -17,11 +25,25 @@ configure_logging()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis = get_redis()
+    scheduler = init_scheduler()
+    watchdog = start_loop_watchdog()
     try:
         await FastAPILimiter.init(redis)
+        await init_s3_client()
+        await init_reference_data()
+        scheduler.start()
         yield
     finally:
+        if scheduler.running:
+            scheduler.shutdown(wait=False)
+        await close_reference_data()
+        shutdown_image_pool()
+        await close_s3_client()
+        await replicas.dispose()
         await redis.aclose()
+        if watchdog is not None:
+            await watchdog.stop()
+        mark_process_dead()
 
 
 app = FastAPI(
@@ -32,7 +54,7 @@ app = FastAPI(
 )
 
 # Mount static
-app.mount('/media', StaticFiles(directory=config.MEDIA_DIR, check_dir=False), 'media')
+app.mount('/media', get_media_files(), 'media')
 
 # Including routers
 app.include_router(get_api_routers())
@@ -43,7 +65,16 @@ app.include_router(get_webhooks())
 async def ping():
     return {'status': 'operating'}
 
+# Prometheus scrape target, only served to requests carrying METRICS_TOKEN
+@app.get('/metrics', include_in_schema=False, dependencies=[Depends(metrics_scraper)])
+async def metrics():
+    return metrics_response()
+
 # Adding middlewares
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RequestProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Optional CORS; enable only when calling API directly, without proxy
 # def _parse_csv(value: str) -> list[str]:
@@ -0,0 +1,82 @@
+"""add sync_tombstones table and delta sync indexes
+
+Revision ID: 6473e1d9aa01
+Revises: 7ceb169b9186
+Create Date: 2026-10-19 15:21:37.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6473e1d9aa01'
+down_revision: Union[str, Sequence[str], None] = '7ceb169b9186'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TOMBSTONE_FUNCTION = """
+CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'books' THEN
+        INSERT INTO sync_tombstones (user_id, entity, entity_id)
+        VALUES (OLD.owner_id, 'book', OLD.id);
+    ELSIF TG_TABLE_NAME = 'exchanges' THEN
+        INSERT INTO sync_tombstones (user_id, entity, entity_id)
+        VALUES (OLD.owner_id, 'exchange', OLD.id), (OLD.requester_id, 'exchange', OLD.id);
+    ELSIF TG_TABLE_NAME = 'book_events' AND OLD.interaction = 'LIKE' THEN
+        INSERT INTO sync_tombstones (user_id, entity, entity_id)
+        VALUES (OLD.user_id, 'like', OLD.book_id);
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_TABLES = ('books', 'exchanges', 'book_events')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('entity', sa.String(length=16), nullable=False, comment='book | exchange | like'),
+    sa.Column('entity_id', sa.Uuid(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_tombstones_user_deleted_at', 'sync_tombstones', ['user_id', 'deleted_at'], unique=False)
+
+    op.create_index('ix_books_owner_changed', 'books', ['owner_id', sa.text('coalesce(updated_at, created_at)')], unique=False)
+    op.create_index('ix_exchanges_owner_changed', 'exchanges', ['owner_id', sa.text('coalesce(updated_at, created_at)')], unique=False)
+    op.create_index('ix_exchanges_requester_changed', 'exchanges', ['requester_id', sa.text('coalesce(updated_at, created_at)')], unique=False)
+    op.create_index(
+        'ix_book_events_user_likes', 'book_events', ['user_id', 'created_at'],
+        unique=False, postgresql_where=sa.text("interaction = 'LIKE'"),
+    )
+
+    op.execute(TOMBSTONE_FUNCTION)
+    for table in TRIGGER_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRIGGER_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_tombstone ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_sync_tombstone()")
+
+    op.drop_index('ix_book_events_user_likes', table_name='book_events', postgresql_where=sa.text("interaction = 'LIKE'"))
+    op.drop_index('ix_exchanges_requester_changed', table_name='exchanges')
+    op.drop_index('ix_exchanges_owner_changed', table_name='exchanges')
+    op.drop_index('ix_books_owner_changed', table_name='books')
+
+    op.drop_index('ix_sync_tombstones_user_deleted_at', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -0,0 +1,37 @@
+"""add media_objects table
+
+Revision ID: 7ceb169b9186
+Revises: 16a75f94d861
+Create Date: 2026-10-19 12:04:11.519837
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7ceb169b9186'
+down_revision: Union[str, Sequence[str], None] = '16a75f94d861'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_objects',
+    sa.Column('digest', sa.String(length=64), nullable=False, comment='sha256 of uploaded bytes'),
+    sa.Column('keys', postgresql.ARRAY(sa.String(), dimensions=1), nullable=False, comment='Storage keys, full variant first'),
+    sa.Column('size', sa.Integer(), nullable=False, comment='Uploaded size in bytes'),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('digest')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('media_objects')
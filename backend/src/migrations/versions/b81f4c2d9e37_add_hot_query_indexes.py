@@ -0,0 +1,52 @@
+"""add indexes for listings, exchanges and book events
+
+Revision ID: b81f4c2d9e37
+Revises: 6473e1d9aa01
+Create Date: 2026-10-19 16:41:12.504318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f4c2d9e37'
+down_revision: Union[str, Sequence[str], None] = '6473e1d9aa01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PUBLIC_BOOKS = sa.text("approval_status = 'APPROVED' AND is_available")
+MODERATED_BOOKS = sa.text("approval_status <> 'APPROVED'")
+
+# name, table, columns, extra create_index arguments
+INDEXES = [
+    ('ix_books_public_created_at', 'books', ['created_at'], dict(postgresql_where=PUBLIC_BOOKS)),
+    ('ix_books_public_genre_created_at', 'books', ['genre_id', 'created_at'], dict(postgresql_where=PUBLIC_BOOKS)),
+    ('ix_books_moderation_queue', 'books', ['approval_status', 'created_at'], dict(postgresql_where=MODERATED_BOOKS)),
+    ('ix_exchanges_book_id_progress', 'exchanges', ['book_id', 'progress'], {}),
+    ('ix_exchanges_progress_created_at', 'exchanges', ['progress', 'created_at'], {}),
+    ('ix_book_events_user_book', 'book_events', ['user_id', 'book_id'], {}),
+    ('ix_book_events_book_created_at', 'book_events', ['book_id', 'created_at'], {}),
+    ('ix_book_events_created_at', 'book_events', ['created_at'], dict(postgresql_using='brin')),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, it can't run in a transaction.
+    # A build that failed halfway leaves an invalid index behind: drop it and run the upgrade again.
+    with op.get_context().autocommit_block():
+        for name, table, columns, options in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **options
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,54 @@
+"""add book_events.ingested_at for delta sync of likes
+
+Revision ID: c3e9a7d15f02
+Revises: b81f4c2d9e37
+Create Date: 2026-10-19 17:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e9a7d15f02'
+down_revision: Union[str, Sequence[str], None] = 'b81f4c2d9e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIKES = sa.text("interaction = 'LIKE'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default, no table rewrite: existing rows get the time of the upgrade,
+    # so the next delta sync of every user sends their likes once more.
+    op.add_column(
+        'book_events',
+        sa.Column('ingested_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_book_events_user_likes_ingested', 'book_events', ['user_id', 'ingested_at'], unique=False,
+            postgresql_where=LIKES, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_book_events_user_likes', table_name='book_events', postgresql_where=LIKES,
+            postgresql_concurrently=True, if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_book_events_user_likes', 'book_events', ['user_id', 'created_at'], unique=False,
+            postgresql_where=LIKES, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_book_events_user_likes_ingested', table_name='book_events', postgresql_where=LIKES,
+            postgresql_concurrently=True, if_exists=True,
+        )
+    op.drop_column('book_events', 'ingested_at')
@@ -1,27 +1,110 @@
+import logging
+import os
+from functools import wraps
+from typing import Awaitable, Callable
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from datetime import datetime, timedelta
 
+from core.config import Settings
+from database.redis import get_redis
+from database.relational_db.session import async_session, UoW
+from service.media import get_media_service
+from service.books import get_books_service
+from service.exchanges import get_exchanges_service
+from service.sync import get_sync_service
+
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+def once_per(job_id: str, seconds: float) -> Callable[[Job], Job]:
+    """
+    Every worker process schedules the jobs; the first one to claim a run does
+    it and the others skip. The claim expires shortly before the next run is due.
+    """
+    def decorator(job: Job) -> Job:
+        @wraps(job)
+        async def wrapper() -> None:
+            claimed = await get_redis().set(
+                f"scheduler:{job_id}", os.getpid(), nx=True, ex=max(int(seconds * 0.9), 1)
+            )
+            if claimed:
+                await job()
+        return wrapper
+    return decorator
+
+
+@once_per("media_gc", settings.MEDIA_GC_INTERVAL * 60)
+async def collect_media_garbage():
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            media_service = await get_media_service(uow)
+            removed = await media_service.collect_garbage()
+    if removed:
+        logger.info("Removed %d unreferenced media objects", removed)
+
+
+@once_per("media_orphans", settings.MEDIA_ORPHAN_SWEEP_INTERVAL * 60 * 60)
+async def sweep_media_orphans():
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            media_service = await get_media_service(uow)
+            report = await media_service.sweep_orphans(dry_run=not settings.MEDIA_ORPHAN_DELETE)
+    logger.info(
+        "Media orphan sweep%s: scanned %d, orphaned %d (%d bytes), deleted %d",
+        " (dry run)" if report.dry_run else "",
+        report.scanned, report.orphaned, report.orphaned_bytes, report.deleted,
+    )
 
-def example_scheduler():
-    pass
+
+@once_per("sync_tombstones", 24 * 60 * 60)
+async def prune_sync_tombstones():
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            book_service = await get_books_service(uow, await get_media_service(uow))
+            exchange_service = await get_exchanges_service(uow)
+            sync_service = await get_sync_service(uow, book_service, exchange_service)
+            pruned = await sync_service.prune_tombstones()
+    if pruned:
+        logger.info("Pruned %d sync tombstones", pruned)
 
 def init_scheduler():
     """
     Add all jobs to scheduler
     """
     scheduler = AsyncIOScheduler()
-    
+
     scheduler.add_job(
-        func=example_scheduler,
-        trigger="cron",
-        minute="*/10",
-        id="example",
-        next_run_time=datetime.now() + timedelta(seconds=3),
+        func=collect_media_garbage,
+        trigger="interval",
+        minutes=settings.MEDIA_GC_INTERVAL,
+        id="media_gc",
         max_instances=1,
         coalesce=True,
         misfire_grace_time=60,
     )
-    
-    # scheduler.start()
+
+    scheduler.add_job(
+        func=sweep_media_orphans,
+        trigger="interval",
+        hours=settings.MEDIA_ORPHAN_SWEEP_INTERVAL,
+        id="media_orphans",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60 * 60,
+    )
+
+    scheduler.add_job(
+        func=prune_sync_tombstones,
+        trigger="interval",
+        hours=24,
+        id="sync_tombstones",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60 * 60,
+    )
 
     return scheduler
@@ -1,11 +1,16 @@
+import argparse
 import asyncio
 import logging
+import os
 
 from core.config import configure_logging
+from core.storage import init_s3_client, close_s3_client
 from database.relational_db.session import async_session, wait_for_db, UoW
+from service.reference import publish_reference_update
 
 from .registry import SEEDERS
 from .books import BooksSeeder  # ensure registration
+from .bulk import DatasetSpec, run_bulk
 
 
 logger = logging.getLogger(__name__)
@@ -17,19 +22,62 @@ async def run_seeders() -> None:
         return
 
     await wait_for_db()
+    await init_s3_client()
 
-    for seeder_cls in SEEDERS:
-        seeder = seeder_cls()
-        logger.info("Running seeder: %s", seeder.name)
-        async with async_session() as session:
-            async with UoW(session) as uow:
-                inserted = await seeder.run(uow)
-        logger.info("Seeder %s completed. Inserted: %d", seeder.name, inserted)
+    try:
+        for seeder_cls in SEEDERS:
+            seeder = seeder_cls()
+            logger.info("Running seeder: %s", seeder.name)
+            async with async_session() as session:
+                async with UoW(session) as uow:
+                    inserted = await seeder.run(uow)
+            logger.info("Seeder %s completed. Inserted: %d", seeder.name, inserted)
+
+        # Running API workers reload genres, authors, cities, locations and languages
+        try:
+            await publish_reference_update()
+        except Exception as exc:
+            logger.warning("Could not announce reference data update: %s", exc)
+    finally:
+        await close_s3_client()
+
+
+async def run_bulk_seeder(spec: DatasetSpec, workers: int, reset: bool) -> None:
+    await wait_for_db()
+    await init_s3_client()
+    try:
+        await run_bulk(spec, workers, reset)
+    finally:
+        await close_s3_client()
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m seeders", description="Reference data and demo books.")
+    commands = parser.add_subparsers(dest="command")
+    bulk = commands.add_parser("bulk", help="Large synthetic dataset for load tests, see seeders/bulk.py")
+    bulk.add_argument("--users", type=int, default=DatasetSpec.users)
+    bulk.add_argument("--books", type=int, default=DatasetSpec.books)
+    bulk.add_argument("--events", type=int, default=DatasetSpec.events)
+    bulk.add_argument("--exchanges", type=int, default=DatasetSpec.exchanges)
+    bulk.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    bulk.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="COPY worker processes")
+    bulk.add_argument("--no-photos", action="store_true", help="Generated books get no photos")
+    bulk.add_argument("--reset", action="store_true", help="Delete previously generated rows first")
+    args = parser.parse_args()
+
     configure_logging()
-    asyncio.run(run_seeders())
+    if args.command == "bulk":
+        spec = DatasetSpec(
+            users=args.users,
+            books=args.books,
+            events=args.events,
+            exchanges=args.exchanges,
+            seed=args.seed,
+            photos=not args.no_photos,
+        )
+        asyncio.run(run_bulk_seeder(spec, args.workers, args.reset))
+    else:
+        asyncio.run(run_seeders())
 
 
 if __name__ == "__main__":
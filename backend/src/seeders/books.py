@@ -3,7 +3,6 @@ import logging
 from itertools import cycle
 from pathlib import Path
 from random import Random
-from uuid import uuid4
 
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
@@ -21,6 +20,7 @@ from database.relational_db import (
 from domain.books import Condition, ApprovalStatus
 from core.config import Settings, BASE_DIR
 from core.storage import MediaStorage
+from service.media import get_media_service
 from core.crypto import hash_password
 from .registry import BaseSeeder, register
 
@@ -108,6 +108,23 @@ SEED_ACCOUNTS = [
     },
 ]
 
+SEED_PHOTO_DIR = (
+    Path(settings.SEED_BOOK_PHOTOS_DIR)
+    if settings.SEED_BOOK_PHOTOS_DIR
+    else BASE_DIR / "seed_photos" / "books"
+)
+PHOTO_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".avif"}
+
+
+def collect_photos(photo_dir: Path) -> list[Path]:
+    if not photo_dir.exists():
+        return []
+    return sorted(
+        p
+        for p in photo_dir.iterdir()
+        if p.is_file() and p.suffix.lower() in PHOTO_SUFFIXES
+    )
+
 
 @register
 class BooksSeeder(BaseSeeder):
@@ -115,22 +132,9 @@ class BooksSeeder(BaseSeeder):
 
     async def run(self, uow: UoW) -> int:
         session = uow.session
-        photo_dir = (
-            Path(settings.SEED_BOOK_PHOTOS_DIR)
-            if settings.SEED_BOOK_PHOTOS_DIR
-            else BASE_DIR / "seed_photos" / "books"
-        )
-        def _collect_photos() -> list[Path]:
-            if not photo_dir.exists():
-                return []
-            return [
-                p
-                for p in photo_dir.iterdir()
-                if p.is_file()
-                and p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp", ".avif"}
-            ]
-
-        photo_files = await asyncio.to_thread(_collect_photos)
+        media_service = await get_media_service(uow)
+        photo_dir = SEED_PHOTO_DIR
+        photo_files = await asyncio.to_thread(collect_photos, photo_dir)
         if not photo_files:
             logger.info("No seed book photos found in %s.", photo_dir.resolve())
         else:
@@ -355,15 +359,20 @@ class BooksSeeder(BaseSeeder):
                 func.coalesce(func.array_length(Book.photo_urls, 1), 0) == 0
             )
             books_without_photos = (await session.execute(stmt)).scalars().all()
-            for book in books_without_photos:
-                photo_path = next(photo_cycle)
-                ext = photo_path.suffix.lower()
-                key = f"books/{book.id}/{uuid4()}{ext}"
-                try:
-                    url = await storage.upload_file_path(key, photo_path)
-                except Exception as exc:
-                    logger.warning("Failed to upload seed photo %s: %s", photo_path, exc)
-                    continue
+            def _read_photos() -> dict[Path, bytes]:
+                return {p: p.read_bytes() for p in photo_files}
+
+            # Identical files end up as one stored object referenced by every book
+            photo_bytes = await asyncio.to_thread(_read_photos)
+            chosen = [next(photo_cycle) for _ in books_without_photos]
+            try:
+                # References taken before a failure are rolled back with the savepoint
+                async with session.begin_nested():
+                    urls = await media_service.store_images([photo_bytes[p] for p in chosen])
+            except Exception as exc:
+                logger.warning("Failed to store seed photos: %s", exc)
+                urls = []
+            for book, url in zip(books_without_photos, urls):
                 book.photo_urls = [url]
                 photos_assigned += 1
 
@@ -0,0 +1,530 @@
+"""
+Bulk seeding of large synthetic datasets for load tests: users around the
+seeded exchange locations, their books, click / like / reserve events and
+exchanges. Rows are a pure function of `--seed` and the row number, so the
+same arguments always build the same dataset, whatever `--workers` is.
+
+Rows go in with COPY, in chunks spread over worker processes. Run the regular
+seeders first (genres, authors, languages, exchange locations); generated
+accounts share the password `load1234`. Popularity is skewed the way real
+traffic is: a few locations get most users, a few users own most books, a
+few books get most events.
+
+    python -m seeders bulk --users 100000 --books 1000000 --events 50000000 --workers 8
+    python -m seeders bulk --reset   # drop generated rows first
+
+Use a dedicated database for the full size, `--reset` deletes row by row.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from hashlib import blake2b
+from multiprocessing import get_context
+from pathlib import Path
+from random import Random
+from typing import Callable, Iterator, Sequence
+
+import asyncpg
+
+from core.config import Settings
+from core.crypto import hash_password
+from database.relational_db import MediaObjectsInterface
+from database.relational_db.session import async_session, UoW
+from service.media import get_media_service
+from .books import DESCRIPTION_TEMPLATES, SEED_PHOTO_DIR, collect_photos
+
+logger = logging.getLogger(__name__)
+settings = Settings()  # type: ignore
+
+LOAD_DOMAIN = "load.books.com"  # email-validator rejects reserved domains like .test
+LOAD_PASSWORD = "load1234"
+CHUNK = 100_000  # rows per generated (and copied) chunk, part of what the seed reproduces
+PASSWORD_HASHES = 4  # distinct salts, assigned round robin
+
+WORDS = [
+    "silent", "hidden", "forgotten", "golden", "midnight", "amber", "wandering", "crimson",
+    "shifting", "iron", "northern", "broken", "distant", "quiet", "burning", "winter",
+    "library", "archive", "garden", "compass", "chronicle", "river", "harbor", "lantern",
+    "mirror", "orchard", "kingdom", "voyage", "shadow", "letters", "island", "station",
+    "empire", "forest", "mountain", "city", "stranger", "daughter", "captain", "doctor",
+]
+CONDITIONS = ["NEW", "PERFECT", "GOOD", "NORMAL"]
+GENDERS = ["MALE", "FEMALE", "UNKNOWN"]
+PROGRESS = [("CREATED", 30), ("ACCEPTED", 20), ("FINISHED", 30), ("DECLINED", 10), ("CANCELED", 10)]
+
+USER_COLUMNS = (
+    "id", "email", "password_hash", "confirmed_at", "username", "gender", "language_code",
+    "city_id", "latitude", "longitude", "is_admin", "is_onboarded", "banned", "public",
+    "auth_version", "created_at",
+)
+BOOK_COLUMNS = (
+    "id", "owner_id", "author_id", "genre_id", "exchange_location_id", "title", "description",
+    "extra_terms", "language_code", "pages", "condition", "photo_urls", "is_available",
+    "approval_status", "created_at",
+)
+EVENT_COLUMNS = ("book_id", "user_id", "interaction", "created_at")
+EXCHANGE_COLUMNS = (
+    "id", "book_id", "owner_id", "requester_id", "exchange_location_id", "progress",
+    "meeting_time", "comment", "created_at", "updated_at",
+)
+INTEREST_COLUMNS = ("user_id", "genre_id", "coef", "created_at")
+FAVORITE_COLUMNS = ("user_id", "genre_id", "created_at")
+
+
+def load_email(n: int) -> str:
+    return f"user{n}@{LOAD_DOMAIN}"
+
+
+def database_dsn() -> str:
+    """`DATABASE_URL` without the SQLAlchemy driver suffix, for asyncpg"""
+    return settings.DATABASE_URL.replace("+asyncpg", "", 1)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    users: int = 100_000
+    books: int = 1_000_000
+    events: int = 50_000_000
+    exchanges: int = 20_000
+    seed: int = 1
+    photos: bool = True  # books share the seed photos, when there are any
+
+    @property
+    def now(self) -> datetime:
+        """Fixed clock, so timestamps are reproducible too"""
+        return datetime(2026, 1, 1, tzinfo=UTC)
+
+
+@dataclass
+class Reference:
+    """Rows the regular seeders own, generated rows point at them"""
+    author_ids: list[int]
+    genre_ids: list[int]
+    language_codes: list[str]
+    locations: list[tuple[int, int, float, float]]  # id, city_id, latitude, longitude
+
+    @classmethod
+    async def load(cls, conn: asyncpg.Connection) -> "Reference":
+        reference = cls(
+            author_ids=[r[0] for r in await conn.fetch("SELECT id FROM authors ORDER BY id")],
+            genre_ids=[r[0] for r in await conn.fetch("SELECT id FROM genres ORDER BY id")],
+            language_codes=[r[0] for r in await conn.fetch("SELECT code FROM languages ORDER BY code")],
+            locations=[
+                tuple(r) for r in await conn.fetch(
+                    "SELECT id, city_id, latitude, longitude FROM exchange_locations "
+                    "WHERE is_active ORDER BY id"
+                )
+            ],
+        )
+        if not (reference.author_ids and reference.genre_ids and reference.language_codes and reference.locations):
+            raise SystemExit("Authors, genres, languages and exchange locations are needed, run the seeders first")
+        return reference
+
+
+def _uuid(kind: str, seed: int, n: int) -> uuid.UUID:
+    digest = blake2b(f"{kind}:{seed}:{n}".encode(), digest_size=16).digest()
+    return uuid.UUID(bytes=digest, version=4)
+
+
+def _coprime(n: int, seed: int) -> int:
+    """Multiplier of a permutation of `range(n)`: i -> (i * a + b) % n"""
+    a = (0x9E3779B97F4A7C15 + seed * 2) % max(n, 1) or 1
+    while math.gcd(a, n) != 1:
+        a += 1
+    return a
+
+
+class Dataset:
+    """
+    Row generators of one `DatasetSpec`. Every generator covers a range of
+    row numbers, so chunks can be built (and loaded) in any order.
+    """
+    def __init__(self, spec: DatasetSpec, reference: Reference, password_hashes: list[str], photo_urls: list[str]):
+        self.spec = spec
+        self.ref = reference
+        self.password_hashes = password_hashes
+        self.photo_urls = photo_urls
+        seed = spec.seed
+
+        rng = Random(seed)
+        # Zipf-like popularity of exchange locations, in a seeded order
+        locations = list(reference.locations)
+        rng.shuffle(locations)
+        self._locations = locations
+        cumulative = _cumulative([1 / (rank + 1) ** 0.8 for rank in range(len(locations))])
+        self._homes = [
+            locations[_pick(cumulative, Random(f"home:{seed}:{n}").random())] for n in range(spec.users)
+        ]
+
+        self.user_ids = [_uuid("user", seed, n) for n in range(spec.users)]
+        self.book_ids = [_uuid("book", seed, n) for n in range(spec.books)]
+        # Popular books are spread over the table instead of being the first rows
+        self._book_order = _coprime(spec.books, seed)
+        self._like_order = _coprime(spec.users * spec.books, seed + 1)
+        self._exchange_order = _coprime(spec.books, seed + 2)
+
+    # Users
+
+    def home(self, n: int) -> tuple[int, int, float, float]:
+        """Exchange location a user lives near"""
+        return self._homes[n]
+
+    def users(self, start: int, stop: int) -> Iterator[tuple]:
+        seed, now = self.spec.seed, self.spec.now
+        for n in range(start, stop):
+            rng = Random(f"user:{seed}:{n}")
+            _, city_id, lat, lon = self.home(n)
+            created = now - timedelta(days=730 * rng.random() ** 2)
+            yield (
+                self.user_ids[n],
+                load_email(n),
+                self.password_hashes[n % len(self.password_hashes)],
+                created,
+                f"{rng.choice(WORDS).title()} reader {n}",
+                rng.choice(GENDERS),
+                rng.choice(self.ref.language_codes),
+                city_id,
+                lat + rng.gauss(0, 0.02),  # about 2 km around the location
+                lon + rng.gauss(0, 0.035),
+                False,
+                True,  # onboarded and not banned, so every account can log in and browse
+                False,
+                rng.random() < 0.7,
+                1,
+                created,
+            )
+
+    def genres_of(self, n: int) -> list[int]:
+        rng = Random(f"genres:{self.spec.seed}:{n}")
+        return rng.sample(self.ref.genre_ids, min(len(self.ref.genre_ids), rng.randint(1, 4)))
+
+    def interests(self, start: int, stop: int) -> Iterator[tuple]:
+        now = self.spec.now
+        for n in range(start, stop):
+            for rank, genre_id in enumerate(self.genres_of(n)):
+                yield self.user_ids[n], genre_id, round(1 / (rank + 1), 3), now
+
+    def favorites(self, start: int, stop: int) -> Iterator[tuple]:
+        now = self.spec.now
+        for n in range(start, stop):
+            for genre_id in self.genres_of(n)[:2]:
+                yield self.user_ids[n], genre_id, now
+
+    # Books
+
+    def owner_of(self, book: int) -> int:
+        """A quarter of the users own about half of the books"""
+        rng = Random(f"owner:{self.spec.seed}:{book}")
+        return int(self.spec.users * rng.random() ** 2)
+
+    def books(self, start: int, stop: int) -> Iterator[tuple]:
+        seed, now = self.spec.seed, self.spec.now
+        for n in range(start, stop):
+            rng = Random(f"book:{seed}:{n}")
+            owner = self.owner_of(n)
+            # Owners bring books to their own location, sometimes to another one
+            location = self.home(owner) if rng.random() < 0.8 else rng.choice(self._locations)
+            roll = rng.random()
+            status = "APPROVED" if roll < 0.9 else "PENDING" if roll < 0.97 else "REJECTED"
+            yield (
+                self.book_ids[n],
+                self.user_ids[owner],
+                rng.choice(self.ref.author_ids),
+                rng.choice(self.ref.genre_ids),
+                location[0],
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).capitalize(),
+                rng.choice(DESCRIPTION_TEMPLATES),
+                "load test",
+                rng.choice(self.ref.language_codes),
+                rng.randint(60, 900),
+                rng.choice(CONDITIONS),
+                [self.photo_urls[n % len(self.photo_urls)]] if self.photo_urls else [],
+                rng.random() < 0.85,
+                status,
+                now - timedelta(days=730 * rng.random() ** 1.5),
+            )
+
+    # Events
+
+    def popular_book(self, rng: Random) -> int:
+        rank = int(self.spec.books * rng.random() ** 3)
+        return rank * self._book_order % self.spec.books
+
+    def events(self, start: int, stop: int) -> Iterator[tuple]:
+        """
+        92% clicks, 6% likes (one per user and book, as the unique index wants),
+        2% reserves over the last 180 days, skewed to recent ones. Rows of a
+        chunk are ordered by time, as appends would leave them in the table.
+        """
+        spec, now = self.spec, self.spec.now
+        rng = Random(f"events:{spec.seed}:{start}")
+        pairs = spec.users * spec.books
+        rows: list[tuple] = []
+        for n in range(start, stop):
+            slot = n % 50
+            if slot < 3:
+                # Event numbers are unique, so are the (user, book) pairs they map to
+                pair = n * self._like_order % pairs
+                user, book, interaction = pair // spec.books, pair % spec.books, "LIKE"
+            else:
+                user = int(spec.users * rng.random() ** 1.5)
+                book = self.popular_book(rng)
+                interaction = "RESERVE" if slot == 3 else "CLICK"
+            rows.append((
+                self.book_ids[book],
+                self.user_ids[user],
+                interaction,
+                now - timedelta(seconds=180 * 86400 * rng.random() ** 1.3),
+            ))
+        rows.sort(key=lambda row: row[3])
+        return iter(rows)
+
+    # Exchanges
+
+    def exchanges(self, start: int, stop: int) -> Iterator[tuple]:
+        spec, now = self.spec, self.spec.now
+        statuses, weights = zip(*PROGRESS)
+        for n in range(start, stop):
+            rng = Random(f"exchange:{spec.seed}:{n}")
+            book = n * self._exchange_order % spec.books  # one exchange per book
+            owner = self.owner_of(book)
+            requester = (owner + 1 + rng.randrange(spec.users - 1)) % spec.users
+            created = now - timedelta(days=120 * rng.random())
+            progress = rng.choices(statuses, weights)[0]
+            yield (
+                _uuid("exchange", spec.seed, n),
+                self.book_ids[book],
+                self.user_ids[owner],
+                self.user_ids[requester],
+                self.home(owner)[0],
+                progress,
+                created + timedelta(days=rng.randint(1, 14)) if progress != "CREATED" else None,
+                None,
+                created,
+                created + timedelta(hours=rng.randint(1, 72)) if progress != "CREATED" else None,
+            )
+
+
+def _cumulative(weights: Sequence[float]) -> list[float]:
+    total, out = 0.0, []
+    for weight in weights:
+        total += weight
+        out.append(total)
+    return [value / total for value in out]
+
+
+def _pick(cumulative: list[float], roll: float) -> int:
+    lo, hi = 0, len(cumulative) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cumulative[mid] < roll:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+@dataclass(frozen=True)
+class TableLoad:
+    name: str
+    columns: tuple[str, ...]
+    rows: str  # `Dataset` generator, called with a range of row numbers
+    size: Callable[[DatasetSpec], int]  # row numbers to cover
+
+
+# Tables of a phase only reference tables of earlier phases and load in parallel
+PHASES = [
+    [TableLoad("users", USER_COLUMNS, "users", lambda spec: spec.users)],
+    [
+        TableLoad("user_interest", INTEREST_COLUMNS, "interests", lambda spec: spec.users),
+        TableLoad("user_favorite_genres", FAVORITE_COLUMNS, "favorites", lambda spec: spec.users),
+        TableLoad("books", BOOK_COLUMNS, "books", lambda spec: spec.books),
+    ],
+    [
+        TableLoad("exchanges", EXCHANGE_COLUMNS, "exchanges", lambda spec: min(spec.exchanges, spec.books)),
+        TableLoad("book_events", EVENT_COLUMNS, "events", lambda spec: spec.events),
+    ],
+]
+TABLES = {table.name: table for phase in PHASES for table in phase}
+
+# Counters the app keeps next to the events
+REBUILD_BOOK_STATS = """
+INSERT INTO book_stats (book_id, views, likes, reserves, created_at)
+SELECT e.book_id,
+       count(*) FILTER (WHERE e.interaction = 'CLICK'),
+       count(*) FILTER (WHERE e.interaction = 'LIKE'),
+       count(*) FILTER (WHERE e.interaction = 'RESERVE'),
+       now()
+FROM book_events e JOIN books b ON b.id = e.book_id
+WHERE b.extra_terms = 'load test'
+GROUP BY e.book_id
+ON CONFLICT (book_id) DO UPDATE
+SET views = excluded.views, likes = excluded.likes, reserves = excluded.reserves
+"""
+
+RESET = [
+    f"DELETE FROM book_events WHERE user_id IN (SELECT id FROM users WHERE email LIKE '%@{LOAD_DOMAIN}')",
+    f"DELETE FROM exchanges WHERE owner_id IN (SELECT id FROM users WHERE email LIKE '%@{LOAD_DOMAIN}')",
+    f"DELETE FROM users WHERE email LIKE '%@{LOAD_DOMAIN}'",
+]
+
+
+# Worker process state, set up once by `_init_worker`
+_worker: dict = {}
+
+
+def _init_worker(spec: DatasetSpec, reference: Reference, password_hashes: list[str], photo_urls: list[str]) -> None:
+    loop = asyncio.new_event_loop()
+    conn = loop.run_until_complete(
+        asyncpg.connect(database_dsn(), server_settings={"synchronous_commit": "off"})
+    )
+    _worker.update(loop=loop, conn=conn, dataset=Dataset(spec, reference, password_hashes, photo_urls))
+
+
+def _copy_chunk(table_name: str, start: int, stop: int) -> int:
+    """COPY one chunk in a worker process, returns the number of rows written"""
+    table = TABLES[table_name]
+    rows = list(getattr(_worker["dataset"], table.rows)(start, stop))
+    _worker["loop"].run_until_complete(
+        _worker["conn"].copy_records_to_table(table.name, records=rows, columns=table.columns)
+    )
+    return len(rows)
+
+
+class Progress:
+    """
+    Row numbers covered per table, logged at most every `interval` seconds.
+    Rates count rows written, a user covers several interest rows.
+    """
+    def __init__(self, totals: dict[str, int], interval: float = 5):
+        self.totals = totals
+        self.covered = dict.fromkeys(totals, 0)
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.interval = interval
+        self._logged = 0.0
+
+    def add(self, table: str, covered: int, rows: int) -> None:
+        self.covered[table] += covered
+        self.rows += rows
+        now = time.perf_counter()
+        done, total = sum(self.covered.values()), sum(self.totals.values())
+        if now - self._logged < self.interval and done < total:
+            return
+        self._logged = now
+        elapsed = now - self.started
+        eta = elapsed * (total - done) / done if done else 0
+        logger.info(
+            "%s: %s rows, %s rows/s, %.0f s left",
+            ", ".join(f"{name} {self.covered[name] * 100 // max(self.totals[name], 1)}%" for name in self.totals),
+            f"{self.rows:,}", f"{self.rows / max(elapsed, 1e-9):,.0f}", eta,
+        )
+
+
+async def _password_hashes() -> list[str]:
+    return list(await asyncio.gather(*(hash_password(LOAD_PASSWORD) for _ in range(PASSWORD_HASHES))))
+
+
+async def _store_photos(spec: DatasetSpec, photo_dir: Path) -> tuple[list[str], list[str]]:
+    """
+    Uploads every distinct seed photo once, concurrently, returns their urls
+    and content digests. Books reference them round robin.
+    """
+    if not spec.photos:
+        return [], []
+    files = await asyncio.to_thread(collect_photos, photo_dir)
+    blobs = {hashlib.sha256(data).hexdigest(): data for data in await asyncio.gather(
+        *(asyncio.to_thread(path.read_bytes) for path in files)
+    )}
+    if not blobs:
+        return [], []
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            media_service = await get_media_service(uow)
+            urls = await media_service.store_images(list(blobs.values()))
+    logger.info("Stored %d distinct seed photos", len(urls))
+    return urls, list(blobs)
+
+
+async def _reference_photos(spec: DatasetSpec, digests: list[str]) -> None:
+    """One media reference per book using a photo, `_store_photos` took the first"""
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            media_repo = MediaObjectsInterface(uow.session)
+            for i, digest in enumerate(digests):
+                books = len(range(i, spec.books, len(digests)))
+                if books > 1:
+                    await media_repo.acquire(digest, books - 1)
+
+
+async def _release_photos(conn: asyncpg.Connection) -> None:
+    """Drops the media references of generated books before `RESET` deletes them"""
+    counts = await conn.fetch(
+        "SELECT url, count(*) AS books FROM books, unnest(photo_urls) AS url "
+        "WHERE extra_terms = 'load test' GROUP BY url"
+    )
+    if not counts:
+        return
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            media_service = await get_media_service(uow)
+            for url, books in counts:
+                await media_service.release([url] * books)
+
+
+async def run_bulk(spec: DatasetSpec, workers: int, reset: bool = False, photo_dir: Path | None = None) -> None:
+    conn = await asyncpg.connect(database_dsn())
+    try:
+        if reset:
+            await _release_photos(conn)
+            for statement in RESET:
+                started = time.perf_counter()
+                status = await conn.execute(statement)
+                logger.info("%s in %.1f s", status, time.perf_counter() - started)
+        reference = await Reference.load(conn)
+    finally:
+        await conn.close()
+
+    password_hashes, (photo_urls, photo_digests) = await asyncio.gather(
+        _password_hashes(), _store_photos(spec, photo_dir or SEED_PHOTO_DIR)
+    )
+
+    loop = asyncio.get_running_loop()
+    rows, started = 0, time.perf_counter()
+    with ProcessPoolExecutor(
+        workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(spec, reference, password_hashes, photo_urls),
+    ) as pool:
+        for phase in PHASES:
+            progress = Progress({table.name: table.size(spec) for table in phase})
+            chunks = [
+                (table.name, stop - start, loop.run_in_executor(pool, _copy_chunk, table.name, start, stop))
+                for table in phase
+                for start in range(0, table.size(spec), CHUNK)
+                for stop in [min(start + CHUNK, table.size(spec))]
+            ]
+            for name, covered, chunk in chunks:
+                progress.add(name, covered, await chunk)
+            rows += progress.rows
+
+    elapsed = time.perf_counter() - started
+    logger.info("Copied %s rows in %.1f s, %s rows/s", f"{rows:,}", elapsed, f"{rows / elapsed:,.0f}")
+
+    if photo_digests:
+        await _reference_photos(spec, photo_digests)
+    conn = await asyncpg.connect(database_dsn())
+    try:
+        started = time.perf_counter()
+        await conn.execute(REBUILD_BOOK_STATS)
+        await conn.execute("ANALYZE")
+        logger.info("Rebuilt book_stats and analyzed in %.1f s", time.perf_counter() - started)
+    finally:
+        await conn.close()
@@ -9,13 +9,15 @@ from database.relational_db import (
     BookEventsInterface,
 )
 from .books_service import BookService
+from ..media import MediaService, get_media_service
 
 
 async def get_books_service(
     uow: UoW = Depends(get_uow),
+    media_service: MediaService = Depends(get_media_service),
 ) -> BookService:
     genres_repo = GenresInterface(uow.session)
     books_repo = BooksInterface(uow.session)
     authors_repo = AuthorsInterface(uow.session)
     events_repo = BookEventsInterface(uow.session)
-    return BookService(uow, genres_repo, books_repo, authors_repo, events_repo)
+    return BookService(uow, genres_repo, books_repo, authors_repo, events_repo, media_service)
@@ -1,11 +1,14 @@
+import asyncio
 import logging
 
-from uuid import UUID, uuid4
+from uuid import UUID
+from datetime import datetime
+from typing import AsyncIterator
 from fastapi import UploadFile, HTTPException, status
 
 from domain.books import ApprovalStatus
 from core.config import Settings, is_debug_mode
-from core.storage import MediaStorage
+from core.http import make_etag
 from database.relational_db import (
     Book,
     BooksInterface,
@@ -17,11 +20,21 @@ from database.relational_db import (
     Genre,
     BookEventsInterface,
 )
-from domain.books import BookCreate, BookPatch
+from domain.books import (
+    BookCreate,
+    BookPatch,
+    ImportFormat,
+    BookImportError,
+    BookImportReport,
+)
 from domain.statistics import Interaction
+from domain.common import DirectUploadRequest, DirectUpload
+from ..media import MediaService
+from ..reference import get_snapshot
+from .importing import read_batches, validate_row, staging_record
+from .exceptions import ImportTooLarge
 
 logger = logging.getLogger(__name__)
-storage = MediaStorage()
 settings = Settings()  # type: ignore
 
 class BookService:
@@ -32,12 +45,14 @@ class BookService:
         books_repo: BooksInterface,
         authors_repo: AuthorsInterface,
         events_repo: BookEventsInterface,
+        media_service: MediaService,
     ):
         self.genre_repo = genre_repo
         self.books_repo = books_repo
         self.uow = uow
         self.authors_repo = authors_repo
         self.events_repo = events_repo
+        self.media_service = media_service
 
     async def list_genres(self):
         genres = await self.genre_repo.list_all()
@@ -85,6 +100,13 @@ class BookService:
         
         return book
     
+    async def book_detail_etag(self, book_id: UUID, user: User) -> str:
+        """Validator of `get_book_detail` for this user, computed without loading the book"""
+        version = await self.books_repo.detail_version(book_id, user.id)
+        if version is None:
+            raise HTTPException(404, detail='Book with this `book_id` not found')
+        return make_etag('book', book_id, *version, user.latitude, user.longitude)
+
     async def get_author(self, author_id: int) -> Author | None:
         return await self.authors_repo.by_id(author_id)
     
@@ -103,42 +125,96 @@ class BookService:
         await self.uow.session.refresh(book)
         return book
         
-    async def add_photos(
+    async def import_books(
         self,
-        book_id: UUID,
-        files: list[UploadFile],
-        user: User
-    ) -> Book:
+        chunks: AsyncIterator[bytes],
+        fmt: ImportFormat,
+        user: User,
+    ) -> BookImportReport:
+        """
+        Bulk `create_book`: rows are validated in chunks against the reference
+        snapshot, COPYed into a staging table and merged into `books` at once.
+        Invalid rows are reported and skipped, the rest is imported in one transaction.
+        """
+        snapshot = await get_snapshot()
+        approval = ApprovalStatus.APPROVED if is_debug_mode(settings) else ApprovalStatus.PENDING
+        received = failed = 0
+        errors: list[BookImportError] = []
+
+        def reject(row_no: int, messages: list[str]) -> None:
+            nonlocal failed
+            failed += 1
+            if len(errors) < settings.BOOK_IMPORT_MAX_ERRORS:
+                errors.append(BookImportError(row=row_no, errors=messages))
+
+        await self.books_repo.create_import_staging()
+        async for batch in read_batches(chunks, fmt, settings.BOOK_IMPORT_CHUNK):
+            if received + len(batch) > settings.BOOK_IMPORT_MAX_ROWS:
+                raise ImportTooLarge(settings.BOOK_IMPORT_MAX_ROWS)
+            records = []
+            for row in batch:
+                received += 1
+                book, messages = validate_row(row, snapshot)
+                if book is None:
+                    reject(received, messages)
+                else:
+                    records.append(staging_record(received, book))
+            await self.books_repo.copy_to_import_staging(records)
+            await asyncio.sleep(0)
+
+        for row_no in await self.books_repo.merge_import_staging(user.id, approval):
+            reject(row_no, ["referenced author, genre, language or location no longer exists"])
+        await self.uow.commit()
+
+        errors.sort(key=lambda e: e.row)
+        return BookImportReport(
+            received=received,
+            imported=received - failed,
+            failed=failed,
+            errors=errors,
+        )
+
+    async def _owned_book(self, book_id: UUID, user: User) -> Book:
         book = await self.books_repo.by_id(book_id)
         if book is None:
             raise HTTPException(status.HTTP_404_NOT_FOUND, "Book with this id not found")
         if book.owner_id != user.id:
             raise HTTPException(status.HTTP_403_FORBIDDEN, "You don't own this item")
+        return book
+
+    async def add_photos(
+        self,
+        book_id: UUID,
+        files: list[UploadFile],
+        user: User
+    ) -> Book:
+        book = await self._owned_book(book_id, user)
+
+        urls = await self.media_service.store_uploads(files)
+        await self.media_service.release(book.photo_urls)
+
+        book.photo_urls = urls
+        return book
+
+    async def presign_photos(
+        self,
+        book_id: UUID,
+        requests: list[DirectUploadRequest],
+        user: User
+    ) -> list[DirectUpload]:
+        await self._owned_book(book_id, user)
+        return await self.media_service.presign_uploads(requests, user)
+
+    async def finalize_photos(
+        self,
+        book_id: UUID,
+        keys: list[str],
+        user: User
+    ) -> Book:
+        book = await self._owned_book(book_id, user)
 
-        if not storage.s3_enabled:
-            await storage.clear_prefix(f"books/{book_id}")
-
-        urls: list[str] = []
-        content_type_map = {
-            "image/jpeg": ".jpg",
-            "image/png": ".png",
-            "image/webp": ".webp",
-            "image/avif": ".avif",
-        }
-        for f in files:
-            ext = content_type_map.get(f.content_type or "")
-            if ext is None:
-                logger.error(f"Incorrect media type uploaded: {f.content_type}")
-                raise HTTPException(
-                    status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                    detail="Only jpg / png / webp / avif allowed",
-                )
-
-            name = f"{uuid4()}{ext}"
-
-            key = f"books/{book_id}/{name}"
-            url = await storage.upload_uploadfile(key, f)
-            urls.append(url)
+        urls = await self.media_service.store_direct_uploads(keys, user)
+        await self.media_service.release(book.photo_urls)
 
         book.photo_urls = urls
         return book
@@ -181,6 +257,15 @@ class BookService:
         await self._apply_user_flags(books, user)
         return books
 
+    async def user_books_etag(self, user: User, limit: int) -> str:
+        version = await self.books_repo.user_books_version(user.id)
+        return make_etag('books:my', user.id, user.updated_at, limit, *version)
+
+    async def list_changed_books(self, user: User, since: datetime | None):
+        books = await self.books_repo.changed_user_books(user.id, since)
+        await self._apply_user_flags(books, user)
+        return books
+
     async def list_user_books(self, user: User, limit: int):
         books = await self.books_repo.list_user_books(user.id, limit)
         await self._apply_user_flags(books, user)
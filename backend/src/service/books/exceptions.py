@@ -1 +1,13 @@
 from fastapi import HTTPException
+
+class InvalidImportFile(HTTPException):
+    def __init__(self, detail: str = 'Import file could not be read'):
+        super().__init__(status_code=400, detail=detail)
+
+class UnsupportedImportFormat(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=415, detail='Send text/csv or application/x-ndjson, or pass `format`')
+
+class ImportTooLarge(HTTPException):
+    def __init__(self, max_rows: int):
+        super().__init__(status_code=413, detail=f'Import is limited to {max_rows} rows, split the file')
@@ -0,0 +1,124 @@
+import csv
+import codecs
+from typing import AsyncIterator
+from uuid import uuid4
+
+from pydantic import TypeAdapter, ValidationError
+
+from domain.books import BookCreate, ImportFormat
+from ..reference.reference_service import ReferenceSnapshot
+from .exceptions import InvalidImportFile
+
+_book_adapter = TypeAdapter(BookCreate)
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines, line endings kept."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    try:
+        async for chunk in chunks:
+            *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+            for line in lines:
+                yield line + "\n"
+        tail += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise InvalidImportFile("File is not valid UTF-8") from exc
+    if tail:
+        yield tail
+
+
+async def _csv_batches(chunks: AsyncIterator[bytes], size: int) -> AsyncIterator[list[dict]]:
+    header: list[str] | None = None
+    record = ""
+    batch: list[str] = []
+    async for line in _lines(chunks):
+        record += line
+        # A quoted field may contain newlines: the record ends once quotes are balanced
+        if record.count('"') % 2:
+            continue
+        line, record = record, ""
+        if not line.strip():
+            continue
+        if header is None:
+            header = [name.strip() for name in next(csv.reader([line]))]
+            continue
+        batch.append(line)
+        if len(batch) >= size:
+            yield _parse_csv(batch, header)
+            batch = []
+    if record:
+        batch.append(record)
+    if batch and header is not None:
+        yield _parse_csv(batch, header)
+
+
+def _parse_csv(lines: list[str], header: list[str]) -> list[dict]:
+    # Empty cells are missing values, unknown columns are ignored
+    return [
+        {key: value or None for key, value in row.items() if key}
+        for row in csv.DictReader(lines, fieldnames=header)
+    ]
+
+
+async def _ndjson_batches(chunks: AsyncIterator[bytes], size: int) -> AsyncIterator[list[str]]:
+    batch: list[str] = []
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        batch.append(line)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_batches(chunks: AsyncIterator[bytes], fmt: ImportFormat, size: int) -> AsyncIterator[list]:
+    """Rows of an uploaded CSV (with header) or NDJSON file, `size` at a time."""
+    if fmt is ImportFormat.CSV:
+        return _csv_batches(chunks, size)
+    return _ndjson_batches(chunks, size)
+
+
+def validate_row(row: dict | str, snapshot: ReferenceSnapshot) -> tuple[BookCreate | None, list[str]]:
+    """Schema check plus foreign keys against the in-process reference snapshot."""
+    try:
+        if isinstance(row, str):
+            book = _book_adapter.validate_json(row)
+        else:
+            book = _book_adapter.validate_python(row)
+    except ValidationError as exc:
+        return None, [
+            f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+            for err in exc.errors(include_url=False)
+        ]
+
+    errors = []
+    if book.author_id not in snapshot.author_ids:
+        errors.append("author_id: unknown author")
+    if book.genre_id not in snapshot.genre_ids:
+        errors.append("genre_id: unknown genre")
+    if book.language_code not in snapshot.language_codes:
+        errors.append("language_code: unknown language")
+    if book.exchange_location_id not in snapshot.location_ids:
+        errors.append("exchange_location_id: unknown exchange location")
+    return (None, errors) if errors else (book, [])
+
+
+def staging_record(row_no: int, book: BookCreate) -> tuple:
+    """Row in `IMPORT_STAGING_COLUMNS` order"""
+    return (
+        row_no,
+        uuid4(),
+        book.author_id,
+        book.genre_id,
+        book.exchange_location_id,
+        book.title,
+        book.description,
+        book.extra_terms,
+        book.language_code,
+        book.pages,
+        book.condition.name,
+        book.is_available,
+    )
@@ -5,6 +5,7 @@ from datetime import datetime
 from fastapi import HTTPException
 
 from core.config import Settings, is_debug_mode
+from core.http import make_etag
 from database.relational_db import (
     UoW,
     BooksInterface,
@@ -129,6 +130,18 @@ class ExchangeService:
         exchanges = await self.ex_repo.by_owner(user.id, only_active, limit)
         return exchanges
 
+    async def list_changed(self, user: User, since: datetime | None):
+        return await self.ex_repo.changed_for_user(user.id, since)
+
+    async def exchange_etag(self, exchange_id: UUID, user: User) -> str:
+        version = await self.ex_repo.version(exchange_id)
+        if version is None:
+            raise HTTPException(404, detail='Exchange with this `exchange_id` not found.')
+        owner_id, requester_id, *stamps = version
+        if user.id not in (owner_id, requester_id):
+            raise HTTPException(403, detail='You dont have access to this resource')
+        return make_etag('exchange', exchange_id, *stamps)
+
     async def get_exchange(self, exchange_id: UUID, user: User):
         exchange = await self._ensure_exchange(exchange_id)
         if not(exchange.owner_id == user.id or exchange.requester_id == user.id):
@@ -0,0 +1,5 @@
+from .export_service import ExportService, MEDIA_TYPES
+
+
+async def get_export_service() -> ExportService:
+    return ExportService()
@@ -0,0 +1,9 @@
+from fastapi import HTTPException
+
+class InvalidExportCursor(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=400, detail='`after` must be an id of the exported table')
+
+class ParquetUnavailable(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=501, detail='Parquet export needs pyarrow installed on the server')
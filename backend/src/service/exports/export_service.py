@@ -0,0 +1,216 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from pydantic_core import to_json
+from sqlalchemy import Table, types
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from core.config import Settings
+from database.relational_db import BookEvent, Book, Exchange, ExportsInterface
+from database.relational_db.session import IDLE_IN_TRANSACTION_TIMEOUT, STATEMENT_TIMEOUT, async_session
+from domain.admin import ExportDataset, ExportFormat
+from .exceptions import InvalidExportCursor, ParquetUnavailable
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is disabled
+    pa = None
+    pq = None
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+EXPORT_TABLES: dict[ExportDataset, Table] = {
+    ExportDataset.BOOK_EVENTS: BookEvent.__table__,  # type: ignore
+    ExportDataset.BOOKS: Book.__table__,  # type: ignore
+    ExportDataset.EXCHANGES: Exchange.__table__,  # type: ignore
+}
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Value as it appears in CSV / Parquet cells"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+class _NdjsonEncoder:
+    def __init__(self, table: Table):
+        pass
+
+    def encode(self, rows: list) -> bytes:
+        return b"".join(to_json(dict(row)) + b"\n" for row in rows)
+
+    def close(self) -> bytes:
+        return b""
+
+
+class _CsvEncoder:
+    def __init__(self, table: Table):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.writer.writerow(table.c.keys())
+
+    def _cell(self, value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, list):
+            return json.dumps(value, ensure_ascii=False)
+        return _plain(value)
+
+    def encode(self, rows: list) -> bytes:
+        self.writer.writerows([self._cell(v) for v in row.values()] for row in rows)
+        data = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def close(self) -> bytes:
+        return self.encode([])
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands written bytes over instead of keeping them"""
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _arrow_type(column_type: types.TypeEngine) -> "pa.DataType":
+    if isinstance(column_type, ARRAY):
+        return pa.list_(_arrow_type(column_type.item_type))
+    if isinstance(column_type, types.Boolean):
+        return pa.bool_()
+    if isinstance(column_type, types.Integer):
+        return pa.int64()
+    if isinstance(column_type, types.DateTime):
+        return pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+    return pa.string()  # text, uuid, enums
+
+
+class _ParquetEncoder:
+    """One row group per batch, flushed as soon as it is written; the footer comes with `close`"""
+    def __init__(self, table: Table):
+        self.schema = pa.schema([(c.name, _arrow_type(c.type)) for c in table.columns])
+        self.sink = _Sink()
+        self.writer = pq.ParquetWriter(self.sink, self.schema, compression="zstd")
+
+    def encode(self, rows: list) -> bytes:
+        if rows:
+            batch = [{key: _plain(value) for key, value in row.items()} for row in rows]
+            self.writer.write_table(pa.Table.from_pylist(batch, schema=self.schema))
+        return self.sink.drain()
+
+    def close(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+ENCODERS = {
+    ExportFormat.NDJSON: _NdjsonEncoder,
+    ExportFormat.CSV: _CsvEncoder,
+    ExportFormat.PARQUET: _ParquetEncoder,
+}
+
+
+class ExportService:
+    """
+    Streams whole tables for analytics. It opens its own session: the response
+    body is produced after request dependencies (and their session) are closed.
+    """
+    def parse_cursor(self, dataset: ExportDataset, after: str | None) -> Any:
+        if after is None:
+            return None
+        (pk,) = EXPORT_TABLES[dataset].primary_key.columns
+        try:
+            return int(after) if isinstance(pk.type, types.Integer) else UUID(after)
+        except ValueError:
+            raise InvalidExportCursor()
+
+    def export(
+        self,
+        dataset: ExportDataset,
+        fmt: ExportFormat,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        after: str | None = None,
+        gzip: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        Validates the request eagerly, so errors surface before the response starts,
+        and returns the body. Rows come in primary key order: to resume a broken
+        download pass the last received `id` as `after`.
+        """
+        if fmt is ExportFormat.PARQUET and pa is None:
+            raise ParquetUnavailable()
+        return self._stream(
+            EXPORT_TABLES[dataset], fmt, since, until, self.parse_cursor(dataset, after), gzip
+        )
+
+    async def _stream(
+        self,
+        table: Table,
+        fmt: ExportFormat,
+        since: datetime | None,
+        until: datetime | None,
+        after: Any,
+        gzip: bool,
+    ) -> AsyncIterator[bytes]:
+        encoder = ENCODERS[fmt](table)
+        compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if gzip else None
+
+        def _encode(rows: list, final: bool = False) -> bytes:
+            data = encoder.encode(rows) if not final else encoder.close()
+            if compressor is not None:
+                data = compressor.compress(data) + (compressor.flush() if final else b"")
+            return data
+
+        exported = 0
+        async with async_session() as session:
+            # Large tables take longer than the per-statement default, and the
+            # transaction sits idle while a slow client drains the previous batch
+            session.info[STATEMENT_TIMEOUT] = 0
+            session.info[IDLE_IN_TRANSACTION_TIMEOUT] = 0
+            rows = ExportsInterface(session).stream_rows(
+                table, since=since, until=until, after=after, batch_size=settings.EXPORT_BATCH_SIZE
+            )
+            async for batch in rows:
+                # Encoding and compression run in a thread, the event loop keeps serving requests
+                if data := await asyncio.to_thread(_encode, batch):
+                    yield data
+                exported += len(batch)
+        yield await asyncio.to_thread(_encode, [], True)
+        logger.info("Exported %d rows of %s", exported, table.name)
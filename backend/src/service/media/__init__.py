@@ -0,0 +1,19 @@
+from fastapi import Depends
+
+from database.relational_db import (
+    get_uow,
+    UoW,
+    MediaObjectsInterface,
+    BooksInterface,
+    UserInterface,
+)
+from .media_service import MediaService
+
+
+async def get_media_service(
+    uow: UoW = Depends(get_uow),
+) -> MediaService:
+    media_repo = MediaObjectsInterface(uow.session)
+    books_repo = BooksInterface(uow.session)
+    user_repo = UserInterface(uow.session)
+    return MediaService(uow, media_repo, books_repo, user_repo)
@@ -0,0 +1,13 @@
+from fastapi import HTTPException
+
+class UnsupportedMediaType(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=415, detail='Only jpg / png / webp / avif allowed')
+
+class DirectUploadsDisabled(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=409, detail='Direct uploads are not available, upload files with multipart form')
+
+class UploadNotFound(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=404, detail='Upload not found or expired')
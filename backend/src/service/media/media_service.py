@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import logging
+import mimetypes
+from collections import Counter
+from uuid import uuid4
+from datetime import datetime, timedelta, UTC
+from pathlib import Path, PurePosixPath
+
+from fastapi import UploadFile
+
+from core.config import Settings
+from core.storage import MediaStorage, MediaTooLarge, SpooledUpload
+from core.images import (
+    ALLOWED_CONTENT_TYPES,
+    IMAGE_VARIANTS,
+    render_variants,
+    sniff_content_type,
+    variant_key,
+)
+from domain.admin import OrphanReport
+from domain.common import DirectUploadRequest, DirectUpload
+from database.relational_db import UoW, User, MediaObjectsInterface, BooksInterface, UserInterface
+from .exceptions import UnsupportedMediaType, DirectUploadsDisabled, UploadNotFound
+
+logger = logging.getLogger(__name__)
+storage = MediaStorage()
+settings = Settings()  # type: ignore
+
+MEDIA_PREFIX = "media"
+UPLOADS_PREFIX = "uploads"
+ORPHAN_SAMPLE_SIZE = 100
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _remove(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _original_key(prefix: str, source: bytes | Path) -> str:
+    """Key of the upload as it came, named after its sniffed type"""
+    if isinstance(source, Path):
+        with source.open("rb") as f:
+            head = f.read(16)
+    else:
+        head = source[:16]
+    content_type = sniff_content_type(head)
+    extension = mimetypes.guess_extension(content_type) if content_type else None
+    return f"{prefix}/original{extension or ''}"
+
+
+def _owner_key(key: str) -> str:
+    """Key whose url is stored in the database: variants hang off their full image."""
+    path = PurePosixPath(key)
+    if path.stem in IMAGE_VARIANTS:
+        return str(path.with_stem("full"))
+    return key
+
+
+class MediaService:
+    """
+    Content-addressed images: every distinct upload is rendered and stored once
+    under `media/{sha256}/`, records count the urls pointing at it.
+    """
+    def __init__(
+        self,
+        uow: UoW,
+        media_repo: MediaObjectsInterface,
+        books_repo: BooksInterface,
+        user_repo: UserInterface,
+    ):
+        self.uow = uow
+        self.media_repo = media_repo
+        self.books_repo = books_repo
+        self.user_repo = user_repo
+
+    async def store_uploads(self, files: list[UploadFile]) -> list[str]:
+        for f in files:
+            if f.content_type not in ALLOWED_CONTENT_TYPES:
+                logger.error(f"Incorrect media type uploaded: {f.content_type}")
+                raise UnsupportedMediaType
+        # One file at a time, copied to disk in chunks and hashed on the way: memory holds
+        # a chunk, not the photos, and the image workers read the copies themselves
+        spooled: list[SpooledUpload] = []
+        try:
+            for f in files:
+                spooled.append(await storage.spool_uploadfile(f))
+            return await self._store([(s.digest, s.path, s.size) for s in spooled])
+        finally:
+            await asyncio.to_thread(_remove, [s.path for s in spooled])
+
+    async def presign_uploads(self, requests: list[DirectUploadRequest], user: User) -> list[DirectUpload]:
+        """Issue PUT urls so files go straight to the bucket, skipping the API workers."""
+        if not storage.s3_enabled:
+            raise DirectUploadsDisabled
+        for r in requests:
+            if r.content_type not in ALLOWED_CONTENT_TYPES:
+                raise UnsupportedMediaType
+            if r.size > settings.MAX_PHOTO_SIZE * 1024 * 1024:
+                raise MediaTooLarge(settings.MAX_PHOTO_SIZE)
+
+        async def _presign(r: DirectUploadRequest) -> DirectUpload:
+            key = f"{UPLOADS_PREFIX}/{user.id}/{uuid4()}"
+            url = await storage.presign_put(key, r.content_type, r.size, settings.PRESIGNED_UPLOAD_TTL)
+            return DirectUpload(
+                key=key,
+                url=url,
+                headers={"Content-Type": r.content_type, "Content-Length": str(r.size)},
+                expires_in=settings.PRESIGNED_UPLOAD_TTL,
+            )
+
+        return list(await asyncio.gather(*(_presign(r) for r in requests)))
+
+    async def store_direct_uploads(self, keys: list[str], user: User) -> list[str]:
+        """
+        Verify finished direct uploads (size, magic bytes) and store them like
+        regular ones. Staging objects are removed, the rest is left to the orphan sweep.
+        """
+        if not storage.s3_enabled:
+            raise DirectUploadsDisabled
+        if any(not k.startswith(f"{UPLOADS_PREFIX}/{user.id}/") for k in keys):
+            raise UploadNotFound
+
+        blobs = await asyncio.gather(*(storage.fetch(k) for k in keys))
+        for data in blobs:
+            if data is None:
+                raise UploadNotFound
+            if sniff_content_type(data) is None:
+                raise UnsupportedMediaType
+
+        urls = await self.store_images(blobs)
+        await storage.delete_keys(keys)
+        return urls
+
+    async def store_images(self, blobs: list[bytes]) -> list[str]:
+        """Returns url of the full variant for every image, in order."""
+        digests = await asyncio.gather(*(asyncio.to_thread(_digest, b) for b in blobs))
+        return await self._store([(digest, data, len(data)) for digest, data in zip(digests, blobs)])
+
+    async def _store(self, images: list[tuple[str, bytes | Path, int]]) -> list[str]:
+        """`(digest, content or local file, size)` of every image, urls of their full variants in order"""
+        keys: dict[str, list[str]] = {}
+        missing: dict[str, tuple[bytes | Path, int]] = {}
+        refs: Counter[str] = Counter()
+        # One statement at a time, the session is shared
+        for digest, source, size in images:
+            if digest in missing:
+                refs[digest] += 1
+            elif digest not in keys:
+                stored = await self.media_repo.acquire(digest)
+                if stored is None:
+                    missing[digest] = (source, size)
+                    refs[digest] += 1
+                else:
+                    keys[digest] = stored
+            else:
+                await self.media_repo.acquire(digest)
+
+        if missing:
+            rendered = await asyncio.gather(*(render_variants(source) for source, _ in missing.values()))
+            uploads: list[tuple[str, bytes | Path]] = []
+            for (digest, (source, _)), variants in zip(missing.items(), rendered):
+                prefix = f"{MEDIA_PREFIX}/{digest}"
+                keys[digest] = [variant_key(prefix, name) for name in IMAGE_VARIANTS]
+                uploads.extend((variant_key(prefix, name), data) for name, data in variants.items())
+                if settings.MEDIA_KEEP_ORIGINALS:
+                    # Streamed from the spooled copy, multipart on S3 past `S3_PART_SIZE`
+                    original = await asyncio.to_thread(_original_key, prefix, source)
+                    keys[digest].append(original)
+                    uploads.append((original, source))
+            await storage.upload_many(uploads)
+
+            for digest, (_, size) in missing.items():
+                await self.media_repo.add(digest, keys[digest], size, refs[digest])
+
+        return [storage.url_for(keys[digest][0]) for digest, _, _ in images]
+
+    async def release(self, urls: list[str]) -> None:
+        """
+        Drop references held by `urls`. Content becomes collectable once nothing
+        references it; urls outside of `media/` are left to the orphan sweep.
+        """
+        refs: Counter[str] = Counter()
+        for url in urls:
+            key = storage.key_for(url)
+            if key is None or not key.startswith(f"{MEDIA_PREFIX}/"):
+                continue
+            refs[key.split("/")[1]] += 1
+        for digest, count in refs.items():
+            await self.media_repo.release(digest, count)
+
+    async def collect_garbage(self) -> int:
+        """Delete content unreferenced for `MEDIA_GC_GRACE` seconds, returns number of objects removed."""
+        older_than = datetime.now(UTC) - timedelta(seconds=settings.MEDIA_GC_GRACE)
+        removed = 0
+        while True:
+            batches = await self.media_repo.pop_unreferenced(older_than, settings.MEDIA_GC_BATCH)
+            if not batches:
+                break
+            # Rows stay locked until storage is cleaned up, a failure rolls them back
+            await storage.delete_keys([key for keys in batches for key in keys])
+            await self.uow.commit()
+            removed += len(batches)
+            if len(batches) < settings.MEDIA_GC_BATCH:
+                break
+        return removed
+
+    async def _find_orphans(self, page: list[tuple[str, int]]) -> list[tuple[str, int]]:
+        by_digest: dict[str, list[tuple[str, int]]] = {}
+        by_key: dict[str, list[tuple[str, int]]] = {}
+        for key, size in page:
+            if key.startswith(f"{MEDIA_PREFIX}/"):
+                by_digest.setdefault(key.split("/")[1], []).append((key, size))
+            else:
+                by_key.setdefault(_owner_key(key), []).append((key, size))
+
+        alive_digests = await self.media_repo.existing(list(by_digest)) if by_digest else set()
+        alive_keys: set[str] = set()
+        if by_key:
+            # Urls in the database may carry an older base url, only the key part is compared
+            keys = list(by_key)
+            alive_keys |= await self.books_repo.referenced_photo_keys(keys)
+            alive_keys |= await self.user_repo.referenced_avatar_keys(keys)
+
+        orphans = [obj for d, objs in by_digest.items() if d not in alive_digests for obj in objs]
+        orphans.extend(obj for k, objs in by_key.items() if k not in alive_keys for obj in objs)
+        return orphans
+
+    async def sweep_orphans(self, dry_run: bool = True) -> OrphanReport:
+        """
+        Walk the whole storage page by page and delete objects nothing points at:
+        uploads of failed requests, replaced photos from before content addressing.
+        Objects younger than `MEDIA_GC_GRACE` are skipped, they may belong to an
+        upload that is not committed yet.
+        """
+        older_than = datetime.now(UTC) - timedelta(seconds=settings.MEDIA_GC_GRACE)
+        report = OrphanReport(dry_run=dry_run)
+        async for page in storage.list_objects(older_than):
+            report.scanned += len(page)
+            orphans = await self._find_orphans(page)
+            # Don't keep one transaction open for the whole walk
+            await self.uow.commit()
+            if not orphans:
+                continue
+
+            report.orphaned += len(orphans)
+            report.orphaned_bytes += sum(size for _, size in orphans)
+            free = ORPHAN_SAMPLE_SIZE - len(report.sample)
+            report.sample.extend(key for key, _ in orphans[:free])
+            if dry_run:
+                continue
+
+            await storage.delete_keys([key for key, _ in orphans])
+            report.deleted += len(orphans)
+            await asyncio.sleep(len(orphans) / settings.MEDIA_ORPHAN_DELETE_RATE)
+        return report
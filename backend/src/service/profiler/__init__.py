@@ -0,0 +1,6 @@
+from database.redis import get_redis
+from .profiler_service import ProfilerService
+
+
+async def get_profiler_service() -> ProfilerService:
+    return ProfilerService(get_redis())
@@ -0,0 +1,9 @@
+from fastapi import HTTPException
+
+class ProfilerBusy(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=409, detail='This worker is being profiled already, try again later')
+
+class ProfileNotFound(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=404, detail='No profile for this ticket, the request was not sent yet or it expired')
@@ -0,0 +1,49 @@
+import asyncio
+import secrets
+import threading
+from datetime import datetime, UTC
+
+from redis.asyncio import Redis
+
+from core import profiler
+from core.config import Settings
+from core.middlewares.profiler import PROFILE_HEADER, result_key, ticket_key
+from domain.admin import ProfileMode, ProfileTicket
+from .exceptions import ProfilerBusy, ProfileNotFound
+
+settings = Settings()  # type: ignore
+
+
+class ProfilerService:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    async def profile_worker(self, seconds: float, mode: ProfileMode) -> str:
+        """Collapsed stacks of this worker's event loop over the next `seconds`"""
+        try:
+            sampler = await profiler.profile_worker(
+                seconds, settings.PROFILER_INTERVAL, cpu=mode is ProfileMode.CPU
+            )
+        except profiler.ProfilerBusy:
+            raise ProfilerBusy
+        return sampler.collapsed()
+
+    async def issue_ticket(self, mode: ProfileMode) -> ProfileTicket:
+        token = secrets.token_urlsafe(16)
+        await self.redis.set(ticket_key(token), mode.value, ex=settings.PROFILER_TICKET_TTL)
+        return ProfileTicket(
+            token=token, header=PROFILE_HEADER, mode=mode, expires_in=settings.PROFILER_TICKET_TTL
+        )
+
+    async def request_profile(self, token: str) -> str:
+        collapsed = await self.redis.get(result_key(token))
+        if collapsed is None:
+            raise ProfileNotFound
+        return collapsed.decode()
+
+    def task_dump(self) -> str:
+        """Pending tasks of this worker, then the dumps recorded by `capture_stall`"""
+        dumps = [profiler.dump_tasks(asyncio.get_running_loop(), threading.get_ident())]
+        for at, dump in reversed(profiler.stalls):
+            dumps.append(f"Stall at {datetime.fromtimestamp(at, UTC).isoformat()}\n{dump}")
+        return "\n\n".join(dumps)
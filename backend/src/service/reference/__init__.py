@@ -0,0 +1,11 @@
+from .reference_service import (
+    ReferenceService,
+    get_snapshot,
+    init_reference_data,
+    close_reference_data,
+    publish_reference_update,
+)
+
+
+async def get_reference_service() -> ReferenceService:
+    return ReferenceService(await get_snapshot())
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from database.redis import get_redis
+from database.relational_db import (
+    User,
+    GenresInterface,
+    AuthorsInterface,
+    CitiesInterface,
+    ExchangeLocationsInterface,
+    LanguagesInterface,
+)
+from database.relational_db.session import async_session
+from domain.books import GenreModel, AuthorModel
+from domain.geo import CityModel, ExchangeLocation
+from domain.misc import LanguageModel
+from utils import distance_km
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "reference:version"
+UPDATES_CHANNEL = "reference:updated"
+LISTENER_RETRY = 5  # in seconds
+
+
+@dataclass(frozen=True, slots=True)
+class Payload:
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, body: bytes) -> "Payload":
+        return cls(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+@dataclass(frozen=True, slots=True)
+class Location:
+    json: bytes
+    city_id: int
+    latitude: float
+    longitude: float
+    is_active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Language:
+    json: bytes
+    name_ru: str  # casefolded
+    name_en: str  # casefolded
+
+
+@dataclass(frozen=True, slots=True)
+class ReferenceSnapshot:
+    """Immutable copy of the reference tables, swapped as a whole on reload."""
+    version: int
+    genres: Payload
+    authors: Payload
+    cities: Payload
+    locations: tuple[Location, ...]  # id order
+    languages: tuple[Language, ...]  # code order
+    languages_by_length: tuple[Language, ...]  # same order as the database search
+    languages_page: Payload  # an empty search returns the first 50
+    # Foreign key targets, for validating bulk writes without a query
+    genre_ids: frozenset[int]
+    author_ids: frozenset[int]
+    location_ids: frozenset[int]
+    language_codes: frozenset[str]
+
+
+def _join(items: list[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
+
+
+async def _load(version: int) -> ReferenceSnapshot:
+    async with async_session() as session:
+        genres = await GenresInterface(session).list_all()
+        authors = await AuthorsInterface(session).list_all()
+        cities = await CitiesInterface(session).list_all()
+        locations = await ExchangeLocationsInterface(session).list_all()
+        languages = await LanguagesInterface(session).list_all()
+
+    def _dump(adapter: TypeAdapter, rows: list) -> bytes:
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    location_adapter = TypeAdapter(ExchangeLocation)
+    language_adapter = TypeAdapter(LanguageModel)
+    language_rows = tuple(
+        Language(
+            json=language_adapter.dump_json(language_adapter.validate_python(l, from_attributes=True)),
+            name_ru=l.name_ru.casefold(),
+            name_en=l.name_en.casefold(),
+        )
+        for l in languages
+    )
+    return ReferenceSnapshot(
+        version=version,
+        genres=Payload.of(_dump(TypeAdapter(list[GenreModel]), genres)),
+        authors=Payload.of(_dump(TypeAdapter(list[AuthorModel]), authors)),
+        cities=Payload.of(_dump(TypeAdapter(list[CityModel]), cities)),
+        locations=tuple(
+            Location(
+                json=location_adapter.dump_json(location_adapter.validate_python(loc, from_attributes=True)),
+                city_id=loc.city_id,
+                latitude=loc.latitude,
+                longitude=loc.longitude,
+                is_active=loc.is_active,
+            )
+            for loc in locations
+        ),
+        languages=language_rows,
+        languages_by_length=tuple(sorted(language_rows, key=lambda l: len(l.name_ru))),
+        languages_page=Payload.of(_join([l.json for l in language_rows[:50]])),
+        genre_ids=frozenset(g.id for g in genres),
+        author_ids=frozenset(a.id for a in authors),
+        location_ids=frozenset(loc.id for loc in locations),
+        language_codes=frozenset(l.code for l in languages),
+    )
+
+
+_snapshot: ReferenceSnapshot | None = None
+_listener: asyncio.Task | None = None
+_reload_lock = asyncio.Lock()
+
+
+async def _current_version(redis: Redis) -> int:
+    return int(await redis.get(VERSION_KEY) or 0)
+
+
+async def reload_reference_data(version: int | None = None) -> ReferenceSnapshot:
+    global _snapshot
+    async with _reload_lock:
+        if version is None:
+            version = await _current_version(get_redis())
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = await _load(version)
+            logger.info("Loaded reference data snapshot v%d", version)
+        return _snapshot
+
+
+async def get_snapshot() -> ReferenceSnapshot:
+    return _snapshot or await reload_reference_data()
+
+
+async def _listen() -> None:
+    redis = get_redis()
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(UPDATES_CHANNEL)
+                # Anything published while we were not subscribed
+                await reload_reference_data()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        await reload_reference_data(int(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except (RedisError, OSError) as exc:
+            logger.warning("Reference data listener lost Redis: %s", exc)
+        except Exception:
+            logger.exception("Reference data reload failed")
+        await asyncio.sleep(LISTENER_RETRY)
+
+
+async def init_reference_data() -> None:
+    """Load the snapshot and keep it in sync with `publish_reference_update` calls."""
+    global _listener
+    await reload_reference_data()
+    if _listener is None:
+        _listener = asyncio.create_task(_listen())
+
+
+async def close_reference_data() -> None:
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.cancel()
+    try:
+        await listener
+    except asyncio.CancelledError:
+        pass
+
+
+async def publish_reference_update() -> None:
+    """Call after changing genres, authors, cities, locations or languages."""
+    redis = get_redis()
+    version = await redis.incr(VERSION_KEY)
+    await redis.publish(UPDATES_CHANNEL, version)
+
+
+class ReferenceService:
+    """Reads reference tables from the in-process snapshot, never from the database."""
+    def __init__(self, snapshot: ReferenceSnapshot):
+        self.snapshot = snapshot
+
+    def genres(self) -> Payload:
+        return self.snapshot.genres
+
+    def authors(self) -> Payload:
+        return self.snapshot.authors
+
+    def cities(self) -> Payload:
+        return self.snapshot.cities
+
+    def languages(self, q: str | None, limit: int) -> Payload:
+        if not q:
+            return self.snapshot.languages_page
+
+        needle = q.casefold()
+        found: list[bytes] = []
+        for lang in self.snapshot.languages_by_length:
+            if needle in lang.name_ru or needle in lang.name_en:
+                found.append(lang.json)
+                if len(found) == limit:
+                    break
+        return Payload.of(_join(found))
+
+    def locations(self, user: User, filter: bool, limit: int) -> bytes:
+        rows = self.snapshot.locations
+        if not filter:
+            return _join([loc.json for loc in rows[:limit]])
+
+        rows = [
+            loc for loc in rows
+            if loc.is_active and (user.city_id is None or loc.city_id == user.city_id)
+        ]
+        if user.latitude is not None and user.longitude is not None:
+            rows.sort(key=lambda loc: distance_km(user.latitude, user.longitude, loc.latitude, loc.longitude))
+        return _join([loc.json for loc in rows[:limit]])
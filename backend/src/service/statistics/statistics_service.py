@@ -1,7 +1,10 @@
 from uuid import UUID
+from collections import defaultdict
+from datetime import datetime, timedelta, UTC
 from fastapi import HTTPException
 
 from core.config import Settings
+from core.metrics import INTERACTION_LAG
 from database.relational_db import (
     UoW,
     User,
@@ -11,10 +14,16 @@ from database.relational_db import (
     BookStatsInterface,
     UserInterface,
 )
-from domain.statistics import Interaction
+from domain.statistics import Interaction, InteractionItem, InteractionBatchResult
 
 settings = Settings() # type: ignore
 
+EVENT_COEF = {
+    Interaction.CLICK: 1,
+    Interaction.LIKE: 3,
+    Interaction.RESERVE: 5
+}
+
 class StatService:
     def __init__(
         self,
@@ -38,23 +47,85 @@ class StatService:
         user: User, 
         interaction: Interaction
     ):
-        event_coef = {
-            Interaction.CLICK: 1,
-            Interaction.LIKE: 3,
-            Interaction.RESERVE: 5
-        }
-        
         book = await self.book_repo.by_id(book_id)
         if book is None:
             raise HTTPException(404, 'Book with this id not found')
         
         event_id = await self.be_repo.record_event(book_id, user.id, interaction)
         if event_id is None:
-            await self.ui_repo.edit_coef(-event_coef[interaction], book.genre_id, user.id)  
+            await self.ui_repo.edit_coef(-EVENT_COEF[interaction], book.genre_id, user.id)  
         else:
-            await self.ui_repo.edit_coef(event_coef[interaction], book.genre_id, user.id)  
+            await self.ui_repo.edit_coef(EVENT_COEF[interaction], book.genre_id, user.id)  
             await self.bs_repo.update_book_interaction(book_id, interaction)
 
+    async def record_interactions(
+        self,
+        items: list[InteractionItem],
+        user: User,
+    ) -> InteractionBatchResult:
+        """
+        Same outcome as `record_interaction` for every item in order, in a fixed
+        number of statements: a like toggles, un-liking only lowers the interest.
+        Items for unknown books are dropped instead of failing the whole batch.
+        """
+        now = datetime.now(UTC)
+        oldest = now - timedelta(seconds=settings.INTERACTION_TS_MAX_AGE)
+
+        book_ids = list({item.book_id for item in items})
+        genres = await self.book_repo.genre_ids(book_ids)
+        skipped = [book_id for book_id in book_ids if book_id not in genres]
+        items = [item for item in items if item.book_id in genres]
+
+        liked_before = await self.be_repo.liked_book_ids(
+            user.id, list({i.book_id for i in items if i.interaction == Interaction.LIKE})
+        )
+        liked = set(liked_before)
+        liked_at: dict[UUID, datetime] = {}
+        coefs: dict[int, float] = defaultdict(float)
+        counters: dict[UUID, dict] = {}
+        events: list[dict] = []
+
+        for item in items:
+            ts = item.ts or now
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=UTC)
+            if item.ts is not None:
+                INTERACTION_LAG.observe(max((now - ts).total_seconds(), 0))
+            ts = min(max(ts, oldest), now)
+            genre_id = genres[item.book_id]
+            counter = counters.setdefault(
+                item.book_id, dict(book_id=item.book_id, views=0, likes=0, reserves=0)
+            )
+
+            if item.interaction == Interaction.CLICK:
+                events.append(
+                    dict(book_id=item.book_id, user_id=user.id, interaction=Interaction.CLICK, created_at=ts)
+                )
+                coefs[genre_id] += EVENT_COEF[Interaction.CLICK]
+                counter['views'] += 1
+            elif item.book_id in liked:
+                liked.discard(item.book_id)
+                coefs[genre_id] -= EVENT_COEF[Interaction.LIKE]
+            else:
+                liked.add(item.book_id)
+                liked_at[item.book_id] = ts
+                coefs[genre_id] += EVENT_COEF[Interaction.LIKE]
+                counter['likes'] += 1
+
+        # A like that was toggled off (and maybe on again) loses its old row
+        await self.be_repo.delete_likes(
+            user.id, [book_id for book_id in liked_before if book_id not in liked or book_id in liked_at]
+        )
+        events.extend(
+            dict(book_id=book_id, user_id=user.id, interaction=Interaction.LIKE, created_at=ts)
+            for book_id, ts in liked_at.items() if book_id in liked
+        )
+        await self.be_repo.add_many(events)
+        await self.ui_repo.edit_coefs({g: c for g, c in coefs.items() if c}, user.id)
+        await self.bs_repo.add_counters([c for c in counters.values() if c['views'] or c['likes']])
+
+        return InteractionBatchResult(recorded=len(items), skipped=skipped)
+
     async def set_interests(self, genre_ids: set[int], user: User):
         coef = 5 # Adjustable
         records = [
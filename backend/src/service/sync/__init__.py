@@ -0,0 +1,21 @@
+from fastapi import Depends
+
+from database.relational_db import (
+    get_uow,
+    UoW,
+    BookEventsInterface,
+    SyncTombstonesInterface,
+)
+from .sync_service import SyncService
+from ..books import BookService, get_books_service
+from ..exchanges import ExchangeService, get_exchanges_service
+
+
+async def get_sync_service(
+    uow: UoW = Depends(get_uow),
+    book_service: BookService = Depends(get_books_service),
+    exchange_service: ExchangeService = Depends(get_exchanges_service),
+) -> SyncService:
+    events_repo = BookEventsInterface(uow.session)
+    tombstones_repo = SyncTombstonesInterface(uow.session)
+    return SyncService(uow, book_service, exchange_service, events_repo, tombstones_repo)
@@ -0,0 +1,5 @@
+from fastapi import HTTPException
+
+class InvalidSyncToken(HTTPException):
+    def __init__(self, *args, **kwargs):
+        super().__init__(status_code=400, detail='Sync token is malformed, sync again without `since`')
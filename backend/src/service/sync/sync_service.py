@@ -0,0 +1,98 @@
+import base64
+import binascii
+import logging
+from datetime import datetime, timedelta, UTC
+
+from core.config import Settings
+from database.relational_db import (
+    UoW,
+    User,
+    BookEventsInterface,
+    SyncTombstonesInterface,
+)
+from domain.sync import SyncDeleted, SyncResponse
+from ..books import BookService
+from ..exchanges import ExchangeService
+from .exceptions import InvalidSyncToken
+
+settings = Settings()  # type: ignore
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION = "v1"
+
+
+def encode_token(watermark: datetime) -> str:
+    micros = int(watermark.timestamp() * 1_000_000)
+    return base64.urlsafe_b64encode(f"{TOKEN_VERSION}:{micros}".encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> datetime:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        version, micros = raw.split(":")
+        if version != TOKEN_VERSION:
+            raise ValueError(version)
+        return datetime.fromtimestamp(int(micros) / 1_000_000, UTC)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidSyncToken() from exc
+
+
+class SyncService:
+    def __init__(
+        self,
+        uow: UoW,
+        book_service: BookService,
+        exchange_service: ExchangeService,
+        events_repo: BookEventsInterface,
+        tombstones_repo: SyncTombstonesInterface,
+    ):
+        self.uow = uow
+        self.book_service = book_service
+        self.exchange_service = exchange_service
+        self.events_repo = events_repo
+        self.tombstones_repo = tombstones_repo
+
+    async def sync(self, user: User, token: str | None) -> SyncResponse:
+        """
+        Everything of `user` changed since `token`, or a full snapshot for a first sync
+        and for tokens older than the tombstone retention.
+        The window is widened by `SYNC_OVERLAP` so rows committed by transactions
+        still running at the previous sync are not missed. The watermark comes from
+        the database clock, read before any of the rows.
+        """
+        now = await self.tombstones_repo.watermark()
+        since = decode_token(token) if token else None
+        if since is not None and since < now - timedelta(days=settings.SYNC_TOMBSTONE_TTL):
+            since = None
+
+        after = since - timedelta(seconds=settings.SYNC_OVERLAP) if since is not None else None
+        books = await self.book_service.list_changed_books(user, after)
+        exchanges = await self.exchange_service.list_changed(user, after)
+        likes = await self.events_repo.likes_since(user.id, after)
+
+        deleted = SyncDeleted()
+        if after is not None:
+            buckets = {'book': deleted.books, 'exchange': deleted.exchanges, 'like': deleted.likes}
+            for tombstone in await self.tombstones_repo.since(user.id, after):
+                buckets[tombstone.entity].append(tombstone.entity_id)
+            # A like toggled off and on again within the window is live
+            liked = {like.book_id for like in likes}
+            deleted.likes = [book_id for book_id in deleted.likes if book_id not in liked]
+
+        return SyncResponse.model_validate(
+            dict(
+                token=encode_token(now),
+                reset=since is None,
+                books=books,
+                exchanges=exchanges,
+                likes=likes,
+                deleted=deleted,
+            ),
+            from_attributes=True,
+        )
+
+    async def prune_tombstones(self) -> int:
+        before = datetime.now(UTC) - timedelta(days=settings.SYNC_TOMBSTONE_TTL)
+        pruned = await self.tombstones_repo.prune(before)
+        await self.uow.commit()
+        return pruned
@@ -11,10 +11,12 @@ from database.relational_db import (
     RolesInterface
 )
 from .user_service import UserService
+from ..media import MediaService, get_media_service
 
 
 async def get_user_service(
     uow: UoW = Depends(get_uow),
+    media_service: MediaService = Depends(get_media_service),
 ) -> UserService:
     user_repo = UserInterface(uow.session)
     ug_repo = UserGenreInterface(uow.session)
@@ -23,4 +25,4 @@ async def get_user_service(
     lang_repo = LanguagesInterface(uow.session)
     role_repo = RolesInterface(uow.session)
     
-    return UserService(uow, user_repo, ug_repo, genres_repo, cities_repo, lang_repo, role_repo)
+    return UserService(uow, user_repo, ug_repo, genres_repo, cities_repo, lang_repo, role_repo, media_service)
@@ -1,12 +1,12 @@
 from datetime import date, datetime
 
-from uuid import UUID, uuid4
+from uuid import UUID
 from fastapi import UploadFile, status, HTTPException
 
 from core.config import Settings, is_debug_mode
-from core.storage import MediaStorage
 from domain.users import UserPatch, Gender
 from domain.roles import RoleModel
+from domain.common import DirectUploadRequest, DirectUpload
 from database.relational_db import (
     UoW,
     UserInterface, 
@@ -19,8 +19,8 @@ from database.relational_db import (
     Role
 )
 from .exceptions import IncorrectGenreId, IncorrectCityId
+from ..media import MediaService
 
-storage = MediaStorage()
 settings = Settings()  # type: ignore
 
 class UserService:
@@ -33,6 +33,7 @@ class UserService:
         cities_repo: CitiesInterface,
         lang_repo: LanguagesInterface,
         role_repo: RolesInterface,
+        media_service: MediaService,
     ):
         self.uow = uow
         self.user_repo = user_repo
@@ -41,6 +42,7 @@ class UserService:
         self.cities_repo = cities_repo
         self.lang_repo = lang_repo
         self.role_repo = role_repo
+        self.media_service = media_service
         
     async def get_user(self, user_id: UUID | str) -> User | None:
         return await self.user_repo.get_by_id(user_id)
@@ -87,25 +89,28 @@ class UserService:
         file: UploadFile,
         user: User
     ) -> None:
-        content_type_map = {
-            "image/jpeg": ".jpg",
-            "image/png": ".png",
-            "image/webp": ".webp",
-            "image/avif": ".avif",
-        }
-        ext = content_type_map.get(file.content_type or "")
-        if ext is None:
-            raise HTTPException(
-                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                detail="Only jpg / png / webp / avif allowed",
-            )
-        name = f"{uuid4()}{ext}"
-        if not storage.s3_enabled:
-            await storage.clear_prefix(f"users/{user.id}")
+        [url] = await self.media_service.store_uploads([file])
+        await self._replace_picture(url, user)
+
+    async def presign_picture(
+        self,
+        request: DirectUploadRequest,
+        user: User
+    ) -> DirectUpload:
+        [upload] = await self.media_service.presign_uploads([request], user)
+        return upload
 
-        key = f"users/{user.id}/{name}"
-        url = await storage.upload_uploadfile(key, file)
+    async def finalize_picture(
+        self,
+        key: str,
+        user: User
+    ) -> None:
+        [url] = await self.media_service.store_direct_uploads([key], user)
+        await self._replace_picture(url, user)
 
+    async def _replace_picture(self, url: str, user: User) -> None:
+        if user.avatar_url:
+            await self.media_service.release([user.avatar_url])
         user.avatar_url = url
 
     async def nearby(self, user: User, radius_km: int):
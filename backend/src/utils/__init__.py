@@ -1 +1 @@
-from .nearest_point import dist_expression
+from .nearest_point import dist_expression, distance_km
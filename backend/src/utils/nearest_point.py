@@ -1,3 +1,4 @@
+import math
 from sqlalchemy import func
 
 
@@ -18,3 +19,14 @@ def dist_expression(
     )
     
     return dist_expr
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Same Haversine distance as `dist_expression`, for rows already in memory"""
+    earth_radius = 6371
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    cos_angle = (
+        math.cos(lat1) * math.cos(lat2) * math.cos(lon2 - lon1)
+        + math.sin(lat1) * math.sin(lat2)
+    )
+    return earth_radius * math.acos(max(-1.0, min(1.0, cos_angle)))
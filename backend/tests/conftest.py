@@ -0,0 +1,77 @@
+"""
+Shared fixtures. Tests touching the app or the database expect the same
+environment as the API itself (`DATABASE_URL`, `REDIS_URL`, JWT keys) with
+migrations applied; users they create are removed afterwards.
+"""
+from contextlib import AbstractContextManager
+from typing import AsyncIterator, Callable
+from uuid import uuid4
+
+import httpx
+import pytest
+from pytest_asyncio import is_async_test
+from sqlalchemy import delete
+
+from core.middlewares.query_stats import QueryStats, count_queries
+from database.redis import CacheRepo, get_redis
+from database.relational_db import User
+from database.relational_db.session import async_session, engine
+from main import app as api
+from service.auth import TokenService
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    # The engine pool and the Redis client outlive a test, so every test shares one loop
+    marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(marker, append=False)
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """
+    Fails the test when the block runs more statements than allowed:
+
+        with query_budget(4):
+            await client.get("/api/v1/books/my", headers=auth_headers)
+    """
+    def _budget(budget: int) -> AbstractContextManager[QueryStats]:
+        return count_queries(budget=budget)
+
+    return _budget
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def _connections() -> AsyncIterator[None]:
+    yield
+    await engine.dispose()
+    await get_redis().aclose()
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    # No lifespan: the scheduler, watchdog and S3 client stay off
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def user() -> AsyncIterator[User]:
+    async with async_session() as session:
+        user = User(email=f"{uuid4().hex}@tests.local", password_hash="-", is_onboarded=True)
+        session.add(user)
+        await session.commit()
+
+    yield user
+
+    async with async_session() as session:
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+@pytest.fixture
+async def auth_headers(user: User) -> dict[str, str]:
+    access, _, _ = await TokenService(CacheRepo(get_redis()), None).issue_tokens(user)  # type: ignore[arg-type]
+    return {"Authorization": f"Bearer {access}"}
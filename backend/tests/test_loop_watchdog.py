@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+from core import profiler
+from core.watchdog import LoopWatchdog
+
+
+def planted_blocking_call(seconds: float) -> None:
+    time.sleep(seconds)  # what a sync filesystem or HTTP call does to the loop
+
+
+async def _busy(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0)
+
+
+async def test_reports_the_blocking_call_once():
+    profiler.stalls.clear()
+    watchdog = LoopWatchdog(interval=0.01, threshold=0.05)
+    watchdog.start()
+    await _busy(0.1)
+    planted_blocking_call(0.3)
+    await _busy(0.1)
+    await watchdog.stop()
+
+    assert watchdog.stalls == 1
+    assert len(profiler.stalls) == 1
+    _, dump = profiler.stalls[-1]
+    assert "planted_blocking_call" in dump
+
+
+async def test_short_callbacks_are_not_reported():
+    watchdog = LoopWatchdog(interval=0.01, threshold=0.05)
+    watchdog.start()
+    await _busy(0.3)
+    await watchdog.stop()
+
+    assert watchdog.stalls == 0
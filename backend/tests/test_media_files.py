@@ -0,0 +1,20 @@
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from core.storage import MediaFiles
+from core.storage.media import PARTIAL_SUFFIX
+
+
+async def test_files_being_streamed_are_not_served(tmp_path):
+    (tmp_path / "full.webp").write_bytes(b"done")
+    (tmp_path / f"medium.webp{PARTIAL_SUFFIX}").write_bytes(b"half")
+    app = Starlette(routes=[Mount("/media", MediaFiles(directory=str(tmp_path)))])
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        done = await client.get("/media/full.webp")
+        partial = await client.get(f"/media/medium.webp{PARTIAL_SUFFIX}")
+
+    assert done.status_code == 200
+    assert done.headers["cache-control"].endswith("immutable")
+    assert partial.status_code == 404
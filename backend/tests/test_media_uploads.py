@@ -0,0 +1,83 @@
+import hashlib
+import io
+import os
+import tracemalloc
+
+import pytest
+from PIL import Image
+from starlette.datastructures import Headers, UploadFile
+
+from core.images import shutdown_image_pool
+from core.storage import MediaTooLarge
+from core.storage import media as storage_module
+from database.relational_db import UoW
+from database.relational_db.session import async_session
+from service.media import get_media_service
+from service.media import media_service
+from service.media.media_service import storage
+
+
+def _upload(data: bytes, content_type: str = "image/png") -> UploadFile:
+    return UploadFile(io.BytesIO(data), size=len(data), headers=Headers({"content-type": content_type}))
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch):
+    path = tmp_path / "spool"
+    path.mkdir()
+    monkeypatch.setattr(storage_module.settings, "UPLOAD_SPOOL_DIR", str(path))
+    return path
+
+
+async def test_spool_holds_one_chunk_in_memory(spool_dir):
+    data = os.urandom(4 * 1024 * 1024)
+    chunk = storage_module.settings.UPLOAD_CHUNK_SIZE * 1024
+    upload = _upload(data)
+    # The first read imports and starts the thread pool behind `UploadFile`
+    (await storage.spool_uploadfile(_upload(b"warm up"))).path.unlink()
+
+    tracemalloc.start()
+    try:
+        spooled = await storage.spool_uploadfile(upload)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 3 * chunk
+    assert spooled.size == len(data)
+    assert spooled.digest == hashlib.sha256(data).hexdigest()
+    assert spooled.path.parent == spool_dir
+    assert spooled.path.read_bytes() == data
+    spooled.path.unlink()
+
+
+async def test_spool_stops_at_the_size_limit(spool_dir):
+    with pytest.raises(MediaTooLarge):
+        await storage.spool_uploadfile(_upload(os.urandom(2 * 1024 * 1024)), max_size_mb=1)
+    assert not list(spool_dir.iterdir())
+
+
+async def test_store_uploads_renders_from_the_spooled_copy(spool_dir, tmp_path, monkeypatch):
+    media_dir = tmp_path / "media"
+    monkeypatch.setattr(storage_module.settings, "MEDIA_DIR", str(media_dir))
+    monkeypatch.setattr(storage, "_s3_enabled", False)
+    monkeypatch.setattr(media_service.settings, "MEDIA_KEEP_ORIGINALS", True)
+
+    out = io.BytesIO()
+    Image.effect_noise((640, 480), 64).convert("RGB").save(out, format="PNG")
+    data = out.getvalue()
+    digest = hashlib.sha256(data).hexdigest()
+
+    try:
+        async with async_session() as session:
+            svc = await get_media_service(UoW(session))
+            [url] = await svc.store_uploads([_upload(data)])
+            await session.rollback()
+    finally:
+        shutdown_image_pool()
+
+    assert url.endswith(f"media/{digest}/full.webp")
+    stored = {p.name for p in (media_dir / "media" / digest).iterdir()}
+    assert stored == {"full.webp", "medium.webp", "thumb.webp", "original.png"}
+    assert (media_dir / "media" / digest / "original.png").read_bytes() == data
+    assert not list(spool_dir.iterdir())
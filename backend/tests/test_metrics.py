@@ -0,0 +1,24 @@
+import httpx
+import pytest
+
+from core.security import settings
+
+
+async def test_metrics_closed_without_token(client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+
+    response = await client.get("/metrics", headers={"Authorization": "Bearer anything"})
+
+    assert response.status_code == 404
+
+
+async def test_metrics_require_the_token(client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+
+    assert (await client.get("/metrics")).status_code == 401
+    wrong = await client.get("/metrics", headers={"Authorization": "Bearer other-token"})
+    assert wrong.status_code == 401
+
+    response = await client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert "http_requests_in_progress" in response.text
@@ -0,0 +1,18 @@
+async def test_my_books_query_budget(client, auth_headers, query_budget):
+    # user, its selectin relationships, the ETag aggregate and the list itself
+    with query_budget(6) as stats:
+        resp = await client.get("/api/v1/books/my", headers=auth_headers)
+
+    assert resp.status_code == 200
+    assert not stats.repeated(2)
+
+
+async def test_my_books_revalidation_skips_the_list(client, auth_headers, query_budget):
+    resp = await client.get("/api/v1/books/my", headers=auth_headers)
+
+    with query_budget(5):
+        resp = await client.get(
+            "/api/v1/books/my", headers={**auth_headers, "If-None-Match": resp.headers["ETag"]}
+        )
+
+    assert resp.status_code == 304
@@ -0,0 +1,48 @@
+from sqlalchemy import text
+
+from core.config import Settings
+from database.relational_db.session import (
+    IDLE_IN_TRANSACTION_TIMEOUT,
+    STATEMENT_TIMEOUT,
+    async_session,
+    set_statement_timeout,
+)
+
+settings = Settings()  # type: ignore
+
+
+async def _timeouts(session) -> tuple[str, str]:
+    statement = await session.scalar(text("SELECT current_setting('statement_timeout')"))
+    idle = await session.scalar(text("SELECT current_setting('idle_in_transaction_session_timeout')"))
+    return statement, idle
+
+
+def _ms(value: int) -> str:
+    """`current_setting` spelling of a timeout in ms"""
+    if value % 60_000 == 0:
+        return f"{value // 60_000}min"
+    if value % 1000 == 0:
+        return f"{value // 1000}s"
+    return f"{value}ms"
+
+
+async def test_session_overrides_both_timeouts():
+    async with async_session() as session:
+        session.info[STATEMENT_TIMEOUT] = 0
+        session.info[IDLE_IN_TRANSACTION_TIMEOUT] = 0
+        assert await _timeouts(session) == ("0", "0")
+
+
+async def test_statement_override_keeps_the_idle_override():
+    async with async_session() as session:
+        session.info[IDLE_IN_TRANSACTION_TIMEOUT] = 0
+        await session.execute(text("SELECT 1"))
+        await set_statement_timeout(session, 5000)
+        assert await _timeouts(session) == ("5s", "0")
+
+
+async def test_defaults_without_overrides():
+    async with async_session() as session:
+        assert await _timeouts(session) == (
+            _ms(settings.DB_STATEMENT_TIMEOUT), _ms(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT)
+        )
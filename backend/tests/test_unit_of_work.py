@@ -0,0 +1,79 @@
+from collections import Counter
+
+import asyncpg
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_connection
+
+from database.relational_db import Book, UoW, User
+from database.relational_db.session import async_session, read_only_options
+
+
+@pytest.fixture
+def driver_calls(monkeypatch) -> Counter[str]:
+    """
+    BEGIN / COMMIT / ROLLBACK as the driver sees them. The pool's pre-ping
+    wraps its `;` in a transaction of its own, it is counted as one `ping`.
+    """
+    calls: Counter[str] = Counter()
+    pinging = False
+
+    def _count(name: str, method):
+        async def wrapper(*args, **kwargs):
+            if not pinging:
+                calls[name] += 1
+            return await method(*args, **kwargs)
+        return wrapper
+
+    def _ping(method):
+        async def wrapper(*args, **kwargs):
+            nonlocal pinging
+            calls["ping"] += 1
+            pinging = True
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                pinging = False
+        return wrapper
+
+    transaction = asyncpg.transaction.Transaction
+    for name, method in (("begin", "start"), ("commit", "commit"), ("rollback", "rollback")):
+        monkeypatch.setattr(transaction, method, _count(name, getattr(transaction, method)))
+    monkeypatch.setattr(AsyncAdapt_asyncpg_connection, "_async_ping", _ping(AsyncAdapt_asyncpg_connection._async_ping))
+    return calls
+
+
+async def _reads(uow: UoW, user: User) -> None:
+    await uow.session.scalar(select(User.id).where(User.id == user.id))
+    await uow.session.scalars(select(Book.id).where(Book.owner_id == user.id).limit(50))
+
+
+async def test_read_only_uow_skips_the_transaction(user, driver_calls, query_budget):
+    with query_budget(2) as stats:
+        async with async_session() as session:
+            async with UoW(session) as uow:
+                uow.set_read_only(**read_only_options())
+                await _reads(uow, user)
+
+    assert stats.count == 2
+    assert driver_calls["begin"] == driver_calls["commit"] == 0
+
+
+async def test_regular_uow_runs_one_transaction(user, driver_calls):
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            await _reads(uow, user)
+
+    assert driver_calls["begin"] == driver_calls["commit"] == 1
+
+
+async def test_commit_does_not_begin_eagerly(user, driver_calls):
+    async with async_session() as session:
+        async with UoW(session) as uow:
+            await _reads(uow, user)
+            await uow.commit()
+            assert driver_calls["begin"] == driver_calls["commit"] == 1
+            assert not session.in_transaction()
+
+    # Nothing ran after commit(), so leaving the unit of work is free
+    assert driver_calls["begin"] == driver_calls["commit"] == 1